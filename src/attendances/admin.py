@@ -10,7 +10,14 @@ from attendances.models import Attendance
 
 @admin.register(Attendance)
 class AttendanceAdmin(ModelAdmin):
-    list_display = ("id", "roster_user_schedule", "capture_image", "time")
+    list_display = (
+        "id",
+        "roster_user_schedule",
+        "capture_image",
+        "image_status",
+        "time",
+    )
+    list_filter = ("image_status",)
     search_fields = (
         "roster_user_schedule__user__email",
         "roster_user_schedule__roster__title",
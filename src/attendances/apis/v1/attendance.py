@@ -2,7 +2,10 @@
 This file contains all the APIs related to attendance model
 """
 
+from datetime import timedelta
+
 from django.core.validators import FileExtensionValidator
+from django.utils.timezone import now
 from rest_framework import serializers
 from rest_framework.status import (
     HTTP_201_CREATED,
@@ -14,15 +17,20 @@ from rest_framework.views import APIView
 from attendances.models import Attendance
 from attendances.serializers import AttendanceSerializer
 from attendances.services import create_attendance
+from rosters.caches import get_user_date_schedules
 from rosters.models import RosterUserSchedule
 from users.permissions import IsStaff
-from utils.files import ValidateFileSize
+from utils.files import ImageUploadValidationHandler, ValidateFileSize
 from utils.response import DefaultResponse
+from utils.serializers import normalize_users
 
 
 class CreateAttendanceAPI(APIView):
     """
     This API is used to create attendance for a staff member
+    With `normalize` in the query string the attendance is returned in
+    `result`, holding the uuid of its user, the user being returned in
+    `users`, by uuid.
     Response codes:
         201, 400, 404
     """
@@ -40,15 +48,62 @@ class CreateAttendanceAPI(APIView):
             ]
         )
 
+    class QuerySerializer(serializers.Serializer):
+        normalize = serializers.BooleanField(default=False)
+
     OutputSerializer = AttendanceSerializer
 
+    def get_cached_schedule(self, user, roster_user_schedule_id):
+        """
+        Attendance is marked around the start of a schedule, so the schedule
+        is looked up in the cached days of the user around today, whatever
+        the timezone of its date. Others are read by get_queryset.
+        """
+        today = now().date()
+        user_date_schedules = get_user_date_schedules(
+            user_id=user.uuid,
+            schedule_dates=[
+                today - timedelta(days=1),
+                today,
+                today + timedelta(days=1),
+            ],
+        )
+        return next(
+            (
+                roster_user_schedule
+                for roster_user_schedules in user_date_schedules.values()
+                for roster_user_schedule in roster_user_schedules
+                if roster_user_schedule.id == roster_user_schedule_id
+            ),
+            None,
+        )
+
     def get_queryset(self, user, roster_user_schedule_id):
         return RosterUserSchedule.objects.filter(
             date_deleted__isnull=True, id=roster_user_schedule_id, user=user
         )
 
     def post(self, request, *args, **kwargs):
+        upload_handler = ImageUploadValidationHandler(
+            request=request,
+            max_file_size=Attendance.MAX_FILE_SIZE,
+            allowed_extensions=Attendance.FILE_EXTENSIONS_ALLOWED,
+            max_pixels=Attendance.MAX_IMAGE_PIXELS,
+        )
+        request.upload_handlers.insert(0, upload_handler)
+
+        query_serializer = self.QuerySerializer(data=request.query_params)
+        if not query_serializer.is_valid():
+            return DefaultResponse(
+                errors=query_serializer.errors, status=HTTP_400_BAD_REQUEST
+            )
+
         serializer = self.InputSerializer(data=request.data)
+        if upload_handler.error:
+            return DefaultResponse(
+                errors={"image": [upload_handler.error]}, status=HTTP_400_BAD_REQUEST
+            )
+
         if not serializer.is_valid():
             return DefaultResponse(
                 errors=serializer.errors, status=HTTP_400_BAD_REQUEST
@@ -56,10 +111,15 @@ class CreateAttendanceAPI(APIView):
 
         validated_data = serializer.validated_data
 
-        roster_user_schedule = self.get_queryset(
+        roster_user_schedule = self.get_cached_schedule(
             user=request.user,
             roster_user_schedule_id=validated_data["roster_user_schedule"],
-        ).first()
+        )
+        if not roster_user_schedule:
+            roster_user_schedule = self.get_queryset(
+                user=request.user,
+                roster_user_schedule_id=validated_data["roster_user_schedule"],
+            ).first()
 
         if not roster_user_schedule:
             return DefaultResponse(
@@ -67,11 +127,20 @@ class CreateAttendanceAPI(APIView):
                 status=HTTP_404_NOT_FOUND,
             )
 
-        success, attendance = create_attendance(**validated_data)
+        success, attendance = create_attendance(
+            roster_user_schedule=roster_user_schedule,
+            image=validated_data["image"],
+        )
         if not success:
             return DefaultResponse(errors=attendance, status=HTTP_400_BAD_REQUEST)
 
-        return DefaultResponse(
-            data=self.OutputSerializer(instance=attendance).data,
-            status=HTTP_201_CREATED,
-        )
+        data = self.OutputSerializer(instance=attendance).data
+        if query_serializer.validated_data["normalize"]:
+            data = {
+                "result": data,
+                "users": normalize_users(
+                    rows=[data], fields=self.OutputSerializer.normalized_user_fields
+                ),
+            }
+
+        return DefaultResponse(data=data, status=HTTP_201_CREATED)
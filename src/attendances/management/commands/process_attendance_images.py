@@ -0,0 +1,55 @@
+"""
+This file contains the worker command processing spooled attendance images.
+"""
+
+from time import sleep
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils.timezone import now
+
+from attendances.models import Attendance
+from attendances.services import process_attendance_image
+
+
+class Command(BaseCommand):
+    help = (
+        "Processes spooled attendance images left behind by restarted web "
+        "workers, including images stuck in processing. Runs until interrupted "
+        "unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the currently pending images and exit.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait between polls for pending images.",
+        )
+
+    def handle(self, *args, once=False, interval=5, **options):
+        while True:
+            attendance_ids = Attendance.objects.filter(
+                Q(image_status=Attendance.ImageStatus.PENDING)
+                | Q(
+                    image_status=Attendance.ImageStatus.PROCESSING,
+                    date_updated__lte=now() - Attendance.IMAGE_STALE_AFTER,
+                )
+            ).values_list("id", flat=True)
+
+            for attendance_id in list(attendance_ids):
+                success, result = process_attendance_image(attendance_id=attendance_id)
+                if success:
+                    self.stdout.write(f"Attendance {attendance_id} image processed.")
+                else:
+                    self.stderr.write(f"Attendance {attendance_id}: {result}")
+
+            if once:
+                return
+
+            sleep(interval)
@@ -0,0 +1,49 @@
+# Generated by Django 5.1 on 2026-10-18 20:16
+
+import django.core.validators
+from django.db import migrations, models
+
+import attendances.models
+import utils.files
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attendances", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="attendance",
+            name="image_status",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                choices=[
+                    (1, "Pending"),
+                    (2, "Processing"),
+                    (3, "Ready"),
+                    (4, "Failed"),
+                ],
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="attendance",
+            name="spooled_image",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=attendances.models.get_spool_storage,
+                upload_to=utils.files.RenameFile(
+                    "attendance/{instance.roster_user_schedule_id}/{instance.date_created}.{extension}"
+                ),
+                validators=[
+                    utils.files.ValidateFileSize(max_file_size=10),
+                    django.core.validators.FileExtensionValidator(
+                        allowed_extensions=("jpeg", "jpg", "png")
+                    ),
+                ],
+            ),
+        ),
+    ]
@@ -2,6 +2,7 @@
 This file contains all the models related to attendances module.
 """
 
+import os
 from datetime import timedelta
 
 from django.conf import settings
@@ -16,6 +17,11 @@ from utils.files import RenameFile, ValidateFileSize
 from utils.models import BaseModel
 
 FILE_STORAGE = FileSystemStorage(location=settings.MEDIA_ROOT)
+SPOOL_STORAGE = FileSystemStorage(location=settings.ATTENDANCE_SPOOL_ROOT)
+
+
+def get_spool_storage():
+    return SPOOL_STORAGE
 
 
 class Attendance(BaseModel):
@@ -25,6 +31,24 @@ class Attendance(BaseModel):
 
     MAX_FILE_SIZE = 10  # in Mb
     FILE_EXTENSIONS_ALLOWED = ("jpeg", "jpg", "png")
+    # Images still processing after this long are assumed to belong to a
+    # worker that died and are picked up again
+    IMAGE_STALE_AFTER = timedelta(minutes=10)
+    # Larger uploads are rejected before being decoded
+    MAX_IMAGE_PIXELS = 50_000_000
+    # Processed images are downscaled to fit this many pixels on each side
+    MAX_IMAGE_DIMENSION = 2048
+    # WebP variants generated next to every processed image, by the bounding
+    # box they are downscaled to
+    IMAGE_VARIANTS = {"thumbnail": (160, 160), "review": (800, 800)}
+    IMAGE_VARIANT_QUALITY = 80
+    INVARIANTS = ("time",)
+
+    class ImageStatus(models.IntegerChoices):
+        PENDING = 1
+        PROCESSING = 2
+        READY = 3
+        FAILED = 4
 
     roster_user_schedule = models.OneToOneField(
         RosterUserSchedule, on_delete=models.PROTECT
@@ -41,6 +65,22 @@ class Attendance(BaseModel):
         null=True,
         blank=True,
     )
+    # Upload waiting to be processed into capture_image by a background worker
+    spooled_image = models.ImageField(
+        storage=get_spool_storage,
+        upload_to=RenameFile(
+            "attendance/{instance.roster_user_schedule_id}/{instance.date_created}.{extension}"
+        ),
+        validators=[
+            ValidateFileSize(max_file_size=MAX_FILE_SIZE),
+            FileExtensionValidator(allowed_extensions=FILE_EXTENSIONS_ALLOWED),
+        ],
+        null=True,
+        blank=True,
+    )
+    image_status = models.PositiveSmallIntegerField(
+        choices=ImageStatus.choices, null=True, blank=True
+    )
 
     time = models.DateTimeField(default=now)
 
@@ -51,6 +91,12 @@ class Attendance(BaseModel):
     def __str__(self):
         return f"{self.roster_user_schedule}"
 
+    def get_image_variant_name(self, variant: str) -> str:
+        """
+        Returns the storage key of a variant of capture_image.
+        """
+        return f"{os.path.splitext(self.capture_image.name)[0]}_{variant}.webp"
+
     def validate_time(self):
         if not (
             self.roster_user_schedule.start_time - timedelta(hours=1)
@@ -60,7 +106,3 @@ class Attendance(BaseModel):
             raise ValidationError(
                 "Attendance can only be marked within one hour of the schedule start time."
             )
-
-    def full_clean(self, *args, **kwargs):
-        self.validate_time()
-        return super().full_clean(*args, **kwargs)
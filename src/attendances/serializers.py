@@ -6,11 +6,41 @@ from rest_framework import serializers
 
 from attendances.models import Attendance
 from rosters.serializers import RosterUserScheduleSerializer
+from utils.serializers import QueryPlanMixin
 
 
-class AttendanceSerializer(serializers.ModelSerializer):
+class AttendanceSerializer(QueryPlanMixin, serializers.ModelSerializer):
     roster_user_schedule = RosterUserScheduleSerializer()
+    image_status = serializers.SerializerMethodField()
+    capture_image_thumbnail = serializers.SerializerMethodField()
+    capture_image_review = serializers.SerializerMethodField()
+
+    normalized_user_fields = tuple(
+        f"roster_user_schedule.{field}"
+        for field in RosterUserScheduleSerializer.normalized_user_fields
+    )
+
+    def get_image_status(self, instance):
+        if instance.image_status is None:
+            return None
+        return Attendance.ImageStatus(instance.image_status).label
+
+    def get_image_variant_url(self, instance, variant):
+        if instance.image_status != Attendance.ImageStatus.READY:
+            return None
+
+        url = instance.capture_image.storage.url(
+            instance.get_image_variant_name(variant)
+        )
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+    def get_capture_image_thumbnail(self, instance):
+        return self.get_image_variant_url(instance=instance, variant="thumbnail")
+
+    def get_capture_image_review(self, instance):
+        return self.get_image_variant_url(instance=instance, variant="review")
 
     class Meta:
         model = Attendance
-        exclude = Attendance.LOG_FIELDS
+        exclude = Attendance.LOG_FIELDS + ("spooled_image",)
@@ -1 +1,2 @@
 from .create import create_attendance
+from .images import process_attendance_image
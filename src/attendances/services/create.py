@@ -7,9 +7,13 @@ from typing import Optional, Tuple, Union
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.core.files.images import ImageFile
+from django.db import IntegrityError, transaction
 
 from attendances.models import Attendance
+from attendances.services.images import process_attendance_image
 from rosters.models import RosterUserSchedule
+from utils.models import validation_context
+from utils.workers import submit_task_on_commit
 
 User = get_user_model()
 
@@ -20,21 +24,29 @@ def create_attendance(
     created_by: Optional[User] = None,  # type: ignore
 ) -> Tuple[bool, Union[str, Attendance]]:
     """
-    This service is used to create an attendance instance
+    This service is used to create an attendance instance. The image is only
+    spooled to local disk here, a background worker moves it into the media
+    storage once the attendance is committed.
     """
     attendance = Attendance(
-        roster_user_schedule_id=(
-            roster_user_schedule.id
-            if isinstance(roster_user_schedule, RosterUserSchedule)
-            else roster_user_schedule
-        ),
-        capture_image=image,
+        spooled_image=image,
+        image_status=Attendance.ImageStatus.PENDING if image else None,
         created_by=created_by,
     )
+    if isinstance(roster_user_schedule, RosterUserSchedule):
+        attendance.roster_user_schedule = roster_user_schedule
+    else:
+        attendance.roster_user_schedule_id = roster_user_schedule
 
     try:
-        attendance.save()
+        with transaction.atomic(), validation_context(Attendance, "unique"):
+            attendance.save()
     except ValidationError as error:
         return False, str(error)
+    except IntegrityError as error:
+        return False, attendance.get_integrity_error_message(error)
+
+    if attendance.image_status == Attendance.ImageStatus.PENDING:
+        submit_task_on_commit(process_attendance_image, attendance_id=attendance.id)
 
     return True, attendance
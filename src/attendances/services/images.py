@@ -0,0 +1,140 @@
+"""
+This file contains all the services used to process attendance images.
+"""
+
+from io import BytesIO
+from typing import Dict, Tuple, Union
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Q
+from django.utils.timezone import now
+from PIL import Image, ImageOps
+
+from attendances.models import Attendance
+
+
+def encode_attendance_image(image: Image.Image, image_format: str) -> Tuple[bytes, str]:
+    """
+    This service is used to re-encode an upright image in its original format
+    without any metadata, downscaled to Attendance.MAX_IMAGE_DIMENSION.
+    Returns the encoded bytes and their file extension.
+    """
+
+    image = image.copy()
+    image.thumbnail(
+        (Attendance.MAX_IMAGE_DIMENSION, Attendance.MAX_IMAGE_DIMENSION),
+        Image.Resampling.LANCZOS,
+    )
+
+    output = BytesIO()
+    if image_format == "PNG":
+        image.save(output, format="PNG", optimize=True)
+        return output.getvalue(), "png"
+
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    image.save(output, format="JPEG", quality=85, optimize=True)
+    return output.getvalue(), "jpg"
+
+
+def encode_attendance_image_variant(image: Image.Image, size: Tuple[int, int]) -> bytes:
+    """
+    This service is used to encode a WebP variant of an upright image that
+    fits within the given size.
+    """
+
+    image = image.copy()
+    image.thumbnail(size, Image.Resampling.LANCZOS)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    output = BytesIO()
+    image.save(output, format="WEBP", quality=Attendance.IMAGE_VARIANT_QUALITY)
+    return output.getvalue()
+
+
+def save_attendance_image_variants(
+    attendance: Attendance, variants: Dict[str, bytes]
+) -> None:
+    """
+    This service is used to store the variants of a processed image under
+    their deterministic keys next to capture_image, replacing any left over
+    by an earlier attempt.
+    """
+
+    storage = attendance.capture_image.storage
+    for variant, content in variants.items():
+        name = attendance.get_image_variant_name(variant)
+        storage.delete(name)
+        storage.save(name, ContentFile(content))
+
+
+def process_attendance_image(
+    attendance_id: int,
+) -> Tuple[bool, Union[str, Attendance]]:
+    """
+    This service is used to move the spooled image of an attendance into the
+    media storage, stripping EXIF data and re-encoding it on the way, and to
+    generate its resized variants.
+    An image that is already being processed elsewhere is skipped.
+    """
+
+    with transaction.atomic():
+        attendance = (
+            Attendance.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("roster_user_schedule")
+            .filter(
+                Q(image_status=Attendance.ImageStatus.PENDING)
+                | Q(
+                    image_status=Attendance.ImageStatus.PROCESSING,
+                    date_updated__lte=now() - Attendance.IMAGE_STALE_AFTER,
+                ),
+                id=attendance_id,
+            )
+            .first()
+        )
+        if not attendance:
+            return False, "No pending attendance image found for given id"
+
+        attendance.image_status = Attendance.ImageStatus.PROCESSING
+        attendance.save(update_fields=["image_status", "date_updated"], skip_clean=True)
+
+    try:
+        with attendance.spooled_image.open("rb") as file, Image.open(file) as image:
+            image_format = image.format
+            image = ImageOps.exif_transpose(image)
+            content, extension = encode_attendance_image(image, image_format)
+            variants = {
+                variant: encode_attendance_image_variant(image, size)
+                for variant, size in Attendance.IMAGE_VARIANTS.items()
+            }
+
+        attendance.capture_image.save(
+            f"capture_image.{extension}",
+            ContentFile(content),
+            save=False,
+        )
+        save_attendance_image_variants(attendance=attendance, variants=variants)
+
+    except Exception as error:
+        attendance.image_status = Attendance.ImageStatus.FAILED
+        attendance.save(update_fields=["image_status", "date_updated"], skip_clean=True)
+        return False, str(error)
+
+    spooled_image = attendance.spooled_image
+    attendance.spooled_image = None
+    attendance.image_status = Attendance.ImageStatus.READY
+    attendance.save(
+        update_fields=[
+            "capture_image",
+            "spooled_image",
+            "image_status",
+            "date_updated",
+        ],
+        skip_clean=True,
+    )
+    spooled_image.storage.delete(spooled_image.name)
+
+    return True, attendance
@@ -0,0 +1,13 @@
+"""
+This package contains standalone benchmarks. Every module is run from the src
+directory with `python -m benchmarks.<module>`, using the configured database.
+"""
+
+import os
+
+import django
+
+
+def setup():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "rollcall.settings")
+    django.setup()
@@ -0,0 +1,110 @@
+"""
+This benchmark compares the per request database cost of the connection
+modes of rollcall.configurations.database:
+
+    fresh       DATABASE_CONN_MAX_AGE=0, a new connection per request
+    persistent  DATABASE_CONN_MAX_AGE=60, one connection per thread
+    pool        DATABASE_POOL_MAX_SIZE=<threads>, psycopg 3 pooling
+
+    python -m benchmarks.connections --requests 2000 --threads 8
+
+Every simulated request goes through Django's request_started and
+request_finished signals, which open and release connections exactly as
+real requests do, and runs one primary key lookup in between. Each mode
+runs in its own process since the database settings are read at startup.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from statistics import mean, quantiles
+from time import perf_counter
+
+MODES = {
+    "fresh": {"DATABASE_CONN_MAX_AGE": "0", "DATABASE_POOL_MAX_SIZE": "0"},
+    "persistent": {"DATABASE_CONN_MAX_AGE": "60", "DATABASE_POOL_MAX_SIZE": "0"},
+    "pool": {"DATABASE_CONN_MAX_AGE": "0"},
+}
+
+
+def run_mode(requests, threads):
+    from benchmarks import setup
+
+    setup()
+
+    from django.core.signals import request_finished, request_started
+    from django.db import connections
+
+    from users.models import User
+
+    def handle_request(_):
+        started_at = perf_counter()
+        request_started.send(sender=None)
+        try:
+            User.objects.filter(pk=None).exists()
+        finally:
+            request_finished.send(sender=None)
+        return perf_counter() - started_at
+
+    with ThreadPoolExecutor(
+        max_workers=threads, initializer=connections.close_all
+    ) as executor:
+        list(executor.map(handle_request, range(threads)))  # warm up
+        started_at = perf_counter()
+        latencies = list(executor.map(handle_request, range(requests)))
+        elapsed = perf_counter() - started_at
+
+    percentiles = quantiles(latencies, n=100)
+    return {
+        "requests_per_second": requests / elapsed,
+        "mean_ms": mean(latencies) * 1000,
+        "p50_ms": percentiles[49] * 1000,
+        "p99_ms": percentiles[98] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(requests=args.requests, threads=args.threads)))
+        return
+
+    print(f"{'mode':<12}{'req/s':>10}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for mode, environ in MODES.items():
+        environ = {**os.environ, **environ}
+        if mode == "pool":
+            environ["DATABASE_POOL_MAX_SIZE"] = str(args.threads)
+            environ["DATABASE_POOL_MIN_SIZE"] = str(args.threads)
+
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.connections",
+                f"--mode={mode}",
+                f"--requests={args.requests}",
+                f"--threads={args.threads}",
+            ],
+            env=environ,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{mode:<12}{result['requests_per_second']:>10.0f}"
+            f"{result['mean_ms']:>10.2f}{result['p50_ms']:>10.2f}"
+            f"{result['p99_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
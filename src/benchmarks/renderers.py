@@ -0,0 +1,127 @@
+"""
+This benchmark compares the stock JSONRenderer with utils.renderers
+.FastJSONRenderer on a DefaultResponse schedule list:
+
+    python -m benchmarks.renderers --rows 10000 --repeat 20
+
+Two payloads are rendered, the output of RosterUserScheduleSerializer, whose
+dates are already strings, and raw rows holding UUIDs, dates and datetimes
+as the values() querysets of exports do. Rows are built in memory, so no
+database is needed. Both renderers must produce the same JSON document.
+"""
+
+import argparse
+import json
+from datetime import date, datetime, time, timedelta, timezone
+from statistics import mean, median
+from time import perf_counter
+from uuid import uuid4
+
+from benchmarks import setup
+
+setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from rosters.models import RosterUserSchedule  # noqa: E402
+from rosters.serializers import RosterUserScheduleSerializer  # noqa: E402
+from users.models import User  # noqa: E402
+from utils.renderers import FastJSONRenderer  # noqa: E402
+from utils.response import DefaultResponse  # noqa: E402
+
+RENDERERS = {"stdlib": JSONRenderer, "orjson": FastJSONRenderer}
+
+
+def build_schedules(rows, users):
+    staff = [
+        User(
+            uuid=uuid4(),
+            email=f"staff-{number}@rollcall.local",
+            first_name=f"Staff {number}",
+            last_name="Benchmark",
+        )
+        for number in range(users)
+    ]
+    start_date = date.today()
+    schedules = []
+    for number in range(rows):
+        schedule_date = start_date + timedelta(days=number // users)
+        start_time = datetime.combine(schedule_date, time(9), tzinfo=timezone.utc)
+        schedules.append(
+            RosterUserSchedule(
+                id=number + 1,
+                roster_id=1,
+                user=staff[number % users],
+                schedule_date=schedule_date,
+                start_time=start_time,
+                end_time=start_time + timedelta(hours=8),
+            )
+        )
+    return schedules
+
+
+def get_payloads(schedules):
+    return {
+        "serialized": DefaultResponse(
+            data=RosterUserScheduleSerializer(instance=schedules, many=True).data
+        ).data,
+        "raw": DefaultResponse(
+            data=[
+                {
+                    "id": schedule.id,
+                    "roster_id": schedule.roster_id,
+                    "user_id": schedule.user.uuid,
+                    "schedule_date": schedule.schedule_date,
+                    "start_time": schedule.start_time,
+                    "end_time": schedule.end_time,
+                }
+                for schedule in schedules
+            ]
+        ).data,
+    }
+
+
+def run(renderer, payload, repeat):
+    renderer.render(payload)  # warm up
+    timings = []
+    for _ in range(repeat):
+        started_at = perf_counter()
+        content = renderer.render(payload)
+        timings.append(perf_counter() - started_at)
+    return content, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = get_payloads(build_schedules(rows=args.rows, users=args.users))
+
+    print(
+        f"{'payload':<12}{'renderer':<10}{'mean ms':>10}{'median ms':>11}"
+        f"{'KiB':>8}{'speedup':>9}"
+    )
+    for name, payload in payloads.items():
+        baseline = None
+        documents = []
+        for renderer_name, renderer_class in RENDERERS.items():
+            content, timings = run(
+                renderer=renderer_class(), payload=payload, repeat=args.repeat
+            )
+            documents.append(json.loads(content))
+            baseline = baseline or median(timings)
+            print(
+                f"{name:<12}{renderer_name:<10}{mean(timings) * 1000:>10.2f}"
+                f"{median(timings) * 1000:>11.2f}{len(content) / 1024:>8.0f}"
+                f"{baseline / median(timings):>8.1f}x"
+            )
+
+        if any(document != documents[0] for document in documents[1:]):
+            raise SystemExit(f"Renderers disagree on the {name} payload")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+This benchmark prints the query plans of the hot soft-delete aware queries
+with and without the partial indexes of rosters.0003.
+
+Seed a dataset first, on a disposable database only:
+    python -m benchmarks.schedule_indexes --seed --rosters 20 --users 40 --days 365
+then compare the plans:
+    python -m benchmarks.schedule_indexes
+
+The "before" plans are taken inside a transaction that drops the partial
+indexes and is rolled back afterwards.
+"""
+
+import argparse
+import random
+from datetime import date, datetime, time, timedelta, timezone
+
+from benchmarks import setup
+
+setup()
+
+from django.db import connection, transaction  # noqa: E402
+
+from rosters.models import (  # noqa: E402
+    Roster,
+    RosterManager,
+    RosterUserSchedule,
+    ScheduleSwapRequest,
+)
+from users.models import User, UserRole  # noqa: E402
+
+SEED_PREFIX = "benchmark"
+PARTIAL_INDEXES = {
+    RosterUserSchedule: ("schedule_roster_active_idx", "schedule_user_active_idx"),
+    ScheduleSwapRequest: ("swap_receiver_active_idx",),
+}
+
+
+def seed(rosters, users, days, deleted_ratio, swap_ratio):
+    manager = User.objects.create_user(
+        email=f"{SEED_PREFIX}-manager@rollcall.local",
+        first_name="Benchmark",
+        password=None,
+    )
+    UserRole.objects.create(user=manager, role=UserRole.Role.MANAGER)
+
+    start_date = date.today() - timedelta(days=days // 2)
+    for roster_number in range(rosters):
+        roster = Roster(title=f"{SEED_PREFIX} roster {roster_number}", is_active=True)
+        roster.save(skip_clean=True)
+        RosterManager(roster=roster, manager=manager).save(skip_clean=True)
+
+        staff = User.objects.bulk_create(
+            User(
+                email=f"{SEED_PREFIX}-{roster_number}-{user_number}@rollcall.local",
+                first_name=f"Staff {user_number}",
+                password="!",
+            )
+            for user_number in range(users)
+        )
+        UserRole.objects.bulk_create(
+            UserRole(user=user, role=UserRole.Role.STAFF) for user in staff
+        )
+
+        schedules = []
+        for day in range(days):
+            schedule_date = start_date + timedelta(days=day)
+            start_time = datetime.combine(schedule_date, time(8), timezone.utc)
+            for user in staff:
+                schedules.append(
+                    RosterUserSchedule(
+                        roster=roster,
+                        user=user,
+                        schedule_date=schedule_date,
+                        start_time=start_time,
+                        end_time=start_time + timedelta(hours=8),
+                        date_deleted=(
+                            start_time if random.random() < deleted_ratio else None
+                        ),
+                    )
+                )
+        schedules = RosterUserSchedule.objects.bulk_create(schedules, batch_size=5000)
+
+        ScheduleSwapRequest.objects.bulk_create(
+            (
+                ScheduleSwapRequest(
+                    sender=schedule.user,
+                    receiver=random.choice(staff),
+                    sender_schedule=schedule,
+                    status=random.choice(ScheduleSwapRequest.Status.values),
+                    date_deleted=schedule.date_deleted,
+                )
+                for schedule in schedules
+                if random.random() < swap_ratio
+            ),
+            batch_size=5000,
+        )
+        print(f"Seeded roster {roster_number + 1}/{rosters}")
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def get_queries():
+    roster = Roster.objects.filter(title__startswith=SEED_PREFIX).first()
+    schedule = (
+        RosterUserSchedule.objects.filter(roster=roster, date_deleted__isnull=True)
+        .order_by("-schedule_date")
+        .first()
+    )
+    user, schedule_date = schedule.user, schedule.schedule_date
+
+    return {
+        "schedule list page": RosterUserSchedule.objects.filter(
+            date_deleted__isnull=True, roster_id=roster.id
+        )
+        .select_related("user")
+        .order_by("schedule_date", "id")[:101],
+        "schedule list week": RosterUserSchedule.objects.filter(
+            date_deleted__isnull=True,
+            roster_id=roster.id,
+            schedule_date__gte=schedule_date - timedelta(days=6),
+            schedule_date__lte=schedule_date,
+        ).order_by("schedule_date", "id")[:101],
+        "staff schedule on a date": RosterUserSchedule.objects.filter(
+            date_deleted__isnull=True, user=user, schedule_date=schedule_date
+        ),
+        "pending swap requests": ScheduleSwapRequest.objects.filter(
+            date_deleted__isnull=True,
+            receiver=user,
+            status=ScheduleSwapRequest.Status.PENDING,
+        ),
+        "user roles": UserRole.objects.filter(
+            user=user, date_deleted__isnull=True
+        ).values_list("role", flat=True),
+    }
+
+
+def explain(title):
+    print(f"\n{'=' * 20} {title} {'=' * 20}")
+    for name, queryset in get_queries().items():
+        print(f"\n--- {name}")
+        print(queryset.explain(analyze=True, buffers=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seed", action="store_true")
+    parser.add_argument("--rosters", type=int, default=20)
+    parser.add_argument("--users", type=int, default=40)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--deleted-ratio", type=float, default=0.1)
+    parser.add_argument("--swap-ratio", type=float, default=0.05)
+    arguments = parser.parse_args()
+
+    if arguments.seed:
+        seed(
+            rosters=arguments.rosters,
+            users=arguments.users,
+            days=arguments.days,
+            deleted_ratio=arguments.deleted_ratio,
+            swap_ratio=arguments.swap_ratio,
+        )
+        return
+
+    with transaction.atomic():
+        with connection.schema_editor() as schema_editor:
+            for model, index_names in PARTIAL_INDEXES.items():
+                for index in model._meta.indexes:
+                    if index.name in index_names:
+                        schema_editor.remove_index(model, index)
+
+        explain("without partial indexes")
+        transaction.set_rollback(True)
+
+    explain("with partial indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+This benchmark compares the speed of the compiled serializers of
+utils.serializers.compile_serializer, rendering in python or having the
+database build json, with their model serializer on a schedule list:
+
+    python -m benchmarks.serializers --rows 10000 --repeat 5
+
+Rows are seeded inside a transaction that is rolled back afterwards, so any
+configured database can be used. That both render what the model
+serializer renders is tested by rosters.tests.
+"""
+
+import argparse
+from datetime import date, datetime, time, timedelta, timezone
+from statistics import median
+from time import perf_counter
+
+from benchmarks import setup
+
+setup()
+
+from django.db import transaction  # noqa: E402
+
+from rosters.models import Roster, RosterUserSchedule  # noqa: E402
+from rosters.serializers import RosterUserScheduleSerializer  # noqa: E402
+from users.models import User  # noqa: E402
+from utils.serializers import compile_serializer  # noqa: E402
+
+SEED_PREFIX = "benchmark"
+
+
+class Rollback(Exception):
+    pass
+
+
+def seed(rows, users):
+    staff = User.objects.bulk_create(
+        User(
+            email=f"{SEED_PREFIX}-{number}@rollcall.local",
+            first_name=f"Staff {number}",
+            last_name=None if number % 3 else f"Last {number}",
+            password="!",
+        )
+        for number in range(users)
+    )
+    roster = Roster(title=f"{SEED_PREFIX} roster", is_active=True)
+    roster.save(skip_clean=True)
+
+    start_date = date.today()
+    schedules = []
+    for number in range(rows):
+        schedule_date = start_date + timedelta(days=number // users)
+        start_time = datetime.combine(
+            schedule_date, time(9, 0, 0, number % 1000), tzinfo=timezone.utc
+        )
+        schedules.append(
+            RosterUserSchedule(
+                roster=roster,
+                user=staff[number % users],
+                schedule_date=schedule_date,
+                start_time=start_time,
+                end_time=start_time + timedelta(hours=8),
+                date_deleted=start_time if number % 10 == 0 else None,
+            )
+        )
+    RosterUserSchedule.objects.bulk_create(schedules)
+    return roster
+
+
+def time_runs(function, repeat):
+    function()  # warm up
+    timings = []
+    for _ in range(repeat):
+        started_at = perf_counter()
+        function()
+        timings.append(perf_counter() - started_at)
+    return median(timings) * 1000
+
+
+def benchmark(roster, repeat):
+    queryset = RosterUserSchedule.objects.filter(
+        roster=roster, date_deleted__isnull=True
+    ).order_by("id")
+    compiled_serializer = compile_serializer(RosterUserScheduleSerializer)
+    instances = list(queryset.select_related("user"))
+    rows = list(compiled_serializer.values(queryset))
+
+    results = {
+        "model serializer": (
+            time_runs(
+                lambda: RosterUserScheduleSerializer(instance=queryset, many=True).data,
+                repeat,
+            ),
+            time_runs(
+                lambda: RosterUserScheduleSerializer(
+                    instance=instances, many=True
+                ).data,
+                repeat,
+            ),
+        ),
+        "compiled": (
+            time_runs(
+                lambda: compiled_serializer.to_representation(
+                    compiled_serializer.values(queryset)
+                ),
+                repeat,
+            ),
+            time_runs(lambda: compiled_serializer.to_representation(rows), repeat),
+        ),
+        "database": (
+            time_runs(
+                lambda: compiled_serializer.to_json(
+                    compiled_serializer.json_values(queryset)
+                ),
+                repeat,
+            ),
+            None,
+        ),
+    }
+
+    # The database renders while querying, so has no separate render time
+    print(f"\n{len(rows)} schedules, median of {repeat} runs")
+    print(f"{'serializer':<18}{'query+render ms':>17}{'render ms':>11}{'speedup':>9}")
+    baseline = results["model serializer"][0]
+    for name, (total, render) in results.items():
+        render = "-" if render is None else f"{render:.1f}"
+        print(f"{name:<18}{total:>17.1f}{render:>11}{baseline / total:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    try:
+        with transaction.atomic():
+            roster = seed(rows=args.rows, users=args.users)
+            benchmark(roster=roster, repeat=args.repeat)
+            raise Rollback
+    except Rollback:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,51 @@
 This file contains all the custom authentications for rollcall.
 """
 
+from time import time
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
+from utils.caches import TTLCache
 from utils.helpers import decode_user_token
 
 User = get_user_model()
 
+# Verified tokens mapped to their decoded payload and a snapshot of the user
+# and its roles, tagged with the user uuid so that edits to a user or its
+# roles evict all of its tokens.
+token_cache = TTLCache(max_size=settings.JWT_TOKEN_CACHE_SIZE)
+
 
 class JWTAuthentication(BaseAuthentication):
     """
     This class is used for jwt token authentication.
+    Verified tokens are cached per process until they expire (capped at
+    JWT_TOKEN_CACHE_TTL seconds), so repeated requests with the same token
+    do not hit the database. Async views authenticate through aauthenticate.
+    Users and their roles are always read from the primary, since caching
+    them from a lagging replica would restore roles revoked in the meantime
+    for a whole JWT_TOKEN_CACHE_TTL.
     """
 
-    def authenticate(self, request):
+    # Listed in model field order, as expected by Model.from_db
+    USER_SNAPSHOT_FIELDS = (
+        "is_superuser",
+        "is_staff",
+        "is_active",
+        "uuid",
+        "email",
+        "first_name",
+        "last_name",
+    )
+
+    def get_token(self, request):
+        """
+        Returns the bearer token of the request, None when it has none.
+        """
         jwt_token = request.META.get("HTTP_AUTHORIZATION", b"").split()
 
         if not jwt_token or jwt_token[0].lower() != "bearer":
@@ -29,15 +59,78 @@ class JWTAuthentication(BaseAuthentication):
                 "Invalid token header. Token string should not contain spaces."
             )
 
+        return jwt_token[1]
+
+    def get_cached_user(self, token):
+        cached = token_cache.get(token)
+        if cached is None:
+            return None
+
+        payload, database, snapshot, roles = cached
+        user = User.from_db(database, self.USER_SNAPSHOT_FIELDS, snapshot)
+        user.roles = roles
+        return user, dict(payload)
+
+    def cache_user(self, token, payload, user):
+        if not user.is_active:
+            raise AuthenticationFailed("User inactive or deleted.")
+
+        token_cache.set(
+            key=token,
+            value=(
+                payload,
+                user._state.db,
+                tuple(getattr(user, field) for field in self.USER_SNAPSHOT_FIELDS),
+                user.roles,
+            ),
+            expires_at=min(payload["exp"], time() + settings.JWT_TOKEN_CACHE_TTL),
+            tag=user.uuid,
+        )
+        return user, dict(payload)
+
+    def authenticate(self, request):
+        jwt_token = self.get_token(request)
+        if jwt_token is None:
+            return None
+
+        cached = self.get_cached_user(jwt_token)
+        if cached is not None:
+            return cached
+
         try:
-            payload = decode_user_token(token=jwt_token[1])
-            user = User.objects.get(uuid=payload["user_id"])
+            payload = decode_user_token(token=jwt_token)
+            user = User.objects.using(DEFAULT_DB_ALIAS).get(uuid=payload["user_id"])
             if not user:
                 raise Exception("User not found")
         except Exception as error:
             raise AuthenticationFailed(error)
 
-        return user, payload
+        return self.cache_user(token=jwt_token, payload=payload, user=user)
+
+    async def aauthenticate(self, request):
+        """
+        Async counterpart of authenticate used by utils.views.AsyncAPIView.
+        The roles of the user are loaded along with it, so that permission
+        checks do not query the database.
+        """
+        jwt_token = self.get_token(request)
+        if jwt_token is None:
+            return None
+
+        cached = self.get_cached_user(jwt_token)
+        if cached is not None:
+            return cached
+
+        try:
+            payload = decode_user_token(token=jwt_token)
+            user = await User.objects.using(DEFAULT_DB_ALIAS).aget(
+                uuid=payload["user_id"]
+            )
+            await user.aget_roles()
+        except Exception as error:
+            raise AuthenticationFailed(error)
+
+        return self.cache_user(token=jwt_token, payload=payload, user=user)
 
     def authenticate_header(self, request):
         return "Bearer"
@@ -1,14 +1,66 @@
 from os import environ
 
 
-def get_database_config():
-    return {
-        "default": {
-            "ENGINE": "django.db.backends.postgresql_psycopg2",
-            "NAME": environ["DATABASE_NAME"],
-            "USER": environ["DATABASE_USERNAME"],
-            "PASSWORD": environ["DATABASE_PASSWORD"],
-            "HOST": environ["DATABASE_HOST"],
-            "PORT": environ["DATABASE_PORT"],
+def get_connection_config(*prefixes):
+    """
+    Builds the settings of one database connection from the environment,
+    reading each <prefix>_<NAME> variable from the first prefix that sets it.
+
+    Connections are either kept open between requests for
+    DATABASE_CONN_MAX_AGE seconds, or, when DATABASE_POOL_MAX_SIZE is set,
+    borrowed from a psycopg 3 connection pool, which Django requires to be
+    used without persistent connections. DATABASE_CONNECT_TIMEOUT is in
+    seconds and DATABASE_STATEMENT_TIMEOUT in milliseconds, 0 disabling it.
+    """
+
+    def get(name, default=None):
+        for prefix in prefixes:
+            if environ.get(f"{prefix}_{name}"):
+                return environ[f"{prefix}_{name}"]
+        return default
+
+    options = {"connect_timeout": int(get("CONNECT_TIMEOUT", 5))}
+
+    statement_timeout = int(get("STATEMENT_TIMEOUT", 0))
+    if statement_timeout:
+        options["options"] = f"-c statement_timeout={statement_timeout}"
+
+    pool_max_size = int(get("POOL_MAX_SIZE", 0))
+    if pool_max_size:
+        options["pool"] = {
+            "min_size": int(get("POOL_MIN_SIZE", 2)),
+            "max_size": pool_max_size,
+            "timeout": float(get("POOL_TIMEOUT", 10)),
         }
+
+    return {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": get("NAME"),
+        "USER": get("USERNAME"),
+        "PASSWORD": get("PASSWORD"),
+        "HOST": get("HOST"),
+        "PORT": get("PORT"),
+        "CONN_MAX_AGE": 0 if pool_max_size else int(get("CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": get("CONN_HEALTH_CHECKS", "true").lower() == "true",
+        "OPTIONS": options,
     }
+
+
+def get_database_config():
+    """
+    Builds the database settings from the environment.
+
+    A read replica is added when DATABASE_REPLICA_HOST is set, every
+    DATABASE_REPLICA_* variable it leaves unset defaulting to the primary's
+    DATABASE_* one. See rollcall.routers for which reads it serves.
+    """
+
+    databases = {"default": get_connection_config("DATABASE")}
+
+    if environ.get("DATABASE_REPLICA_HOST"):
+        databases["replica"] = {
+            **get_connection_config("DATABASE_REPLICA", "DATABASE"),
+            "TEST": {"MIRROR": "default"},
+        }
+
+    return databases
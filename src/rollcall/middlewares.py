@@ -0,0 +1,91 @@
+"""
+This file contains all the custom middlewares for rollcall.
+"""
+
+from hashlib import sha256
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+
+from rollcall.routers import REPLICA_DB_ALIAS, database_routing, get_database_routing
+
+
+class ReadReplicaMiddleware:
+    """
+    Sends the reads of GET, HEAD and OPTIONS requests to views flagged with
+    use_read_replica to the read replica.
+    A client whose request wrote to the database, or used any other method,
+    is pinned to the primary for DATABASE_REPLICA_PIN_SECONDS so that it
+    reads its own writes in spite of replication lag. The method covers
+    writes made through raw cursors, which bypass the database router.
+    Clients are told apart by their Authorization header, since users are
+    only authenticated inside the views. It runs natively in both sync and
+    async middleware chains.
+    """
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with database_routing() as routing:
+            response = self.get_response(request)
+
+        pin_key = self.get_pin_key(request)
+        if pin_key and self.should_pin(request, routing=routing):
+            cache.set(pin_key, True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+        return response
+
+    async def __acall__(self, request):
+        with database_routing() as routing:
+            response = await self.get_response(request)
+
+        pin_key = self.get_pin_key(request)
+        if pin_key and self.should_pin(request, routing=routing):
+            await cache.aset(pin_key, True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.can_use_replica(request, view_func=view_func):
+            return None
+
+        pin_key = self.get_pin_key(request)
+        if not pin_key or not cache.get(pin_key):
+            get_database_routing().use_replica = True
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        if not self.can_use_replica(request, view_func=view_func):
+            return None
+
+        pin_key = self.get_pin_key(request)
+        if not pin_key or not await cache.aget(pin_key):
+            get_database_routing().use_replica = True
+
+    def can_use_replica(self, request, view_func):
+        return (
+            REPLICA_DB_ALIAS in settings.DATABASES
+            and request.method in self.SAFE_METHODS
+            and getattr(getattr(view_func, "cls", None), "use_read_replica", False)
+        )
+
+    def should_pin(self, request, routing):
+        return routing.wrote or request.method not in self.SAFE_METHODS
+
+    def get_pin_key(self, request):
+        authorization = request.META.get("HTTP_AUTHORIZATION")
+        if not authorization:
+            return None
+        return f"database-pin:{sha256(authorization.encode()).hexdigest()}"
@@ -0,0 +1,81 @@
+"""
+This file contains all the database routers for rollcall.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_DB_ALIAS = "replica"
+
+
+@dataclass
+class DatabaseRouting:
+    """
+    Routing state of the current request. Reads only go to the replica once
+    use_replica is set, and go back to the primary for good after the first
+    write so that a request always reads its own writes.
+    """
+
+    use_replica: bool = False
+    wrote: bool = False
+
+
+_database_routing: ContextVar[Optional[DatabaseRouting]] = ContextVar(
+    "database_routing", default=None
+)
+
+
+def get_database_routing() -> Optional[DatabaseRouting]:
+    return _database_routing.get()
+
+
+@contextmanager
+def database_routing(use_replica: bool = False) -> Iterator[DatabaseRouting]:
+    """
+    Tracks the database routing of the code run inside it, reads going to
+    the replica when use_replica is set. Outside of it everything goes to
+    the primary.
+    """
+    routing = DatabaseRouting(use_replica=use_replica)
+    token = _database_routing.set(routing)
+    try:
+        yield routing
+    finally:
+        _database_routing.reset(token)
+
+
+class ReadReplicaRouter:
+    """
+    Sends reads to the replica database when one is configured and the
+    current database routing allows it, and everything else to the primary.
+    Migrations only run on the primary, the replica following it through
+    replication.
+    """
+
+    def db_for_read(self, model, **hints):
+        routing = _database_routing.get()
+        if (
+            routing is not None
+            and routing.use_replica
+            and not routing.wrote
+            and REPLICA_DB_ALIAS in settings.DATABASES
+        ):
+            return REPLICA_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        routing = _database_routing.get()
+        if routing is not None:
+            routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -19,6 +19,9 @@ from .configurations.database import get_database_config
 
 load_dotenv()
 
+# Optional variables left blank, as copying .env.example leaves them, fall
+# back to their defaults like unset ones.
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -60,6 +63,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "rollcall.middlewares.ReadReplicaMiddleware",
 ]
 
 ROOT_URLCONF = "rollcall.urls"
@@ -88,6 +92,15 @@ WSGI_APPLICATION = "rollcall.wsgi.application"
 
 DATABASES = get_database_config()
 
+# Views flagged with use_read_replica read from the replica, when one is
+# configured. Clients that wrote stay on the primary for
+# DATABASE_REPLICA_PIN_SECONDS, which should exceed the replication lag.
+# The pins live in the default cache, which must be shared between
+# processes for them to hold across processes.
+
+DATABASE_ROUTERS = ["rollcall.routers.ReadReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get("DATABASE_REPLICA_PIN_SECONDS") or 5)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -107,12 +120,70 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# How the schedule and swap request lists build their rows: "python" renders
+# values rows with compiled serializers, "database" has PostgreSQL build each
+# row as json text that is written out without being decoded, see
+# utils.serializers.CompiledSerializer.
+
+LIST_SERIALIZATION = os.environ.get("LIST_SERIALIZATION") or "python"
+
+# Renderer encoding JSON responses, orjson backed by default. Set to
+# rest_framework.renderers.JSONRenderer for the stdlib json module, see
+# benchmarks.renderers.
+
+JSON_RENDERER_CLASS = (
+    os.environ.get("JSON_RENDERER_CLASS") or "utils.renderers.FastJSONRenderer"
+)
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": ["rollcall.authentications.JWTAuthentication"],
-    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"]
+    "DEFAULT_RENDERER_CLASSES": [JSON_RENDERER_CLASS]
     + (["rest_framework.renderers.BrowsableAPIRenderer"] if DEBUG else []),
 }
 
+# Lifetimes in seconds of the access tokens authenticating requests and of
+# the refresh tokens exchanged for new ones at users/token/refresh/. Each
+# refresh rotates the refresh token, so a client stays logged in as long as it
+# refreshes within JWT_REFRESH_TOKEN_LIFETIME.
+
+JWT_ACCESS_TOKEN_LIFETIME = int(os.environ.get("JWT_ACCESS_TOKEN_LIFETIME") or 900)
+JWT_REFRESH_TOKEN_LIFETIME = int(
+    os.environ.get("JWT_REFRESH_TOKEN_LIFETIME") or 30 * 24 * 60 * 60
+)
+
+# Verified JWT tokens are cached in memory by each process until they expire,
+# capped at JWT_TOKEN_CACHE_TTL seconds so that edits made through another
+# process are picked up within that window.
+
+JWT_TOKEN_CACHE_SIZE = int(os.environ.get("JWT_TOKEN_CACHE_SIZE") or 10000)
+JWT_TOKEN_CACHE_TTL = int(os.environ.get("JWT_TOKEN_CACHE_TTL") or 300)
+
+# Size of the per process thread pool running background tasks such as
+# schedule imports, see utils.workers
+
+BACKGROUND_WORKERS = int(os.environ.get("BACKGROUND_WORKERS") or 4)
+
+# Caches default to process local memory, in which case a write only evicts
+# the entries of its own process and others catch up after their TTL. Set
+# CACHE_BACKEND to django.core.cache.backends.redis.RedisCache and
+# CACHE_LOCATION to a redis url to share them between processes.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND")
+        or "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": os.environ.get("CACHE_LOCATION") or "",
+    }
+}
+
+# Cache alias and lifetime in seconds of the schedule reads cached by
+# rosters.caches, None reading schedules from the database only. With the
+# locmem backend writes only evict the entries of their own process, which
+# is only safe with a single process, see rosters.checks.
+
+SCHEDULE_CACHE = os.environ.get("SCHEDULE_CACHE") or "default"
+SCHEDULE_CACHE_TTL = int(os.environ.get("SCHEDULE_CACHE_TTL") or 300)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
@@ -136,6 +207,13 @@ STATIC_URL = "/static/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media/")
 MEDIA_URL = "/media/"
 
+# Local directory holding attendance images until a background worker has
+# re-encoded them into the media storage
+
+ATTENDANCE_SPOOL_ROOT = os.environ.get("ATTENDANCE_SPOOL_ROOT") or os.path.join(
+    BASE_DIR, "spool/"
+)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
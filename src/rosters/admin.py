@@ -9,6 +9,7 @@ from rosters.models import (
     Roster,
     RosterManager,
     RosterUserSchedule,
+    ScheduleImportJob,
     ScheduleSwapRequest,
 )
 
@@ -55,3 +56,12 @@ class ScheduleSwapRequestAdmin(ModelAdmin):
     list_filter = ("status",)
     list_select_related = ("sender", "receiver", "sender_schedule__roster")
     autocomplete_fields = ("sender", "receiver", "sender_schedule")
+
+
+@admin.register(ScheduleImportJob)
+class ScheduleImportJobAdmin(ModelAdmin):
+    list_display = ("id", "roster", "status", "committed_chunks", "created_rows")
+    search_fields = ("roster__title",)
+    list_filter = ("status",)
+    list_select_related = ("roster",)
+    autocomplete_fields = ("roster",)
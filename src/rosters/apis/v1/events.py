@@ -0,0 +1,60 @@
+"""
+This file contains all the APIs related to realtime roster events.
+"""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
+from rest_framework.status import HTTP_501_NOT_IMPLEMENTED
+
+from users.permissions import IsStaff
+from utils.events import event_broker
+from utils.response import DefaultResponse, EventStreamResponse
+from utils.views import AsyncAPIView
+
+
+class ScheduleEventStreamAPI(AsyncAPIView):
+    """
+    This API is used to push the schedule and swap request changes of a staff
+    user as server sent events, in place of polling the schedule and swap
+    request lists. Events are typed as listed in rosters.events.Event, with
+    the changed schedule or swap request as data. A `resync` event means
+    events may have been missed and the lists should be reloaded, as they
+    should be whenever the stream reconnects.
+    Requires an ASGI server, see README, a 501 being returned under WSGI
+    where the stream would hold a worker.
+    Django only releases the database connections of a request once its
+    response ends, so those used to authenticate are closed before streaming,
+    lest every open stream hold a pooled connection or a backend.
+    Response Codes:
+        200, 501
+    """
+
+    permission_classes = (IsStaff,)
+
+    # Seconds between keep alive comments on an idle stream
+    KEEP_ALIVE_INTERVAL = 15
+
+    async def get_events(self, user_id):
+        async with event_broker.subscribe(user_id=user_id) as queue:
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=self.KEEP_ALIVE_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    yield None
+                else:
+                    yield event["type"], event["data"]
+
+    async def get(self, request, *args, **kwargs):
+        if not isinstance(request._request, ASGIRequest):
+            return DefaultResponse(
+                errors="Event streams are only served by an ASGI server",
+                status=HTTP_501_NOT_IMPLEMENTED,
+            )
+
+        await sync_to_async(connections.close_all)()
+        return EventStreamResponse(events=self.get_events(user_id=request.user.uuid))
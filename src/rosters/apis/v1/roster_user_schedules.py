@@ -2,6 +2,10 @@
 This file contains all the APIs related to roster user schedules model.
 """
 
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import F
 from rest_framework import serializers
 from rest_framework.status import (
     HTTP_200_OK,
@@ -12,20 +16,37 @@ from rest_framework.status import (
 )
 from rest_framework.views import APIView
 
+from rosters.caches import (
+    aget_roster_week_schedules,
+    get_schedule_cache,
+    get_week_start,
+)
 from rosters.models import Roster, RosterManager, RosterUserSchedule
-from rosters.serializers import RosterUserScheduleSerializer
+from rosters.serializers import (
+    RosterUserScheduleDataSerializer,
+    RosterUserScheduleSerializer,
+)
 from rosters.services import (
     bulk_create_roster_user_schedule,
+    bulk_delete_roster_user_schedules,
+    bulk_restore_roster_user_schedules,
     update_roster_user_schedule,
+    validate_roster_user_schedules,
 )
 from users.models import UserRole
 from users.permissions import IsManager, IsStaff
-from utils.response import DefaultResponse
+from utils.pagination import KeysetPaginator
+from utils.response import DefaultResponse, PreEncodedResponse, StreamingExportResponse
+from utils.serializers import compile_serializer, normalize_users
+from utils.views import AsyncAPIView
 
 
 class BulkCreateRosterUserScheduleAPI(APIView):
     """
     This API is used to create multiple user schedules within a single roster.
+    Errors are reported per schedule, by its index in `user_schedules`. With
+    `allow_partial` the valid schedules are created and the invalid ones are
+    returned as errors alongside them.
     Response Codes:
         201, 400
     """
@@ -33,22 +54,8 @@ class BulkCreateRosterUserScheduleAPI(APIView):
     permission_classes = (IsManager,)
 
     class InputSerializer(serializers.Serializer):
-
-        class UserScheduleSerializer(serializers.Serializer):
-            user = serializers.UUIDField()
-            schedule_date = serializers.DateField()
-            start_time = serializers.DateTimeField()
-            end_time = serializers.DateTimeField()
-
-            def validate(self, attrs):
-                if attrs["start_time"] >= attrs["end_time"]:
-                    raise serializers.ValidationError(
-                        "End time must be greater than start time"
-                    )
-
-                return super().validate(attrs)
-
-        user_schedules = UserScheduleSerializer(many=True, min_length=1)
+        user_schedules = RosterUserScheduleDataSerializer(many=True, min_length=1)
+        allow_partial = serializers.BooleanField(default=False)
 
     OutputSerializer = RosterUserScheduleSerializer
 
@@ -79,16 +86,33 @@ class BulkCreateRosterUserScheduleAPI(APIView):
                 status=HTTP_400_BAD_REQUEST,
             )
 
+        user_schedule_data = serializer.validated_data["user_schedules"]
+        row_errors = None
+        if serializer.validated_data["allow_partial"]:
+            row_errors = validate_roster_user_schedules(
+                roster=roster, user_schedule_data=user_schedule_data
+            )
+            invalid_rows = {row_error["index"] for row_error in row_errors}
+            user_schedule_data = [
+                schedule_data
+                for index, schedule_data in enumerate(user_schedule_data)
+                if index not in invalid_rows
+            ]
+            if not user_schedule_data:
+                return DefaultResponse(errors=row_errors, status=HTTP_400_BAD_REQUEST)
+
         success, user_schedules = bulk_create_roster_user_schedule(
             roster=roster,
-            user_schedule_data=serializer.validated_data["user_schedules"],
+            user_schedule_data=user_schedule_data,
             created_by=request.user,
+            validated=row_errors is not None,
         )
         if not success:
             return DefaultResponse(errors=user_schedules, status=HTTP_400_BAD_REQUEST)
 
         return DefaultResponse(
             data=self.OutputSerializer(instance=user_schedules, many=True).data,
+            errors=row_errors or None,
             status=HTTP_201_CREATED,
         )
 
@@ -122,7 +146,7 @@ class UpdateRosterUserScheduleAPI(APIView):
             date_deleted__isnull=True,
             id=user_schedule_id,
             roster__rostermanager__manager=manager,
-        )
+        ).select_related("roster")
 
     def put(self, request, user_schedule_id, *args, **kwargs):
         serializer = self.InputSerializer(data=request.data)
@@ -142,7 +166,7 @@ class UpdateRosterUserScheduleAPI(APIView):
         success, user_schedule = update_roster_user_schedule(
             roster_user_schedule=user_schedule,
             updated_by=request.user,
-            **serializer.validated_data
+            **serializer.validated_data,
         )
 
         if not success:
@@ -154,31 +178,335 @@ class UpdateRosterUserScheduleAPI(APIView):
         )
 
 
-class ListRosterUserScheduleAPI(APIView):
+class ListRosterUserScheduleAPI(AsyncAPIView):
     """
     This API is used to list all the user schedules associated with a roster.
     In case a staff user accesses this API, he/she would only be able to access
     their own schedule(s) list.
+    Schedules are ordered by schedule date and paginated with an opaque cursor,
+    the `next_cursor` of a page fetches the page after it. `fields` takes a
+    comma separated list of schedule fields to return. With `normalize` each
+    schedule holds the uuid of its user, the users being returned once in
+    `users`, by uuid.
+    Ranges within a single week are served from the roster week cache when
+    SCHEDULE_CACHE is set, others are read as values rendered by the
+    compiled OutputSerializer, or as json built by the database depending on
+    LIST_SERIALIZATION, unless normalized.
+    Served asynchronously.
 
     Response Codes:
-        200
+        200, 400
     """
 
     permission_classes = (IsManager | IsStaff,)
+    use_read_replica = True
+
+    PAGE_SIZE = 100
+    MAX_PAGE_SIZE = 1000
+
+    class InputSerializer(serializers.Serializer):
+        start_date = serializers.DateField(required=False)
+        end_date = serializers.DateField(required=False)
+        cursor = serializers.CharField(required=False)
+        page_size = serializers.IntegerField(required=False, min_value=1)
+        fields = serializers.CharField(required=False)
+        normalize = serializers.BooleanField(default=False)
+
+        def validate_fields(self, value):
+            fields = [field.strip() for field in value.split(",") if field.strip()]
+            invalid_fields = set(fields) - set(RosterUserScheduleSerializer().fields)
+            if invalid_fields:
+                raise serializers.ValidationError(
+                    f"Invalid fields: {', '.join(sorted(invalid_fields))}"
+                )
+
+            return fields
+
+        def validate(self, attrs):
+            if (
+                attrs.get("start_date")
+                and attrs.get("end_date")
+                and attrs["start_date"] > attrs["end_date"]
+            ):
+                raise serializers.ValidationError(
+                    "End date must be greater than or equal to start date"
+                )
+
+            return super().validate(attrs)
 
     OutputSerializer = RosterUserScheduleSerializer
 
-    def get_queryset(self, roster_id):
-        return RosterUserSchedule.objects.filter(
+    def get_queryset(self, roster_id, start_date=None, end_date=None, fields=None):
+        user_schedules = RosterUserSchedule.objects.filter(
             date_deleted__isnull=True, roster_id=roster_id
         )
+        if start_date:
+            user_schedules = user_schedules.filter(schedule_date__gte=start_date)
+        if end_date:
+            user_schedules = user_schedules.filter(schedule_date__lte=end_date)
+        if fields is None or "user" in fields:
+            user_schedules = user_schedules.select_related("user")
+
+        return user_schedules
+
+    async def get(self, request, roster_id, *args, **kwargs):
+        serializer = self.InputSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return DefaultResponse(
+                errors=serializer.errors, status=HTTP_400_BAD_REQUEST
+            )
+
+        validated_data = serializer.validated_data
+        start_date = validated_data.get("start_date")
+        end_date = validated_data.get("end_date")
+        fields = validated_data.get("fields")
+        normalize = validated_data["normalize"]
+        is_manager = request.user.has_role(UserRole.Role.MANAGER)
+
+        paginator = KeysetPaginator(
+            ordering=("schedule_date", "id"),
+            page_size=min(
+                validated_data.get("page_size", self.PAGE_SIZE), self.MAX_PAGE_SIZE
+            ),
+        )
+        try:
+            if (
+                start_date
+                and end_date
+                and get_week_start(start_date) == get_week_start(end_date)
+                and get_schedule_cache() is not None
+            ):
+                user_schedules, next_cursor = paginator.paginate_rows(
+                    model=RosterUserSchedule,
+                    rows=[
+                        user_schedule
+                        for user_schedule in await aget_roster_week_schedules(
+                            roster_id=roster_id, week_start=get_week_start(start_date)
+                        )
+                        if start_date <= user_schedule.schedule_date <= end_date
+                        and (is_manager or user_schedule.user_id == request.user.uuid)
+                    ],
+                    cursor=validated_data.get("cursor"),
+                )
+                results = self.OutputSerializer(
+                    instance=user_schedules, many=True, fields=fields
+                ).data
+            else:
+                compiled_serializer = compile_serializer(
+                    self.OutputSerializer, fields=fields
+                )
+                user_schedules = self.get_queryset(
+                    roster_id=roster_id,
+                    start_date=start_date,
+                    end_date=end_date,
+                    fields=fields,
+                )
+                if not is_manager:
+                    user_schedules = user_schedules.filter(user=request.user)
+
+                if settings.LIST_SERIALIZATION == "database" and not normalize:
+                    user_schedules, next_cursor = await paginator.apaginate(
+                        queryset=compiled_serializer.json_values(
+                            user_schedules, *paginator.ordering
+                        ),
+                        cursor=validated_data.get("cursor"),
+                    )
+                    return PreEncodedResponse(
+                        data={
+                            "results": compiled_serializer.to_json(user_schedules),
+                            "next_cursor": next_cursor,
+                        },
+                        status=HTTP_200_OK,
+                    )
+
+                user_schedules, next_cursor = await paginator.apaginate(
+                    queryset=compiled_serializer.values(
+                        user_schedules, *paginator.ordering
+                    ),
+                    cursor=validated_data.get("cursor"),
+                )
+                results = compiled_serializer.to_representation(user_schedules)
+        except ValidationError as error:
+            return DefaultResponse(
+                errors={"cursor": error.messages}, status=HTTP_400_BAD_REQUEST
+            )
+
+        data = {"results": results, "next_cursor": next_cursor}
+        if normalize:
+            data["users"] = normalize_users(
+                rows=results, fields=self.OutputSerializer.normalized_user_fields
+            )
+
+        return DefaultResponse(data=data, status=HTTP_200_OK)
+
+
+class ExportRosterUserScheduleAPI(APIView):
+    """
+    This API is used to export all the user schedules of a roster for a
+    roster manager. Rows are read from a server side cursor and streamed as
+    newline delimited JSON or CSV, so memory use does not grow with the
+    size of the export, under WSGI as under ASGI.
+    Response Codes:
+        200, 400, 404
+    """
+
+    permission_classes = (IsManager,)
+    use_read_replica = True
+
+    CHUNK_SIZE = 2000
+    COLUMNS = (
+        "id",
+        "schedule_date",
+        "start_time",
+        "end_time",
+        "user_id",
+        "user_email",
+        "user_first_name",
+        "user_last_name",
+    )
+
+    class InputSerializer(serializers.Serializer):
+        export_format = serializers.ChoiceField(
+            choices=[StreamingExportResponse.NDJSON, StreamingExportResponse.CSV],
+            default=StreamingExportResponse.NDJSON,
+        )
+        start_date = serializers.DateField(required=False)
+        end_date = serializers.DateField(required=False)
+
+    def get_queryset(self, roster_id, start_date=None, end_date=None):
+        user_schedules = RosterUserSchedule.objects.filter(
+            date_deleted__isnull=True, roster_id=roster_id
+        )
+        if start_date:
+            user_schedules = user_schedules.filter(schedule_date__gte=start_date)
+        if end_date:
+            user_schedules = user_schedules.filter(schedule_date__lte=end_date)
+
+        return user_schedules.order_by("schedule_date", "id").values(
+            "id",
+            "schedule_date",
+            "start_time",
+            "end_time",
+            "user_id",
+            user_email=F("user__email"),
+            user_first_name=F("user__first_name"),
+            user_last_name=F("user__last_name"),
+        )
 
     def get(self, request, roster_id, *args, **kwargs):
-        user_schedules = self.get_queryset(roster_id=roster_id)
-        if not request.user.userrole_set.filter(role=UserRole.Role.MANAGER).exists():
-            user_schedules = user_schedules.filter(user=request.user)
+        serializer = self.InputSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return DefaultResponse(
+                errors=serializer.errors, status=HTTP_400_BAD_REQUEST
+            )
 
-        return DefaultResponse(
-            data=self.OutputSerializer(instance=user_schedules, many=True).data,
-            status=HTTP_200_OK,
+        validated_data = serializer.validated_data
+
+        if not RosterManager.objects.filter(
+            roster_id=roster_id, manager=request.user, date_deleted__isnull=True
+        ).exists():
+            return DefaultResponse(
+                errors="No roster found for given roster id",
+                status=HTTP_404_NOT_FOUND,
+            )
+
+        user_schedules = self.get_queryset(
+            roster_id=roster_id,
+            start_date=validated_data.get("start_date"),
+            end_date=validated_data.get("end_date"),
+        )
+
+        # Rows are only read once the response is streamed, after the request
+        # has left its database routing, so the database is resolved now
+        user_schedules = user_schedules.using(user_schedules.db)
+
+        # Django buffers sync iterators in full before streaming them to an
+        # ASGI server, so the rows are read asynchronously there
+        if isinstance(request._request, ASGIRequest):
+            rows = user_schedules.aiterator(chunk_size=self.CHUNK_SIZE)
+        else:
+            rows = user_schedules.iterator(chunk_size=self.CHUNK_SIZE)
+
+        return StreamingExportResponse(
+            rows=rows,
+            columns=self.COLUMNS,
+            export_format=validated_data["export_format"],
+            filename=f"roster-{roster_id}-schedules",
+        )
+
+
+class BulkActionRosterUserScheduleAPI(APIView):
+    """
+    This API is used to soft delete or restore the schedules of a roster
+    between two dates in bulk, optionally only those of the given users or
+    schedule ids. Pending swap requests follow their schedules. Returns the
+    ids of the affected schedules and swap requests.
+    Response Codes:
+        200, 400, 404
+    """
+
+    permission_classes = (IsManager,)
+
+    class InputSerializer(serializers.Serializer):
+        action = serializers.ChoiceField(choices=["delete", "restore"])
+        start_date = serializers.DateField()
+        end_date = serializers.DateField()
+        users = serializers.ListField(
+            child=serializers.UUIDField(), required=False, min_length=1
+        )
+        schedules = serializers.ListField(
+            child=serializers.IntegerField(), required=False, min_length=1
         )
+
+        def validate(self, attrs):
+            if attrs["start_date"] > attrs["end_date"]:
+                raise serializers.ValidationError(
+                    "End date must be greater than or equal to start date"
+                )
+
+            return super().validate(attrs)
+
+    def get_queryset(self, manager, roster_id):
+        return Roster.objects.filter(
+            id=roster_id,
+            date_deleted__isnull=True,
+            rostermanager__manager=manager,
+            rostermanager__date_deleted__isnull=True,
+        )
+
+    def post(self, request, roster_id, *args, **kwargs):
+        serializer = self.InputSerializer(data=request.data)
+        if not serializer.is_valid():
+            return DefaultResponse(
+                errors=serializer.errors, status=HTTP_400_BAD_REQUEST
+            )
+
+        validated_data = serializer.validated_data
+
+        roster = self.get_queryset(manager=request.user, roster_id=roster_id).first()
+        if not roster:
+            return DefaultResponse(
+                errors="No roster found for given roster id",
+                status=HTTP_404_NOT_FOUND,
+            )
+
+        filters = {
+            "roster": roster,
+            "start_date": validated_data["start_date"],
+            "end_date": validated_data["end_date"],
+            "user_ids": validated_data.get("users"),
+            "schedule_ids": validated_data.get("schedules"),
+        }
+        if validated_data["action"] == "delete":
+            success, result = bulk_delete_roster_user_schedules(
+                deleted_by=request.user, **filters
+            )
+        else:
+            success, result = bulk_restore_roster_user_schedules(
+                restored_by=request.user, **filters
+            )
+
+        if not success:
+            return DefaultResponse(errors=result, status=HTTP_400_BAD_REQUEST)
+
+        return DefaultResponse(data=result, status=HTTP_200_OK)
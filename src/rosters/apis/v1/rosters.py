@@ -12,6 +12,7 @@ from rosters.models import Roster, RosterManager
 from rosters.serializers import RosterSerializer
 from rosters.services import create_roster, create_roster_manager
 from users.permissions import IsManager
+from utils.models import validation_context
 from utils.response import DefaultResponse, EmptyResponse
 
 
@@ -43,11 +44,13 @@ class CreateRosterAPI(APIView):
                 if not success:
                     raise ValidationError(message=roster)
 
-                success, roster_manager = create_roster_manager(
-                    roster=roster,
-                    manager=request.user,
-                    created_by=request.user,
-                )
+                # The roster is new and IsManager already checked the role
+                with validation_context(RosterManager, "manager", "constraints"):
+                    success, roster_manager = create_roster_manager(
+                        roster=roster,
+                        manager=request.user,
+                        created_by=request.user,
+                    )
                 if not success:
                     raise ValidationError(message=roster_manager)
 
@@ -65,6 +68,7 @@ class ListRosterAPI(APIView):
     """
 
     permission_classes = (IsManager,)
+    use_read_replica = True
 
     OutputSerializer = RosterSerializer
 
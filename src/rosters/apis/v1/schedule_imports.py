@@ -0,0 +1,189 @@
+"""
+This file contains all the APIs related to schedule import job model.
+"""
+
+from django.core.validators import FileExtensionValidator
+from rest_framework import serializers
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_202_ACCEPTED,
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+)
+from rest_framework.views import APIView
+
+from rosters.models import Roster, RosterManager, ScheduleImportJob
+from rosters.serializers import ScheduleImportJobSerializer
+from rosters.services import (
+    create_schedule_import_job,
+    process_schedule_import_job,
+    resume_schedule_import_job,
+)
+from users.permissions import IsManager
+from utils.files import ValidateFileSize
+from utils.response import DefaultResponse
+from utils.workers import submit_task_on_commit
+
+
+class CreateScheduleImportJobAPI(APIView):
+    """
+    This API is used to import user schedules of a roster from a CSV or
+    NDJSON file with the columns user, schedule_date, start_time and end_time.
+    The file is imported in the background, the returned job is polled
+    for progress.
+    Response Codes:
+        202, 400
+    """
+
+    permission_classes = (IsManager,)
+
+    class InputSerializer(serializers.Serializer):
+        file = serializers.FileField(
+            validators=[
+                ValidateFileSize(max_file_size=ScheduleImportJob.MAX_FILE_SIZE),
+                FileExtensionValidator(allowed_extensions=("csv", "ndjson", "jsonl")),
+            ]
+        )
+        file_format = serializers.ChoiceField(
+            choices=ScheduleImportJob.FileFormat.choices, required=False
+        )
+        chunk_size = serializers.IntegerField(
+            min_value=50, max_value=5000, required=False
+        )
+
+        def validate(self, attrs):
+            if "file_format" not in attrs:
+                attrs["file_format"] = (
+                    ScheduleImportJob.FileFormat.CSV
+                    if attrs["file"].name.lower().endswith(".csv")
+                    else ScheduleImportJob.FileFormat.NDJSON
+                )
+
+            return super().validate(attrs)
+
+    OutputSerializer = ScheduleImportJobSerializer
+
+    def get_queryset(self, user, roster_id):
+        return RosterManager.objects.filter(
+            roster_id=roster_id, manager=user, date_deleted__isnull=True
+        )
+
+    def post(self, request, roster_id, *args, **kwargs):
+        serializer = self.InputSerializer(data=request.data)
+        if not serializer.is_valid():
+            return DefaultResponse(
+                errors=serializer.errors, status=HTTP_400_BAD_REQUEST
+            )
+
+        roster = Roster.objects.filter(
+            id=roster_id, is_active=True, date_deleted__isnull=True
+        ).first()
+        if not roster:
+            return DefaultResponse(
+                errors="User schedules can only be created for an active roster",
+                status=HTTP_400_BAD_REQUEST,
+            )
+
+        if not self.get_queryset(user=request.user, roster_id=roster_id).exists():
+            return DefaultResponse(
+                errors="Only roster manager can add user schedules",
+                status=HTTP_400_BAD_REQUEST,
+            )
+
+        success, schedule_import_job = create_schedule_import_job(
+            roster=roster, created_by=request.user, **serializer.validated_data
+        )
+        if not success:
+            return DefaultResponse(
+                errors=schedule_import_job, status=HTTP_400_BAD_REQUEST
+            )
+
+        submit_task_on_commit(
+            process_schedule_import_job,
+            schedule_import_job_id=schedule_import_job.id,
+        )
+
+        return DefaultResponse(
+            data=self.OutputSerializer(instance=schedule_import_job).data,
+            status=HTTP_202_ACCEPTED,
+        )
+
+
+class RetrieveScheduleImportJobAPI(APIView):
+    """
+    This API is used to get the status and progress of a schedule import job.
+    Response Codes:
+        200, 404
+    """
+
+    permission_classes = (IsManager,)
+
+    OutputSerializer = ScheduleImportJobSerializer
+
+    def get_queryset(self, manager, schedule_import_job_id):
+        return ScheduleImportJob.objects.filter(
+            date_deleted__isnull=True,
+            id=schedule_import_job_id,
+            roster__rostermanager__manager=manager,
+        )
+
+    def get(self, request, schedule_import_job_id, *args, **kwargs):
+        schedule_import_job = self.get_queryset(
+            manager=request.user, schedule_import_job_id=schedule_import_job_id
+        ).first()
+        if not schedule_import_job:
+            return DefaultResponse(
+                errors="No import job found", status=HTTP_404_NOT_FOUND
+            )
+
+        return DefaultResponse(
+            data=self.OutputSerializer(instance=schedule_import_job).data,
+            status=HTTP_200_OK,
+        )
+
+
+class ResumeScheduleImportJobAPI(APIView):
+    """
+    This API is used to resume a failed or stalled schedule import job from
+    its last committed chunk, without uploading the file again.
+    Response Codes:
+        202, 400, 404
+    """
+
+    permission_classes = (IsManager,)
+
+    OutputSerializer = ScheduleImportJobSerializer
+
+    def get_queryset(self, manager, schedule_import_job_id):
+        return ScheduleImportJob.objects.filter(
+            date_deleted__isnull=True,
+            id=schedule_import_job_id,
+            roster__rostermanager__manager=manager,
+        )
+
+    def post(self, request, schedule_import_job_id, *args, **kwargs):
+        schedule_import_job = self.get_queryset(
+            manager=request.user, schedule_import_job_id=schedule_import_job_id
+        ).first()
+        if not schedule_import_job:
+            return DefaultResponse(
+                errors="No import job found", status=HTTP_404_NOT_FOUND
+            )
+
+        success, schedule_import_job = resume_schedule_import_job(
+            schedule_import_job=schedule_import_job, updated_by=request.user
+        )
+        if not success:
+            return DefaultResponse(
+                errors=schedule_import_job, status=HTTP_400_BAD_REQUEST
+            )
+
+        submit_task_on_commit(
+            process_schedule_import_job,
+            schedule_import_job_id=schedule_import_job.id,
+        )
+
+        return DefaultResponse(
+            data=self.OutputSerializer(instance=schedule_import_job).data,
+            status=HTTP_202_ACCEPTED,
+        )
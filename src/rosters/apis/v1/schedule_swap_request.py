@@ -2,27 +2,30 @@
 This file contains all the APIs related to schedule swap request model.
 """
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.utils.timezone import now
 from rest_framework import serializers
 from rest_framework.status import (
-    HTTP_201_CREATED,
     HTTP_200_OK,
+    HTTP_201_CREATED,
     HTTP_400_BAD_REQUEST,
     HTTP_404_NOT_FOUND,
 )
 from rest_framework.views import APIView
 
 from rosters.models import RosterUserSchedule, ScheduleSwapRequest
+from rosters.serializers import ScheduleSwapRequestSerializer
 from rosters.services import (
-    bulk_create_roster_user_schedule,
+    accept_schedule_swap_request,
     create_schedule_swap_request,
-    update_schedule_swap_request,
+    reject_schedule_swap_request,
 )
 from users.permissions import IsStaff
-from utils.response import DefaultResponse, EmptyResponse
-from rosters.serializers import ScheduleSwapRequestSerializer
+from utils.functions import ISODateTime
+from utils.response import DefaultResponse, EmptyResponse, PreEncodedResponse
+from utils.serializers import compile_serializer, normalize_users
+from utils.views import AsyncAPIView
 
 
 class CreateScheduleSwapRequest(APIView):
@@ -52,15 +55,19 @@ class CreateScheduleSwapRequest(APIView):
 
         validated_data = serializer.validated_data
 
-        if not self.get_queryset(
+        schedule = self.get_queryset(
             user=request.user, schedule_id=validated_data["schedule"]
-        ).exists():
+        ).first()
+        if not schedule:
             return DefaultResponse(
                 errors="No schedule found for given data", status=HTTP_404_NOT_FOUND
             )
 
         success, schedule_swap_request = create_schedule_swap_request(
-            sender=request.user, created_by=request.user, **validated_data
+            sender=request.user,
+            receiver=validated_data["receiver"],
+            schedule=schedule,
+            created_by=request.user,
         )
         if not success:
             return DefaultResponse(
@@ -70,39 +77,90 @@ class CreateScheduleSwapRequest(APIView):
         return EmptyResponse(status=HTTP_201_CREATED)
 
 
-class ListScheduleSwapRequest(APIView):
+class ListScheduleSwapRequest(AsyncAPIView):
     """
     This API is used to list all schedule swap requests received by a user.
+    With `normalize` the swap requests are returned in `results`, each holding
+    the uuid of its sender, the senders being returned once in `users`, by
+    uuid.
+    Read as values rendered by the compiled OutputSerializer, or as json
+    built by the database depending on LIST_SERIALIZATION unless normalized,
+    and served asynchronously.
     Response Codes:
-        200
+        200, 400
     """
 
     permission_classes = (IsStaff,)
+    use_read_replica = True
+
+    class InputSerializer(serializers.Serializer):
+        normalize = serializers.BooleanField(default=False)
 
     class OutputSerializer(ScheduleSwapRequestSerializer):
         request_date = serializers.SerializerMethodField()
 
+        compiled_sources = {"request_date": ("date_created",)}
+        compiled_expressions = {
+            "request_date": ISODateTime("date_created", timezone_name="UTC")
+        }
+
         def get_request_date(self, instance):
             return instance.date_created
 
         class Meta:
             model = ScheduleSwapRequest
-            fields = ("id","sender", "request_date")
+            fields = ("id", "sender", "request_date")
 
     def get_queryset(self, user):
         return ScheduleSwapRequest.objects.filter(
             date_deleted__isnull=True,
             receiver=user,
             status=ScheduleSwapRequest.Status.PENDING,
-        )
+        ).order_by("id")
+
+    async def get(self, request, *args, **kwargs):
+        serializer = self.InputSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return DefaultResponse(
+                errors=serializer.errors, status=HTTP_400_BAD_REQUEST
+            )
+
+        normalize = serializer.validated_data["normalize"]
+        compiled_serializer = compile_serializer(self.OutputSerializer)
+        if settings.LIST_SERIALIZATION == "database" and not normalize:
+            return PreEncodedResponse(
+                data=compiled_serializer.to_json(
+                    [
+                        row
+                        async for row in compiled_serializer.json_values(
+                            self.get_queryset(user=request.user)
+                        )
+                    ]
+                ),
+                status=HTTP_200_OK,
+            )
 
-    def get(self, request, *args, **kwargs):
-        return DefaultResponse(
-            data=self.OutputSerializer(
-                instance=self.get_queryset(user=request.user), many=True
-            ).data,
-            status=HTTP_200_OK,
+        schedule_swap_requests = compiled_serializer.to_representation(
+            [
+                row
+                async for row in compiled_serializer.values(
+                    self.get_queryset(user=request.user)
+                )
+            ]
         )
+        if normalize:
+            return DefaultResponse(
+                data={
+                    "results": schedule_swap_requests,
+                    "users": normalize_users(
+                        rows=schedule_swap_requests,
+                        fields=self.OutputSerializer.normalized_user_fields,
+                    ),
+                },
+                status=HTTP_200_OK,
+            )
+
+        return DefaultResponse(data=schedule_swap_requests, status=HTTP_200_OK)
 
 
 class AcceptRejectScheduleSwapRequest(APIView):
@@ -127,13 +185,17 @@ class AcceptRejectScheduleSwapRequest(APIView):
             return getattr(ScheduleSwapRequest.Status, value.upper())
 
     def get_queryset(self, receiver, swap_request_id):
-        return ScheduleSwapRequest.objects.filter(
-            date_deleted__isnull=True,
-            id=swap_request_id,
-            sender_schedule__date_deleted__isnull=True,
-            receiver=receiver,
-            status=ScheduleSwapRequest.Status.PENDING,
-        ).select_related("sender_schedule")
+        return (
+            ScheduleSwapRequest.objects.filter(
+                date_deleted__isnull=True,
+                id=swap_request_id,
+                sender_schedule__date_deleted__isnull=True,
+                receiver=receiver,
+                status=ScheduleSwapRequest.Status.PENDING,
+            )
+            .select_related("sender_schedule")
+            .select_for_update(of=("self",))
+        )
 
     def post(self, request, *args, **kwargs):
         serializer = self.InputSerializer(data=request.data)
@@ -144,68 +206,31 @@ class AcceptRejectScheduleSwapRequest(APIView):
 
         validated_data = serializer.validated_data
 
-        schedule_swap_request = self.get_queryset(
-            receiver=request.user, swap_request_id=validated_data["swap_request_id"]
-        ).first()
-        if not schedule_swap_request:
-            return DefaultResponse(
-                errors="No swap request found with given data",
-                status=HTTP_404_NOT_FOUND,
-            )
-
         try:
             with transaction.atomic():
-                success, swap_request = update_schedule_swap_request(
-                    schedule_swap_request=schedule_swap_request,
-                    status=validated_data["action"],
-                    date_deleted=now(),
-                )
-                if not success:
-                    raise ValidationError(swap_request)
-
-                if swap_request.status == ScheduleSwapRequest.Status.ACCEPTED:
-                    sender_schedule = schedule_swap_request.sender_schedule
-                    receiver_schedule = RosterUserSchedule.objects.filter(
-                        date_deleted__isnull=True,
-                        user=request.user,
-                        schedule_date=sender_schedule.schedule_date,
-                    ).first()
-
-                    if not receiver_schedule:
-                        raise ValidationError("No schedule found for receiver")
-
-                    new_schedule_data = [
-                        {
-                            "user": sender_schedule.user,
-                            "schedule_date": receiver_schedule.schedule_date,
-                            "start_time": receiver_schedule.start_time,
-                            "end_time": receiver_schedule.end_time,
-                        },
-                        {
-                            "user": receiver_schedule.user,
-                            "schedule_date": sender_schedule.schedule_date,
-                            "start_time": sender_schedule.start_time,
-                            "end_time": sender_schedule.end_time,
-                        },
-                    ]
-                    sender_schedule.date_deleted = now()
-                    sender_schedule.updated_by = request.user
-
-                    receiver_schedule.date_deleted = now()
-                    receiver_schedule.updated_by = request.user
-
-                    RosterUserSchedule.objects.bulk_update(
-                        objs=[sender_schedule, receiver_schedule],
-                        fields=["date_deleted", "updated_by"],
+                schedule_swap_request = self.get_queryset(
+                    receiver=request.user,
+                    swap_request_id=validated_data["swap_request_id"],
+                ).first()
+                if not schedule_swap_request:
+                    return DefaultResponse(
+                        errors="No swap request found with given data",
+                        status=HTTP_404_NOT_FOUND,
                     )
 
-                    success, roster_user_schedules = bulk_create_roster_user_schedule(
-                        roster=sender_schedule.roster,
-                        user_schedule_data=new_schedule_data,
-                        created_by=request.user,
+                if validated_data["action"] == ScheduleSwapRequest.Status.ACCEPTED:
+                    success, result = accept_schedule_swap_request(
+                        schedule_swap_request=schedule_swap_request,
+                        accepted_by=request.user,
+                    )
+                else:
+                    success, result = reject_schedule_swap_request(
+                        schedule_swap_request=schedule_swap_request,
+                        rejected_by=request.user,
                     )
-                    if not success:
-                        raise ValidationError(roster_user_schedules)
+
+                if not success:
+                    raise ValidationError(result)
 
         except ValidationError as error:
             return DefaultResponse(errors=str(error), status=HTTP_400_BAD_REQUEST)
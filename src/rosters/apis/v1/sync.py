@@ -0,0 +1,129 @@
+"""
+This file contains all the APIs related to incremental sync of rosters module.
+"""
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework import serializers
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+from rest_framework.views import APIView
+
+from rosters.models import RosterUserSchedule, ScheduleSwapRequest
+from rosters.serializers import (
+    RosterUserScheduleSerializer,
+    ScheduleSwapRequestSerializer,
+)
+from users.permissions import IsStaff
+from utils.changes import decode_change_token, encode_change_token, get_change_xid
+from utils.response import DefaultResponse
+from utils.serializers import compile_serializer, normalize_users
+
+
+class SyncScheduleAPI(APIView):
+    """
+    This API is used to sync the schedules of a staff user and the swap
+    requests they sent or received.
+    Without `since` the active rows are returned, and with the `token` of a
+    previous sync only the rows created, updated or deleted since then,
+    deleted rows having `is_deleted` set. Each response returns the `token`
+    to pass as `since` to the next sync. A row may be returned again by the
+    sync following the one it was returned by. With `normalize` the rows hold
+    the uuid of their users, the users being returned once in `users`, by
+    uuid.
+    Response Codes:
+        200, 400
+    """
+
+    permission_classes = (IsStaff,)
+
+    class InputSerializer(serializers.Serializer):
+        since = serializers.CharField(required=False)
+        normalize = serializers.BooleanField(default=False)
+
+        def validate_since(self, value):
+            try:
+                return decode_change_token(value)
+            except ValidationError as error:
+                raise serializers.ValidationError(error.messages)
+
+    class ScheduleOutputSerializer(RosterUserScheduleSerializer):
+        is_deleted = serializers.SerializerMethodField()
+
+        compiled_sources = {"is_deleted": ("date_deleted",)}
+
+        def get_is_deleted(self, instance):
+            return instance.date_deleted is not None
+
+        class Meta(RosterUserScheduleSerializer.Meta):
+            pass
+
+    class SwapRequestOutputSerializer(ScheduleSwapRequestSerializer):
+        is_deleted = serializers.SerializerMethodField()
+
+        compiled_sources = {
+            **ScheduleSwapRequestSerializer.compiled_sources,
+            "is_deleted": ("date_deleted",),
+        }
+
+        def get_is_deleted(self, instance):
+            return instance.date_deleted is not None
+
+        class Meta(ScheduleSwapRequestSerializer.Meta):
+            pass
+
+    def get_queryset(self, model, user_filter, since=None):
+        queryset = model.objects.filter(user_filter)
+        if since is None:
+            return queryset.filter(date_deleted__isnull=True).order_by("id")
+
+        return queryset.filter(change_xid__gte=since).order_by("id")
+
+    def get_data(self, output_serializer, queryset):
+        compiled_serializer = compile_serializer(output_serializer)
+        return compiled_serializer.to_representation(
+            compiled_serializer.values(queryset)
+        )
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.InputSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return DefaultResponse(
+                errors=serializer.errors, status=HTTP_400_BAD_REQUEST
+            )
+
+        since = serializer.validated_data.get("since")
+        # Read before the rows, so that changes committed after them are
+        # covered by the next sync
+        change_xid = get_change_xid()
+
+        data = {
+            "schedules": self.get_data(
+                output_serializer=self.ScheduleOutputSerializer,
+                queryset=self.get_queryset(
+                    model=RosterUserSchedule,
+                    user_filter=Q(user=request.user),
+                    since=since,
+                ),
+            ),
+            "swap_requests": self.get_data(
+                output_serializer=self.SwapRequestOutputSerializer,
+                queryset=self.get_queryset(
+                    model=ScheduleSwapRequest,
+                    user_filter=Q(sender=request.user) | Q(receiver=request.user),
+                    since=since,
+                ),
+            ),
+            "token": encode_change_token(change_xid),
+        }
+        if serializer.validated_data["normalize"]:
+            data["users"] = normalize_users(
+                rows=data["schedules"],
+                fields=self.ScheduleOutputSerializer.normalized_user_fields,
+            )
+            normalize_users(
+                rows=data["swap_requests"],
+                fields=self.SwapRequestOutputSerializer.normalized_user_fields,
+                users=data["users"],
+            )
+
+        return DefaultResponse(data=data, status=HTTP_200_OK)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class RostersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "rosters"
+
+    def ready(self):
+        from rosters import checks, signals  # noqa: F401
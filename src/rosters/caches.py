@@ -0,0 +1,195 @@
+"""
+This file contains all the caches of rosters module.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from rosters.models import RosterUserSchedule
+
+# Fields cached for every schedule, enough for RosterUserScheduleSerializer
+SCHEDULE_FIELDS = (
+    "id",
+    "roster",
+    "user",
+    "schedule_date",
+    "start_time",
+    "end_time",
+    "user__uuid",
+    "user__email",
+    "user__first_name",
+    "user__last_name",
+)
+
+# Cached schedules are always read from the primary, since filling the cache
+# from a lagging replica right after an invalidation would keep serving the
+# stale rows for a whole TTL
+SCHEDULE_DB_ALIAS = DEFAULT_DB_ALIAS
+
+
+def get_schedule_cache() -> Optional[BaseCache]:
+    """
+    Returns None when SCHEDULE_CACHE is None, schedules then being read
+    from the database. rosters.checks warns when it is local to each
+    process, since a write only evicts entries of the cache it runs against.
+    """
+    if settings.SCHEDULE_CACHE is None:
+        return None
+
+    return caches[settings.SCHEDULE_CACHE]
+
+
+def get_week_start(schedule_date: date) -> date:
+    return schedule_date - timedelta(days=schedule_date.weekday())
+
+
+def get_roster_week_key(roster_id: int, week_start: date) -> str:
+    return f"rosters:schedules:roster:{roster_id}:{week_start.isoformat()}"
+
+
+def get_user_date_key(user_id: UUID, schedule_date: date) -> str:
+    return f"rosters:schedules:user:{user_id}:{schedule_date.isoformat()}"
+
+
+def get_roster_week_queryset(roster_id: int, week_start: date):
+    return (
+        RosterUserSchedule.objects.using(SCHEDULE_DB_ALIAS)
+        .filter(
+            date_deleted__isnull=True,
+            roster_id=roster_id,
+            schedule_date__range=(week_start, week_start + timedelta(days=6)),
+        )
+        .select_related("user")
+        .only(*SCHEDULE_FIELDS)
+        .order_by("schedule_date", "id")
+    )
+
+
+def get_roster_week_schedules(
+    roster_id: int, week_start: date
+) -> List[RosterUserSchedule]:
+    """
+    Returns the active schedules of a roster in the week starting on the given
+    monday, ordered by schedule date and id, with their users.
+    """
+
+    cache = get_schedule_cache()
+    key = get_roster_week_key(roster_id=roster_id, week_start=week_start)
+
+    roster_user_schedules = cache.get(key)
+    if roster_user_schedules is None:
+        roster_user_schedules = list(
+            get_roster_week_queryset(roster_id=roster_id, week_start=week_start)
+        )
+        cache.set(key, roster_user_schedules, settings.SCHEDULE_CACHE_TTL)
+
+    return roster_user_schedules
+
+
+async def aget_roster_week_schedules(
+    roster_id: int, week_start: date
+) -> List[RosterUserSchedule]:
+    """
+    Async counterpart of get_roster_week_schedules.
+    """
+
+    cache = get_schedule_cache()
+    key = get_roster_week_key(roster_id=roster_id, week_start=week_start)
+
+    roster_user_schedules = await cache.aget(key)
+    if roster_user_schedules is None:
+        roster_user_schedules = [
+            roster_user_schedule
+            async for roster_user_schedule in get_roster_week_queryset(
+                roster_id=roster_id, week_start=week_start
+            )
+        ]
+        await cache.aset(key, roster_user_schedules, settings.SCHEDULE_CACHE_TTL)
+
+    return roster_user_schedules
+
+
+def get_user_date_schedules(
+    user_id: UUID, schedule_dates: Iterable[date]
+) -> Dict[date, List[RosterUserSchedule]]:
+    """
+    Returns the active schedules of a user on each of the given dates across
+    all rosters, ordered by id, with the user. The dates missing from the
+    cache are read with a single query.
+    """
+
+    cache = get_schedule_cache()
+    keys = {
+        get_user_date_key(user_id=user_id, schedule_date=schedule_date): schedule_date
+        for schedule_date in schedule_dates
+    }
+
+    cached = cache.get_many(keys) if cache is not None else {}
+    user_date_schedules = {keys[key]: value for key, value in cached.items()}
+
+    missing = {
+        schedule_date: []
+        for schedule_date in keys.values()
+        if schedule_date not in user_date_schedules
+    }
+    if missing:
+        for roster_user_schedule in (
+            RosterUserSchedule.objects.using(SCHEDULE_DB_ALIAS)
+            .filter(
+                date_deleted__isnull=True,
+                user_id=user_id,
+                schedule_date__in=list(missing),
+            )
+            .select_related("user")
+            .only(*SCHEDULE_FIELDS)
+            .order_by("id")
+        ):
+            missing[roster_user_schedule.schedule_date].append(roster_user_schedule)
+
+        if cache is not None:
+            cache.set_many(
+                {
+                    get_user_date_key(
+                        user_id=user_id, schedule_date=schedule_date
+                    ): roster_user_schedules
+                    for schedule_date, roster_user_schedules in missing.items()
+                },
+                settings.SCHEDULE_CACHE_TTL,
+            )
+        user_date_schedules.update(missing)
+
+    return user_date_schedules
+
+
+def invalidate_schedule_cache(schedules: Iterable[Tuple[int, UUID, date]]) -> None:
+    """
+    Evicts the cached reads covering the given (roster_id, user_id,
+    schedule_date) schedules. Called by every service writing schedules, and
+    by rosters.signals for the other saves and deletes, such as admin edits.
+    Entries are evicted right away and again once the current transaction
+    commits, so a read racing the write cannot cache the old rows for long.
+    """
+
+    cache = get_schedule_cache()
+    if cache is None:
+        return
+
+    keys = set()
+    for roster_id, user_id, schedule_date in schedules:
+        keys.add(
+            get_roster_week_key(
+                roster_id=roster_id, week_start=get_week_start(schedule_date)
+            )
+        )
+        keys.add(get_user_date_key(user_id=user_id, schedule_date=schedule_date))
+
+    if not keys:
+        return
+
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,49 @@
+"""
+This file contains all the system checks for rosters module.
+"""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+# Cache backends keeping their entries in the memory of each process
+PROCESS_LOCAL_CACHE_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache",)
+
+
+@register(Tags.caches)
+def check_schedule_cache(app_configs, **kwargs):
+    """
+    A write only evicts the cached schedules of the cache it runs against,
+    so with a cache local to each process other workers keep serving stale
+    schedules until the entries expire.
+    """
+
+    if settings.SCHEDULE_CACHE is None:
+        return []
+
+    if settings.SCHEDULE_CACHE not in settings.CACHES:
+        return [
+            Error(
+                f"SCHEDULE_CACHE refers to the undefined cache "
+                f"'{settings.SCHEDULE_CACHE}'.",
+                id="rosters.E001",
+            )
+        ]
+
+    if (
+        settings.CACHES[settings.SCHEDULE_CACHE]["BACKEND"]
+        in PROCESS_LOCAL_CACHE_BACKENDS
+    ):
+        return [
+            Warning(
+                "SCHEDULE_CACHE refers to a cache local to each process, which "
+                "is only safe when serving with a single process.",
+                hint=(
+                    "Set CACHE_BACKEND to a shared backend such as "
+                    "django.core.cache.backends.redis.RedisCache when running "
+                    "several workers."
+                ),
+                id="rosters.W001",
+            )
+        ]
+
+    return []
@@ -0,0 +1,72 @@
+"""
+This file contains all the realtime events of rosters module, pushed to the
+users they concern through rosters.apis.v1.events.
+"""
+
+from typing import Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from rosters.models import RosterUserSchedule, ScheduleSwapRequest
+
+
+class Event:
+    SCHEDULE_CREATED = "schedule.created"
+    SCHEDULE_UPDATED = "schedule.updated"
+    SCHEDULE_DELETED = "schedule.deleted"
+    SCHEDULE_RESTORED = "schedule.restored"
+    SWAP_REQUEST_CREATED = "swap_request.created"
+    SWAP_REQUEST_ACCEPTED = "swap_request.accepted"
+    SWAP_REQUEST_REJECTED = "swap_request.rejected"
+    # Only carry the id of the swap request, deleted or restored along with
+    # its sender schedule
+    SWAP_REQUEST_DELETED = "swap_request.deleted"
+    SWAP_REQUEST_RESTORED = "swap_request.restored"
+
+
+def get_schedule_data(roster_user_schedule: RosterUserSchedule) -> dict:
+    return {
+        "id": roster_user_schedule.id,
+        "roster": roster_user_schedule.roster_id,
+        "schedule_date": roster_user_schedule.schedule_date,
+        "start_time": roster_user_schedule.start_time,
+        "end_time": roster_user_schedule.end_time,
+    }
+
+
+def get_schedule_events(
+    event_type: str, roster_user_schedules: Iterable[RosterUserSchedule]
+) -> List[Tuple[UUID, str, dict]]:
+    """
+    Returns an event for the user of each schedule, to publish with
+    utils.events.publish_events.
+    """
+    return [
+        (
+            roster_user_schedule.user_id,
+            event_type,
+            get_schedule_data(roster_user_schedule),
+        )
+        for roster_user_schedule in roster_user_schedules
+    ]
+
+
+def get_swap_request_event(
+    event_type: str,
+    schedule_swap_request: ScheduleSwapRequest,
+    user_id: Optional[UUID] = None,
+) -> Tuple[UUID, str, dict]:
+    """
+    Returns an event for the receiver of a swap request, or for user_id, to
+    publish with utils.events.publish_events.
+    """
+    return (
+        user_id or schedule_swap_request.receiver_id,
+        event_type,
+        {
+            "id": schedule_swap_request.id,
+            "sender": schedule_swap_request.sender_id,
+            "receiver": schedule_swap_request.receiver_id,
+            "sender_schedule": schedule_swap_request.sender_schedule_id,
+            "status": ScheduleSwapRequest.Status(schedule_swap_request.status).label,
+        },
+    )
@@ -0,0 +1,53 @@
+"""
+This file contains the worker command processing schedule import jobs.
+"""
+
+from time import sleep
+
+from django.core.management.base import BaseCommand
+
+from rosters.models import ScheduleImportJob
+from rosters.services import process_schedule_import_job
+
+
+class Command(BaseCommand):
+    help = (
+        "Processes pending schedule import jobs, e.g. jobs resumed while no "
+        "web worker was available. Runs until interrupted unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the currently pending jobs and exit.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait between polls for pending jobs.",
+        )
+
+    def handle(self, *args, once=False, interval=5, **options):
+        while True:
+            schedule_import_job_ids = ScheduleImportJob.objects.filter(
+                status=ScheduleImportJob.Status.PENDING, date_deleted__isnull=True
+            ).values_list("id", flat=True)
+
+            for schedule_import_job_id in list(schedule_import_job_ids):
+                success, result = process_schedule_import_job(
+                    schedule_import_job_id=schedule_import_job_id
+                )
+                if success:
+                    self.stdout.write(
+                        f"Import job {schedule_import_job_id} completed, "
+                        f"{result.created_rows} schedules created."
+                    )
+                else:
+                    self.stderr.write(f"Import job {schedule_import_job_id}: {result}")
+
+            if once:
+                return
+
+            sleep(interval)
@@ -0,0 +1,43 @@
+# Generated by Django 5.1 on 2026-10-18 20:12
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently so that schedule writes are not blocked
+    # while they are created on large tables.
+    atomic = False
+
+    dependencies = [
+        ("rosters", "0002_schedule_import_job"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="rosteruserschedule",
+            index=models.Index(
+                condition=models.Q(("date_deleted__isnull", True)),
+                fields=["roster", "schedule_date", "id"],
+                name="schedule_roster_active_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="rosteruserschedule",
+            index=models.Index(
+                condition=models.Q(("date_deleted__isnull", True)),
+                fields=["user", "schedule_date"],
+                name="schedule_user_active_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="scheduleswaprequest",
+            index=models.Index(
+                condition=models.Q(("date_deleted__isnull", True)),
+                fields=["receiver", "status"],
+                name="swap_receiver_active_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.1 on 2026-10-18 20:38
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+CHANGE_TRACKED_TABLES = ("rosters_rosteruserschedule", "rosters_scheduleswaprequest")
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently so that schedule writes are not blocked
+    # while they are created on large tables.
+    atomic = False
+
+    dependencies = [
+        ("rosters", "0003_soft_delete_partial_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rosteruserschedule",
+            name="change_xid",
+            field=models.BigIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="scheduleswaprequest",
+            name="change_xid",
+            field=models.BigIntegerField(editable=False, null=True),
+        ),
+        # Stamps every inserted or updated row, including those written by
+        # queryset updates and raw SQL, with the id of its transaction
+        migrations.RunSQL(
+            sql=[
+                """
+                CREATE FUNCTION rollcall_set_change_xid() RETURNS trigger AS $$
+                BEGIN
+                    NEW.change_xid := pg_current_xact_id()::text::bigint;
+                    RETURN NEW;
+                END;
+                $$ LANGUAGE plpgsql
+                """,
+                *(
+                    f"""
+                    CREATE TRIGGER {table}_change_xid
+                    BEFORE INSERT OR UPDATE ON {table}
+                    FOR EACH ROW EXECUTE FUNCTION rollcall_set_change_xid()
+                    """
+                    for table in CHANGE_TRACKED_TABLES
+                ),
+            ],
+            reverse_sql=[
+                *(
+                    f"DROP TRIGGER {table}_change_xid ON {table}"
+                    for table in CHANGE_TRACKED_TABLES
+                ),
+                "DROP FUNCTION rollcall_set_change_xid()",
+            ],
+        ),
+        AddIndexConcurrently(
+            model_name="rosteruserschedule",
+            index=models.Index(
+                fields=["user", "change_xid"], name="schedule_user_change_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="scheduleswaprequest",
+            index=models.Index(
+                fields=["sender", "change_xid"], name="swap_sender_change_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="scheduleswaprequest",
+            index=models.Index(
+                fields=["receiver", "change_xid"], name="swap_receiver_change_idx"
+            ),
+        ),
+    ]
@@ -2,7 +2,8 @@
 This file contains all the models related to rosters module.
 """
 
-from datetime import timedelta
+from datetime import date, datetime, timedelta
+from typing import List
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
@@ -10,6 +11,7 @@ from django.db import models
 from django.utils.timezone import now
 
 from users.models import UserRole
+from utils.files import RenameFile
 from utils.models import BaseModel
 
 User = get_user_model()
@@ -37,6 +39,8 @@ class RosterManager(BaseModel):
     managers.
     """
 
+    INVARIANTS = ("manager",)
+
     roster = models.ForeignKey(Roster, on_delete=models.CASCADE)
     manager = models.ForeignKey(User, on_delete=models.PROTECT)
 
@@ -56,7 +60,7 @@ class RosterManager(BaseModel):
 
     def validate_manager(self):
         if not UserRole.objects.filter(
-            user_id=self.manager.uuid,
+            user_id=self.manager_id,
             role=UserRole.Role.MANAGER,
             date_deleted__isnull=True,
         ).exists():
@@ -64,21 +68,22 @@ class RosterManager(BaseModel):
                 "Only users with managers role can be added as a roster manager"
             )
 
-    def full_clean(self, *args, **kwargs):
-        self.validate_manager()
-        return super().full_clean(*args, **kwargs)
-
 
 class RosterUserSchedule(BaseModel):
     """
     This model is used to store all the schedule for a user related to a roster.
     """
 
+    INVARIANTS = ("user", "roster")
+
     user = models.ForeignKey(User, on_delete=models.PROTECT)
     roster = models.ForeignKey(Roster, on_delete=models.CASCADE)
     schedule_date = models.DateField()
     start_time = models.DateTimeField()
     end_time = models.DateTimeField()
+    # Id of the last transaction that inserted or updated the row, set by a
+    # database trigger and used for incremental sync, see utils.changes
+    change_xid = models.BigIntegerField(null=True, editable=False)
 
     def __str__(self):
         return f"{self.roster} - {self.user}"
@@ -86,6 +91,22 @@ class RosterUserSchedule(BaseModel):
     class Meta:
         verbose_name = "Roster User Schedule"
         verbose_name_plural = "Roster User Schedules"
+        indexes = [
+            models.Index(
+                fields=["roster", "schedule_date", "id"],
+                name="schedule_roster_active_idx",
+                condition=models.Q(date_deleted__isnull=True),
+            ),
+            models.Index(
+                fields=["user", "schedule_date"],
+                name="schedule_user_active_idx",
+                condition=models.Q(date_deleted__isnull=True),
+            ),
+            models.Index(
+                fields=["user", "change_xid"],
+                name="schedule_user_change_idx",
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["roster", "user", "schedule_date"],
@@ -97,7 +118,7 @@ class RosterUserSchedule(BaseModel):
 
     def validate_user(self):
         if not UserRole.objects.filter(
-            user_id=self.user.uuid,
+            user_id=self.user_id,
             role=UserRole.Role.STAFF,
             date_deleted__isnull=True,
         ).exists():
@@ -111,31 +132,50 @@ class RosterUserSchedule(BaseModel):
                 "Cannot add roster user schedule for an inactive roster."
             )
 
-    def validate_time_fields(self):
-        if self.end_time <= self.start_time:
-            raise ValidationError("End time must be greater than start time")
+    @staticmethod
+    def get_time_field_errors(
+        schedule_date: date, start_time: datetime, end_time: datetime
+    ) -> List[str]:
+        """
+        Returns the schedule timing rules violated by the given values.
+        Shared by validate_time_fields and the bulk schedule validation.
+        """
+        if end_time <= start_time:
+            return ["End time must be greater than start time"]
+
+        errors = []
+        if schedule_date != start_time.date():
+            errors.append("Schedule date and start time date should be same")
 
-        if self.schedule_date != self.start_time.date():
-            raise ValidationError("Schedule date and start time date should be same")
+        if end_time - start_time < timedelta(hours=6):
+            errors.append("A schedule must be atleast 6 hours long.")
 
-        if self.end_time - self.start_time < timedelta(hours=6):
-            raise ValidationError("A schedule must be atleast 6 hours long.")
+        return errors
+
+    def validate_time_fields(self):
+        errors = self.get_time_field_errors(
+            schedule_date=self.schedule_date,
+            start_time=self.start_time,
+            end_time=self.end_time,
+        )
+        if errors:
+            raise ValidationError(errors[0])
 
     def clean(self) -> None:
         self.validate_time_fields()
         return super().clean()
 
-    def full_clean(self, *args, **kwargs) -> None:
-        self.validate_user()
-        self.validate_roster()
-        return super().full_clean(*args, **kwargs)
-
 
 class ScheduleSwapRequest(BaseModel):
     """
     This model is used to store user schedule swap requests.
     """
 
+    # Swap requests cannot be created or accepted this close to the start
+    # of the sender schedule
+    RESPONSE_CUTOFF = timedelta(hours=1)
+    INVARIANTS = ("user", "sender_schedule")
+
     class Status(models.IntegerChoices):
         PENDING = 1
         ACCEPTED = 2
@@ -149,6 +189,8 @@ class ScheduleSwapRequest(BaseModel):
         choices=Status.choices, default=Status.PENDING
     )
     sender_schedule = models.ForeignKey(RosterUserSchedule, on_delete=models.CASCADE)
+    # Same as RosterUserSchedule.change_xid
+    change_xid = models.BigIntegerField(null=True, editable=False)
 
     def __str__(self):
         return f"{self.sender} request to {self.receiver}"
@@ -156,6 +198,21 @@ class ScheduleSwapRequest(BaseModel):
     class Meta:
         verbose_name = "Schedule Swap Request"
         verbose_name_plural = "Schedule Swap Requests"
+        indexes = [
+            models.Index(
+                fields=["receiver", "status"],
+                name="swap_receiver_active_idx",
+                condition=models.Q(date_deleted__isnull=True),
+            ),
+            models.Index(
+                fields=["sender", "change_xid"],
+                name="swap_sender_change_idx",
+            ),
+            models.Index(
+                fields=["receiver", "change_xid"],
+                name="swap_receiver_change_idx",
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["sender", "receiver", "sender_schedule"],
@@ -168,8 +225,8 @@ class ScheduleSwapRequest(BaseModel):
     def validate_user(self):
         if ScheduleSwapRequest.objects.filter(
             date_deleted__isnull=True,
-            receiver=self.sender,
-            sender=self.receiver,
+            receiver_id=self.sender_id,
+            sender_id=self.receiver_id,
             sender_schedule__schedule_date=self.sender_schedule.schedule_date,
         ).exists():
             raise ValidationError(
@@ -180,25 +237,27 @@ class ScheduleSwapRequest(BaseModel):
         if not self.pk and self.sender_schedule.date_deleted:
             raise ValidationError("Cannot create a swap request for inactive schedule.")
 
-        if self.sender_schedule.user != self.sender:
+        if self.sender_schedule.user_id != self.sender_id:
             raise ValidationError("Sender and sender schedule should be same")
 
-        if self.sender == self.receiver:
+        if self.sender_id == self.receiver_id:
             raise ValidationError("Sender and receiver cannot be same")
 
         if (
-            self.sender_schedule.start_time - timedelta(hours=1) <= now()
+            self.sender_schedule.start_time - self.RESPONSE_CUTOFF <= now()
             and self.status != self.Status.REJECTED
         ):
             raise ValidationError(
                 "Cannot create/update swap request an hour before schedule start time"
             )
 
-        if not RosterUserSchedule.objects.filter(
-            date_deleted__isnull=True,
-            user=self.receiver,
-            schedule_date=self.sender_schedule.schedule_date,
-        ).exists():
+        # rosters.caches imports this module
+        from rosters.caches import get_user_date_schedules
+
+        schedule_date = self.sender_schedule.schedule_date
+        if not get_user_date_schedules(
+            user_id=self.receiver_id, schedule_dates=[schedule_date]
+        )[schedule_date]:
             raise ValidationError(
                 f"Receiver does not have any active schedule for the date {self.sender_schedule.schedule_date}"
             )
@@ -213,7 +272,58 @@ class ScheduleSwapRequest(BaseModel):
         self.validate_status()
         return super().clean()
 
-    def full_clean(self, *args, **kwargs):
-        self.validate_user()
-        self.validate_sender_schedule()
-        return super().full_clean(*args, **kwargs)
+
+class ScheduleImportJob(BaseModel):
+    """
+    This model is used to store a bulk import of roster user schedules from an
+    uploaded file. Rows are imported in chunks of chunk_size and each
+    committed chunk is recorded, so an interrupted import resumes after the
+    last committed chunk.
+    """
+
+    MAX_FILE_SIZE = 50  # in Mb
+    MAX_ROW_ERRORS = 1000
+    # A running job without progress for this long is considered interrupted
+    STALE_AFTER = timedelta(minutes=10)
+
+    class Status(models.IntegerChoices):
+        PENDING = 1
+        RUNNING = 2
+        COMPLETED = 3
+        FAILED = 4
+
+    class FileFormat(models.TextChoices):
+        CSV = "csv", "CSV"
+        NDJSON = "ndjson", "NDJSON"
+
+    roster = models.ForeignKey(Roster, on_delete=models.CASCADE)
+    file = models.FileField(
+        upload_to=RenameFile(
+            "files/schedule_imports/{instance.roster_id}/{instance.date_created}.{extension}"
+        )
+    )
+    file_format = models.CharField(max_length=8, choices=FileFormat.choices)
+    status = models.PositiveSmallIntegerField(
+        choices=Status.choices, default=Status.PENDING
+    )
+    chunk_size = models.PositiveIntegerField(default=500)
+    committed_chunks = models.PositiveIntegerField(default=0)
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    created_rows = models.PositiveIntegerField(default=0)
+    row_errors = models.JSONField(default=list, blank=True)
+    error = models.TextField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.roster} - {self.get_status_display()}"
+
+    class Meta:
+        verbose_name = "Schedule Import Job"
+        verbose_name_plural = "Schedule Import Jobs"
+
+    @property
+    def processed_rows(self):
+        processed_rows = self.committed_chunks * self.chunk_size
+        if self.total_rows is None:
+            return processed_rows
+
+        return min(processed_rows, self.total_rows)
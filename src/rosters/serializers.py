@@ -4,8 +4,14 @@ This file contains all the model serializers for rosters module.
 
 from rest_framework import serializers
 
-from rosters.models import Roster, RosterUserSchedule, ScheduleSwapRequest
+from rosters.models import (
+    Roster,
+    RosterUserSchedule,
+    ScheduleImportJob,
+    ScheduleSwapRequest,
+)
 from users.serializers import UserSerializer
+from utils.serializers import DynamicFieldsMixin, QueryPlanMixin
 
 
 class RosterSerializer(serializers.ModelSerializer):
@@ -14,22 +20,75 @@ class RosterSerializer(serializers.ModelSerializer):
         exclude = Roster.LOG_FIELDS
 
 
-class RosterUserScheduleSerializer(serializers.ModelSerializer):
+class RosterUserScheduleSerializer(
+    QueryPlanMixin, DynamicFieldsMixin, serializers.ModelSerializer
+):
     user = UserSerializer()
 
+    # Nested users replaced with their uuid by utils.serializers.normalize_users
+    normalized_user_fields = ("user",)
+
     class Meta:
         model = RosterUserSchedule
-        exclude = RosterUserSchedule.LOG_FIELDS
+        exclude = RosterUserSchedule.LOG_FIELDS + ("change_xid",)
 
 
-class ScheduleSwapRequestSerializer(serializers.ModelSerializer):
+class ScheduleSwapRequestSerializer(QueryPlanMixin, serializers.ModelSerializer):
     sender = UserSerializer()
     receiver = UserSerializer()
     status = serializers.SerializerMethodField()
 
+    # Model fields read by the method fields, see utils.serializers.compile_serializer
+    compiled_sources = {"status": ("status",)}
+    normalized_user_fields = ("sender", "receiver")
+
     def get_status(self, instance):
         return ScheduleSwapRequest.Status(instance.status).label
 
     class Meta:
         model = ScheduleSwapRequest
-        exclude = ScheduleSwapRequest.LOG_FIELDS
+        exclude = ScheduleSwapRequest.LOG_FIELDS + ("change_xid",)
+
+
+class RosterUserScheduleDataSerializer(serializers.Serializer):
+    """
+    Validates a single schedule row of a bulk schedule upload or import.
+    """
+
+    user = serializers.UUIDField()
+    schedule_date = serializers.DateField()
+    start_time = serializers.DateTimeField()
+    end_time = serializers.DateTimeField()
+
+    def validate(self, attrs):
+        if attrs["start_time"] >= attrs["end_time"]:
+            raise serializers.ValidationError(
+                "End time must be greater than start time"
+            )
+
+        return super().validate(attrs)
+
+
+class ScheduleImportJobSerializer(serializers.ModelSerializer):
+    status = serializers.SerializerMethodField()
+
+    def get_status(self, instance):
+        return ScheduleImportJob.Status(instance.status).label
+
+    class Meta:
+        model = ScheduleImportJob
+        fields = (
+            "id",
+            "roster",
+            "file_format",
+            "status",
+            "chunk_size",
+            "committed_chunks",
+            "processed_rows",
+            "total_rows",
+            "created_rows",
+            "row_errors",
+            "error",
+            "date_created",
+            "date_updated",
+        )
@@ -2,6 +2,18 @@ from .create import (
     bulk_create_roster_user_schedule,
     create_roster,
     create_roster_manager,
+    create_schedule_import_job,
     create_schedule_swap_request,
 )
-from .update import update_roster_user_schedule, update_schedule_swap_request
+from .delete import (
+    bulk_delete_roster_user_schedules,
+    bulk_restore_roster_user_schedules,
+)
+from .imports import process_schedule_import_job
+from .swap import accept_schedule_swap_request, reject_schedule_swap_request
+from .update import (
+    resume_schedule_import_job,
+    update_roster_user_schedule,
+    update_schedule_swap_request,
+)
+from .validate import validate_roster_user_schedules
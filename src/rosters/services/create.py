@@ -2,33 +2,35 @@
 This file contains all the create services for rosters module.
 """
 
-from datetime import date, datetime
-from typing import List, Optional, Tuple, TypedDict, Union
+from typing import List, Optional, Tuple, Union
 from uuid import UUID
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.core.files import File
+from django.db import IntegrityError, transaction
 from django.utils.timezone import now
 
+from rosters.caches import invalidate_schedule_cache
+from rosters.events import Event, get_schedule_events, get_swap_request_event
 from rosters.models import (
     Roster,
     RosterManager,
     RosterUserSchedule,
+    ScheduleImportJob,
     ScheduleSwapRequest,
 )
-from users.models import UserRole
+from rosters.services.validate import (
+    RosterUserScheduleData,
+    RosterUserScheduleError,
+    validate_roster_user_schedules,
+)
+from utils.events import publish_events
+from utils.models import validation_context
 
 User = get_user_model()
 
 
-class RosterUserScheduleData(TypedDict):
-    user: Union[int, User]  # type: ignore
-    schedule_date: date
-    start_time: datetime
-    end_time: datetime
-
-
 def create_roster(
     title: str, is_active: bool = False, created_by: Optional[User] = None  # type: ignore
 ) -> Tuple[bool, Union[str, Roster]]:
@@ -61,9 +63,12 @@ def create_roster_manager(
     )
 
     try:
-        roster_manager.save()
+        with transaction.atomic():
+            roster_manager.save()
     except ValidationError as error:
         return False, str(error)
+    except IntegrityError as error:
+        return False, roster_manager.get_integrity_error_message(error)
 
     return True, roster_manager
 
@@ -72,60 +77,60 @@ def bulk_create_roster_user_schedule(
     roster: Roster,
     user_schedule_data: List[RosterUserScheduleData],
     created_by: Optional[User] = None,  # type: ignore
-) -> Tuple[bool, Union[str, List[RosterUserSchedule]]]:
+    validated: bool = False,
+    batch_size: Optional[int] = None,
+) -> Tuple[bool, Union[str, List[RosterUserScheduleError], List[RosterUserSchedule]]]:
     """
     This service is used to bulk create roster user schedules.
+    Nothing is created unless every row is valid, the errors of the invalid
+    rows are returned otherwise. Pass validated as True when the rows were
+    already checked with validate_roster_user_schedules.
     """
 
     if not roster.is_active:
         return False, "Cannot add roster user schedule for an inactive roster."
 
-    users = {
-        (
-            roster_user_schedule["user"].uuid
-            if isinstance(roster_user_schedule["user"], User)
-            else roster_user_schedule["user"]
+    if not validated:
+        row_errors = validate_roster_user_schedules(
+            roster=roster, user_schedule_data=user_schedule_data
         )
-        for roster_user_schedule in user_schedule_data
-    }
-
-    if (
-        len(users)
-        != UserRole.objects.filter(
-            user_id__in=users,
-            role=UserRole.Role.STAFF,
-            date_deleted__isnull=True,
-        ).count()
-    ):
-        return False, "All users must be staff members"
-
-    roster_user_schedules = []
+        if row_errors:
+            return False, row_errors
+
+    roster_user_schedules = [
+        RosterUserSchedule(
+            roster_id=roster.id,
+            user_id=(
+                roster_user_schedule_data["user"].uuid
+                if isinstance(roster_user_schedule_data["user"], User)
+                else roster_user_schedule_data["user"]
+            ),
+            schedule_date=roster_user_schedule_data["schedule_date"],
+            start_time=roster_user_schedule_data["start_time"],
+            end_time=roster_user_schedule_data["end_time"],
+            created_by=created_by,
+        )
+        for roster_user_schedule_data in user_schedule_data
+    ]
 
     try:
-        for roster_user_schedule_data in user_schedule_data:
-            roster_user_schedule = RosterUserSchedule(
-                roster_id=roster.id,
-                user_id=(
-                    roster_user_schedule_data["user"].uuid
-                    if isinstance(roster_user_schedule_data["user"], User)
-                    else roster_user_schedule_data["user"]
-                ),
-                schedule_date=roster_user_schedule_data["schedule_date"],
-                start_time=roster_user_schedule_data["start_time"],
-                end_time=roster_user_schedule_data["end_time"],
-                created_by=created_by,
+        with transaction.atomic():
+            roster_user_schedules = RosterUserSchedule.objects.bulk_create(
+                objs=roster_user_schedules, batch_size=batch_size
             )
-
-            roster_user_schedule.clean_fields(exclude=["roster", "user", "created_by"])
-            roster_user_schedule.clean()
-            roster_user_schedules.append(roster_user_schedule)
-
-        roster_user_schedules = RosterUserSchedule.objects.bulk_create(
-            objs=roster_user_schedules
-        )
-    except (ValidationError, IntegrityError) as error:
+            publish_events(
+                get_schedule_events(
+                    event_type=Event.SCHEDULE_CREATED,
+                    roster_user_schedules=roster_user_schedules,
+                )
+            )
+    except IntegrityError as error:
         return False, str(error)
 
+    invalidate_schedule_cache(
+        (schedule.roster_id, schedule.user_id, schedule.schedule_date)
+        for schedule in roster_user_schedules
+    )
     return True, roster_user_schedules
 
 
@@ -144,15 +149,61 @@ def create_schedule_swap_request(
         sender_id=sender.uuid if isinstance(sender, User) else sender,
         receiver_id=receiver.uuid if isinstance(receiver, User) else receiver,
         status=status,
-        sender_schedule_id=(
-            schedule.id if isinstance(schedule, RosterUserSchedule) else schedule
-        ),
         created_by=created_by,
     )
+    if isinstance(schedule, RosterUserSchedule):
+        schedule_swap_request.sender_schedule = schedule
+    else:
+        schedule_swap_request.sender_schedule_id = schedule
 
     try:
-        schedule_swap_request.save()
+        with transaction.atomic(), validation_context(
+            ScheduleSwapRequest, "constraints"
+        ):
+            schedule_swap_request.save()
+            publish_events(
+                [
+                    get_swap_request_event(
+                        event_type=Event.SWAP_REQUEST_CREATED,
+                        schedule_swap_request=schedule_swap_request,
+                    )
+                ]
+            )
     except ValidationError as error:
         return False, str(error)
+    except IntegrityError as error:
+        return False, schedule_swap_request.get_integrity_error_message(error)
 
     return True, schedule_swap_request
+
+
+def create_schedule_import_job(
+    roster: Roster,
+    file: File,
+    file_format: ScheduleImportJob.FileFormat,
+    chunk_size: Optional[int] = None,
+    created_by: Optional[User] = None,  # type: ignore
+) -> Tuple[bool, Union[str, ScheduleImportJob]]:
+    """
+    This service is used to create a schedule import job.
+    The job has to be handed to process_schedule_import_job to run.
+    """
+
+    if not roster.is_active:
+        return False, "Cannot add roster user schedule for an inactive roster."
+
+    schedule_import_job = ScheduleImportJob(
+        roster_id=roster.id,
+        file=file,
+        file_format=file_format,
+        created_by=created_by,
+    )
+    if chunk_size:
+        schedule_import_job.chunk_size = chunk_size
+
+    try:
+        schedule_import_job.save()
+    except ValidationError as error:
+        return False, str(error)
+
+    return True, schedule_import_job
@@ -0,0 +1,253 @@
+"""
+This file contains all the delete and restore services for rosters module.
+"""
+
+from datetime import date
+from typing import List, Optional, Sequence, Tuple, TypedDict, Union
+from uuid import UUID
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.utils.timezone import now
+
+from rosters.caches import invalidate_schedule_cache
+from rosters.events import Event
+from rosters.models import Roster, RosterUserSchedule, ScheduleSwapRequest
+from users.models import UserRole
+from utils.events import publish_events
+
+User = get_user_model()
+
+
+# Fields of the schedule events, in the order the statements return them
+SCHEDULE_EVENT_FIELDS = ("id", "roster", "schedule_date", "start_time", "end_time")
+
+
+class BulkScheduleActionResult(TypedDict):
+    schedules: List[int]
+    swap_requests: List[int]
+
+
+def get_schedule_filters(
+    alias: str,
+    user_ids: Optional[Sequence[UUID]] = None,
+    schedule_ids: Optional[Sequence[int]] = None,
+) -> Tuple[str, List]:
+    """
+    Returns the SQL conditions and params restricting the schedules of a bulk
+    action to the given users and schedules.
+    """
+
+    conditions, params = [], []
+    if user_ids is not None:
+        conditions.append(f"AND {alias}.user_id = ANY(%s)")
+        params.append(list(user_ids))
+    if schedule_ids is not None:
+        conditions.append(f"AND {alias}.id = ANY(%s)")
+        params.append(list(schedule_ids))
+
+    return " ".join(conditions), params
+
+
+def run_bulk_schedule_action(
+    sql: str, params: List, schedule_event: str, swap_request_event: str
+) -> Tuple[bool, Union[str, BulkScheduleActionResult]]:
+    """
+    Runs the statement of a bulk action, which returns a row per schedule and
+    swap request it changed, and publishes an event to each of their users,
+    the receiver for swap requests. A statement violating a constraint
+    changes nothing and returns its message.
+    """
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            publish_events(
+                (
+                    (user_id, schedule_event, dict(zip(SCHEDULE_EVENT_FIELDS, row)))
+                    if kind == "schedule"
+                    else (user_id, swap_request_event, {"id": row[0]})
+                )
+                for kind, user_id, *row in rows
+            )
+    except IntegrityError as error:
+        return False, RosterUserSchedule().get_integrity_error_message(error)
+
+    invalidate_schedule_cache(
+        (roster_id, user_id, schedule_date)
+        for kind, user_id, _, roster_id, schedule_date, _, _ in rows
+        if kind == "schedule"
+    )
+    return True, {
+        "schedules": sorted(row[2] for row in rows if row[0] == "schedule"),
+        "swap_requests": sorted(row[2] for row in rows if row[0] == "swap_request"),
+    }
+
+
+def bulk_delete_roster_user_schedules(
+    roster: Roster,
+    start_date: date,
+    end_date: date,
+    user_ids: Optional[Sequence[UUID]] = None,
+    schedule_ids: Optional[Sequence[int]] = None,
+    deleted_by: Optional[User] = None,  # type: ignore
+) -> Tuple[bool, Union[str, BulkScheduleActionResult]]:
+    """
+    This service is used to soft delete the active schedules of a roster
+    between two dates, optionally only those of the given users or ids.
+    Pending swap requests for the deleted schedules are soft deleted along
+    with them, in the same statement.
+    """
+
+    if start_date > end_date:
+        return False, "End date must be greater than or equal to start date"
+
+    filters, filter_params = get_schedule_filters(
+        alias="schedule", user_ids=user_ids, schedule_ids=schedule_ids
+    )
+    current_time = now()
+    updated_by_id = deleted_by.uuid if deleted_by else None
+
+    return run_bulk_schedule_action(
+        sql=f"""
+        WITH deleted_schedules AS (
+            UPDATE {RosterUserSchedule._meta.db_table} AS schedule
+            SET date_deleted = %s, date_updated = %s, updated_by_id = %s
+            WHERE schedule.date_deleted IS NULL
+                AND schedule.roster_id = %s
+                AND schedule.schedule_date BETWEEN %s AND %s
+                {filters}
+            RETURNING schedule.user_id, schedule.id, schedule.roster_id,
+                schedule.schedule_date, schedule.start_time, schedule.end_time
+        ),
+        deleted_swap_requests AS (
+            UPDATE {ScheduleSwapRequest._meta.db_table} AS swap_request
+            SET date_deleted = %s, date_updated = %s, updated_by_id = %s
+            WHERE swap_request.date_deleted IS NULL
+                AND swap_request.status = %s
+                AND swap_request.sender_schedule_id IN (
+                    SELECT id FROM deleted_schedules
+                )
+            RETURNING swap_request.receiver_id, swap_request.id
+        )
+        SELECT 'schedule', user_id, id, roster_id, schedule_date, start_time,
+            end_time
+        FROM deleted_schedules
+        UNION ALL
+        SELECT 'swap_request', receiver_id, id, NULL, NULL, NULL, NULL
+        FROM deleted_swap_requests
+        """,
+        params=[
+            current_time,
+            current_time,
+            updated_by_id,
+            roster.id,
+            start_date,
+            end_date,
+            *filter_params,
+            current_time,
+            current_time,
+            updated_by_id,
+            ScheduleSwapRequest.Status.PENDING,
+        ],
+        schedule_event=Event.SCHEDULE_DELETED,
+        swap_request_event=Event.SWAP_REQUEST_DELETED,
+    )
+
+
+def bulk_restore_roster_user_schedules(
+    roster: Roster,
+    start_date: date,
+    end_date: date,
+    user_ids: Optional[Sequence[UUID]] = None,
+    schedule_ids: Optional[Sequence[int]] = None,
+    restored_by: Optional[User] = None,  # type: ignore
+) -> Tuple[bool, Union[str, BulkScheduleActionResult]]:
+    """
+    This service is used to restore soft deleted schedules of a roster between
+    two dates, optionally only those of the given users or ids.
+    A schedule is only restored for a staff user without an active schedule
+    on that day in the roster, the most recently deleted one winning, others
+    being skipped. Pending swap requests deleted along with a schedule are
+    restored with it. A schedule added on a restored day while the statement
+    runs fails the whole restore with the message of the violated constraint.
+    """
+
+    if not roster.is_active:
+        return False, "Cannot add roster user schedule for an inactive roster."
+
+    if start_date > end_date:
+        return False, "End date must be greater than or equal to start date"
+
+    filters, filter_params = get_schedule_filters(
+        alias="schedule", user_ids=user_ids, schedule_ids=schedule_ids
+    )
+    current_time = now()
+    updated_by_id = restored_by.uuid if restored_by else None
+    schedule_table = RosterUserSchedule._meta.db_table
+
+    return run_bulk_schedule_action(
+        sql=f"""
+        WITH candidates AS (
+            SELECT DISTINCT ON (schedule.user_id, schedule.schedule_date)
+                schedule.id, schedule.date_deleted
+            FROM {schedule_table} AS schedule
+            WHERE schedule.date_deleted IS NOT NULL
+                AND schedule.roster_id = %s
+                AND schedule.schedule_date BETWEEN %s AND %s
+                {filters}
+                AND NOT EXISTS (
+                    SELECT 1 FROM {schedule_table} AS active_schedule
+                    WHERE active_schedule.date_deleted IS NULL
+                        AND active_schedule.roster_id = schedule.roster_id
+                        AND active_schedule.user_id = schedule.user_id
+                        AND active_schedule.schedule_date = schedule.schedule_date
+                )
+                AND EXISTS (
+                    SELECT 1 FROM {UserRole._meta.db_table} AS user_role
+                    WHERE user_role.date_deleted IS NULL
+                        AND user_role.user_id = schedule.user_id
+                        AND user_role.role = %s
+                )
+            ORDER BY schedule.user_id, schedule.schedule_date,
+                schedule.date_deleted DESC, schedule.id DESC
+        ),
+        restored_schedules AS (
+            UPDATE {schedule_table} AS schedule
+            SET date_deleted = NULL, date_updated = %s, updated_by_id = %s
+            FROM candidates
+            WHERE schedule.id = candidates.id
+            RETURNING schedule.user_id, schedule.id, schedule.roster_id,
+                schedule.schedule_date, schedule.start_time, schedule.end_time
+        ),
+        restored_swap_requests AS (
+            UPDATE {ScheduleSwapRequest._meta.db_table} AS swap_request
+            SET date_deleted = NULL, date_updated = %s, updated_by_id = %s
+            FROM candidates
+            WHERE swap_request.sender_schedule_id = candidates.id
+                AND swap_request.date_deleted = candidates.date_deleted
+                AND swap_request.status = %s
+            RETURNING swap_request.receiver_id, swap_request.id
+        )
+        SELECT 'schedule', user_id, id, roster_id, schedule_date, start_time,
+            end_time
+        FROM restored_schedules
+        UNION ALL
+        SELECT 'swap_request', receiver_id, id, NULL, NULL, NULL, NULL
+        FROM restored_swap_requests
+        """,
+        params=[
+            roster.id,
+            start_date,
+            end_date,
+            *filter_params,
+            UserRole.Role.STAFF,
+            current_time,
+            updated_by_id,
+            current_time,
+            updated_by_id,
+            ScheduleSwapRequest.Status.PENDING,
+        ],
+        schedule_event=Event.SCHEDULE_RESTORED,
+        swap_request_event=Event.SWAP_REQUEST_RESTORED,
+    )
@@ -0,0 +1,192 @@
+"""
+This file contains all the services used to process schedule import jobs.
+"""
+
+import csv
+import json
+from io import TextIOWrapper
+from itertools import islice
+from typing import Dict, Iterator, List, Tuple, Union
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from rosters.models import ScheduleImportJob
+from rosters.serializers import RosterUserScheduleDataSerializer
+from rosters.services.create import bulk_create_roster_user_schedule
+from rosters.services.validate import (
+    RosterUserScheduleError,
+    validate_roster_user_schedules,
+)
+
+
+def read_schedule_import_rows(
+    schedule_import_job: ScheduleImportJob,
+) -> Iterator[Union[Dict, str]]:
+    """
+    This service is used to lazily read the rows of an import file.
+    Yields the row data, or an error message for a row that cannot be parsed.
+    """
+
+    with schedule_import_job.file.open("rb") as file:
+        lines = TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+        if schedule_import_job.file_format == ScheduleImportJob.FileFormat.CSV:
+            yield from csv.DictReader(lines)
+            return
+
+        for line in lines:
+            if not line.strip():
+                continue
+
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield "Row is not valid JSON."
+                continue
+
+            yield row if isinstance(row, dict) else "Row must be a JSON object."
+
+
+def import_schedule_chunk(
+    schedule_import_job: ScheduleImportJob, rows: List[Union[Dict, str]]
+) -> None:
+    """
+    This service is used to import one chunk of an import job. Valid rows are
+    created and the job progress is recorded in the same transaction, so a
+    chunk is either fully committed or not at all.
+    """
+
+    first_index = schedule_import_job.committed_chunks * schedule_import_job.chunk_size
+    row_errors: List[RosterUserScheduleError] = []
+    user_schedule_data, row_indexes = [], []
+
+    for index, row in enumerate(rows, start=first_index):
+        if isinstance(row, str):
+            row_errors.append({"index": index, "errors": [row]})
+            continue
+
+        serializer = RosterUserScheduleDataSerializer(data=row)
+        if not serializer.is_valid():
+            row_errors.append(
+                {
+                    "index": index,
+                    "errors": [
+                        (
+                            str(error)
+                            if field == "non_field_errors"
+                            else f"{field}: {error}"
+                        )
+                        for field, errors in serializer.errors.items()
+                        for error in errors
+                    ],
+                }
+            )
+            continue
+
+        user_schedule_data.append(serializer.validated_data)
+        row_indexes.append(index)
+
+    invalid_rows = set()
+    for row_error in validate_roster_user_schedules(
+        roster=schedule_import_job.roster, user_schedule_data=user_schedule_data
+    ):
+        invalid_rows.add(row_error["index"])
+        row_errors.append(
+            {"index": row_indexes[row_error["index"]], "errors": row_error["errors"]}
+        )
+
+    user_schedule_data = [
+        schedule_data
+        for index, schedule_data in enumerate(user_schedule_data)
+        if index not in invalid_rows
+    ]
+
+    with transaction.atomic():
+        created_rows = 0
+        if user_schedule_data:
+            success, roster_user_schedules = bulk_create_roster_user_schedule(
+                roster=schedule_import_job.roster,
+                user_schedule_data=user_schedule_data,
+                created_by=schedule_import_job.created_by,
+                validated=True,
+                batch_size=schedule_import_job.chunk_size,
+            )
+            if not success:
+                raise ValidationError(roster_user_schedules)
+
+            created_rows = len(roster_user_schedules)
+
+        schedule_import_job.committed_chunks += 1
+        schedule_import_job.created_rows += created_rows
+        schedule_import_job.row_errors = (
+            schedule_import_job.row_errors
+            + sorted(row_errors, key=lambda row_error: row_error["index"])
+        )[: ScheduleImportJob.MAX_ROW_ERRORS]
+        schedule_import_job.save(
+            update_fields=[
+                "committed_chunks",
+                "created_rows",
+                "row_errors",
+                "date_updated",
+            ],
+            skip_clean=True,
+        )
+
+
+def process_schedule_import_job(
+    schedule_import_job_id: int,
+) -> Tuple[bool, Union[str, ScheduleImportJob]]:
+    """
+    This service is used to run a pending schedule import job chunk by chunk,
+    starting after the last committed chunk. A job that is already being
+    processed elsewhere is skipped.
+    """
+
+    with transaction.atomic():
+        schedule_import_job = (
+            ScheduleImportJob.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("roster", "created_by")
+            .filter(
+                id=schedule_import_job_id,
+                status=ScheduleImportJob.Status.PENDING,
+                date_deleted__isnull=True,
+            )
+            .first()
+        )
+        if not schedule_import_job:
+            return False, "No pending import job found for given id"
+
+        schedule_import_job.status = ScheduleImportJob.Status.RUNNING
+        schedule_import_job.save(
+            update_fields=["status", "date_updated"], skip_clean=True
+        )
+
+    try:
+        if schedule_import_job.total_rows is None:
+            schedule_import_job.total_rows = sum(
+                1 for _ in read_schedule_import_rows(schedule_import_job)
+            )
+            schedule_import_job.save(update_fields=["total_rows"], skip_clean=True)
+
+        rows = islice(
+            read_schedule_import_rows(schedule_import_job),
+            schedule_import_job.processed_rows,
+            None,
+        )
+        for chunk in iter(
+            lambda: list(islice(rows, schedule_import_job.chunk_size)), []
+        ):
+            import_schedule_chunk(schedule_import_job=schedule_import_job, rows=chunk)
+
+    except Exception as error:
+        schedule_import_job.status = ScheduleImportJob.Status.FAILED
+        schedule_import_job.error = str(error)
+        schedule_import_job.save(
+            update_fields=["status", "error", "date_updated"], skip_clean=True
+        )
+        return False, str(error)
+
+    schedule_import_job.status = ScheduleImportJob.Status.COMPLETED
+    schedule_import_job.save(update_fields=["status", "date_updated"], skip_clean=True)
+    return True, schedule_import_job
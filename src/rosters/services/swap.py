@@ -0,0 +1,191 @@
+"""
+This file contains all the services used to act on schedule swap requests.
+"""
+
+from typing import List, Optional, Tuple, Union
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils.timezone import now
+
+from rosters.caches import invalidate_schedule_cache
+from rosters.events import Event, get_schedule_events, get_swap_request_event
+from rosters.models import RosterUserSchedule, ScheduleSwapRequest
+from users.models import UserRole
+from utils.events import publish_events
+
+User = get_user_model()
+
+
+def accept_schedule_swap_request(
+    schedule_swap_request: ScheduleSwapRequest,
+    accepted_by: Optional[User] = None,  # type: ignore
+) -> Tuple[bool, Union[str, List[RosterUserSchedule]]]:
+    """
+    This service is used to accept a schedule swap request and swap the
+    schedules of its sender and receiver. It must run inside a transaction
+    holding a lock on the swap request.
+
+    The sender schedule and the receiver schedule of the same date are locked
+    with a single query, in id order so that concurrent swaps touching the
+    same schedules cannot deadlock, and re-validated in memory. Both are then
+    soft deleted with one update and replaced with one insert.
+    """
+
+    sender_schedule_date = schedule_swap_request.sender_schedule.schedule_date
+    schedules = list(
+        RosterUserSchedule.objects.select_for_update(of=("self",))
+        .select_related("roster")
+        .annotate(
+            is_staff_user=Exists(
+                UserRole.objects.filter(
+                    user_id=OuterRef("user_id"),
+                    role=UserRole.Role.STAFF,
+                    date_deleted__isnull=True,
+                )
+            )
+        )
+        .filter(
+            Q(id=schedule_swap_request.sender_schedule_id)
+            | Q(
+                user_id=schedule_swap_request.receiver_id,
+                schedule_date=sender_schedule_date,
+            ),
+            date_deleted__isnull=True,
+        )
+        .order_by("id")
+    )
+
+    sender_schedule = next(
+        (
+            schedule
+            for schedule in schedules
+            if schedule.id == schedule_swap_request.sender_schedule_id
+        ),
+        None,
+    )
+    if (
+        not sender_schedule
+        or sender_schedule.user_id != schedule_swap_request.sender_id
+        or sender_schedule.schedule_date != sender_schedule_date
+    ):
+        return False, "Sender schedule is no longer active."
+
+    receiver_schedule = next(
+        (
+            schedule
+            for schedule in schedules
+            if schedule.user_id == schedule_swap_request.receiver_id
+            and schedule.id != sender_schedule.id
+        ),
+        None,
+    )
+    if not receiver_schedule:
+        return False, "No schedule found for receiver"
+
+    if not (sender_schedule.is_staff_user and receiver_schedule.is_staff_user):
+        return False, "All users must be staff members"
+
+    if not sender_schedule.roster.is_active:
+        return False, "Cannot add roster user schedule for an inactive roster."
+
+    current_time = now()
+    if sender_schedule.start_time - ScheduleSwapRequest.RESPONSE_CUTOFF <= current_time:
+        return (
+            False,
+            "Cannot create/update swap request an hour before schedule start time",
+        )
+
+    ScheduleSwapRequest.objects.filter(id=schedule_swap_request.id).update(
+        status=ScheduleSwapRequest.Status.ACCEPTED,
+        date_deleted=current_time,
+        date_updated=current_time,
+        updated_by=accepted_by,
+    )
+    schedule_swap_request.status = ScheduleSwapRequest.Status.ACCEPTED
+    schedule_swap_request.date_deleted = current_time
+
+    RosterUserSchedule.objects.filter(
+        id__in=(sender_schedule.id, receiver_schedule.id)
+    ).update(
+        date_deleted=current_time, date_updated=current_time, updated_by=accepted_by
+    )
+
+    try:
+        with transaction.atomic():
+            roster_user_schedules = RosterUserSchedule.objects.bulk_create(
+                objs=[
+                    RosterUserSchedule(
+                        roster_id=sender_schedule.roster_id,
+                        user_id=sender_schedule.user_id,
+                        schedule_date=receiver_schedule.schedule_date,
+                        start_time=receiver_schedule.start_time,
+                        end_time=receiver_schedule.end_time,
+                        created_by=accepted_by,
+                    ),
+                    RosterUserSchedule(
+                        roster_id=sender_schedule.roster_id,
+                        user_id=receiver_schedule.user_id,
+                        schedule_date=sender_schedule.schedule_date,
+                        start_time=sender_schedule.start_time,
+                        end_time=sender_schedule.end_time,
+                        created_by=accepted_by,
+                    ),
+                ]
+            )
+    except IntegrityError as error:
+        return False, str(error)
+
+    publish_events(
+        [
+            get_swap_request_event(
+                event_type=Event.SWAP_REQUEST_ACCEPTED,
+                schedule_swap_request=schedule_swap_request,
+                user_id=schedule_swap_request.sender_id,
+            ),
+            *get_schedule_events(
+                event_type=Event.SCHEDULE_DELETED,
+                roster_user_schedules=(sender_schedule, receiver_schedule),
+            ),
+            *get_schedule_events(
+                event_type=Event.SCHEDULE_CREATED,
+                roster_user_schedules=roster_user_schedules,
+            ),
+        ]
+    )
+    invalidate_schedule_cache(
+        (schedule.roster_id, schedule.user_id, schedule.schedule_date)
+        for schedule in (sender_schedule, receiver_schedule, *roster_user_schedules)
+    )
+    return True, roster_user_schedules
+
+
+def reject_schedule_swap_request(
+    schedule_swap_request: ScheduleSwapRequest,
+    rejected_by: Optional[User] = None,  # type: ignore
+) -> Tuple[bool, Union[str, ScheduleSwapRequest]]:
+    """
+    This service is used to reject a schedule swap request.
+    """
+
+    current_time = now()
+    ScheduleSwapRequest.objects.filter(id=schedule_swap_request.id).update(
+        status=ScheduleSwapRequest.Status.REJECTED,
+        date_deleted=current_time,
+        date_updated=current_time,
+        updated_by=rejected_by,
+    )
+    schedule_swap_request.status = ScheduleSwapRequest.Status.REJECTED
+    schedule_swap_request.date_deleted = current_time
+    publish_events(
+        [
+            get_swap_request_event(
+                event_type=Event.SWAP_REQUEST_REJECTED,
+                schedule_swap_request=schedule_swap_request,
+                user_id=schedule_swap_request.sender_id,
+            )
+        ]
+    )
+
+    return True, schedule_swap_request
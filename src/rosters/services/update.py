@@ -7,9 +7,14 @@ from typing import Optional, Tuple, Union
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.utils.timezone import now
 
-from rosters.models import RosterUserSchedule, ScheduleSwapRequest
+from rosters.caches import invalidate_schedule_cache
+from rosters.events import Event, get_schedule_events
+from rosters.models import RosterUserSchedule, ScheduleImportJob, ScheduleSwapRequest
+from utils.events import publish_events
+from utils.models import validation_context
 
 User = get_user_model()
 
@@ -35,6 +40,11 @@ def update_roster_user_schedule(
     }
 
     update_fields = []
+    previous_schedule = (
+        roster_user_schedule.roster_id,
+        roster_user_schedule.user_id,
+        roster_user_schedule.schedule_date,
+    )
 
     for data, value in updation_data.items():
         if not value:
@@ -50,10 +60,31 @@ def update_roster_user_schedule(
     update_fields.extend(["date_updated", "updated_by"])
 
     try:
-        roster_user_schedule.save(update_fields=update_fields)
-    except (ValidationError, IntegrityError) as error:
+        with transaction.atomic(), validation_context(
+            RosterUserSchedule, "constraints"
+        ):
+            roster_user_schedule.save(update_fields=update_fields)
+            publish_events(
+                get_schedule_events(
+                    event_type=Event.SCHEDULE_UPDATED,
+                    roster_user_schedules=[roster_user_schedule],
+                )
+            )
+    except ValidationError as error:
         return False, str(error)
-
+    except IntegrityError as error:
+        return False, roster_user_schedule.get_integrity_error_message(error)
+
+    invalidate_schedule_cache(
+        [
+            previous_schedule,
+            (
+                roster_user_schedule.roster_id,
+                roster_user_schedule.user_id,
+                roster_user_schedule.schedule_date,
+            ),
+        ]
+    )
     return True, roster_user_schedule
 
 
@@ -76,3 +107,38 @@ def update_schedule_swap_request(
         return False, str(error)
 
     return True, schedule_swap_request
+
+
+def resume_schedule_import_job(
+    schedule_import_job: ScheduleImportJob,
+    updated_by: Optional[User] = None,  # type: ignore
+) -> Tuple[bool, Union[str, ScheduleImportJob]]:
+    """
+    This service is used to queue a failed or stalled schedule import job
+    again. Processing restarts after its last committed chunk.
+    """
+
+    if schedule_import_job.status == ScheduleImportJob.Status.COMPLETED:
+        return False, "Import job is already completed."
+
+    if schedule_import_job.status == ScheduleImportJob.Status.PENDING:
+        return False, "Import job is already queued."
+
+    if (
+        schedule_import_job.status == ScheduleImportJob.Status.RUNNING
+        and schedule_import_job.date_updated > now() - ScheduleImportJob.STALE_AFTER
+    ):
+        return False, "Import job is still running."
+
+    schedule_import_job.status = ScheduleImportJob.Status.PENDING
+    schedule_import_job.error = None
+    schedule_import_job.updated_by = updated_by
+
+    try:
+        schedule_import_job.save(
+            update_fields=["status", "error", "updated_by", "date_updated"]
+        )
+    except ValidationError as error:
+        return False, str(error)
+
+    return True, schedule_import_job
@@ -0,0 +1,97 @@
+"""
+This file contains all the validation services for rosters module.
+"""
+
+from datetime import date, datetime
+from typing import Dict, List, Tuple, TypedDict, Union
+from uuid import UUID
+
+from django.contrib.auth import get_user_model
+
+from rosters.models import Roster, RosterUserSchedule
+from users.models import UserRole
+
+User = get_user_model()
+
+
+class RosterUserScheduleData(TypedDict):
+    user: Union[UUID, User]  # type: ignore
+    schedule_date: date
+    start_time: datetime
+    end_time: datetime
+
+
+class RosterUserScheduleError(TypedDict):
+    index: int
+    errors: List[str]
+
+
+def validate_roster_user_schedules(
+    roster: Roster,
+    user_schedule_data: List[RosterUserScheduleData],
+) -> List[RosterUserScheduleError]:
+    """
+    This service is used to validate a batch of roster user schedules.
+    Every row is checked against the schedule timing rules, the staff role of
+    its user, the other rows of the batch and the active schedules of the
+    roster, using one query for roles and one for existing schedules however
+    large the batch is. Returns the errors of the invalid rows, keyed by
+    their position in user_schedule_data.
+    """
+
+    rows = [
+        (
+            (
+                schedule_data["user"].uuid
+                if isinstance(schedule_data["user"], User)
+                else schedule_data["user"]
+            ),
+            schedule_data,
+        )
+        for schedule_data in user_schedule_data
+    ]
+    users = {user_id for user_id, _ in rows}
+    schedule_dates = {schedule_data["schedule_date"] for _, schedule_data in rows}
+
+    staff_users = set(
+        UserRole.objects.filter(
+            user_id__in=users,
+            role=UserRole.Role.STAFF,
+            date_deleted__isnull=True,
+        ).values_list("user_id", flat=True)
+    )
+    existing_schedules = set(
+        RosterUserSchedule.objects.filter(
+            roster_id=roster.id,
+            user_id__in=users,
+            schedule_date__in=schedule_dates,
+            date_deleted__isnull=True,
+        ).values_list("user_id", "schedule_date")
+    )
+
+    row_errors = []
+    seen_schedules: Dict[Tuple[UUID, date], int] = {}
+    for index, (user_id, schedule_data) in enumerate(rows):
+        errors = RosterUserSchedule.get_time_field_errors(
+            schedule_date=schedule_data["schedule_date"],
+            start_time=schedule_data["start_time"],
+            end_time=schedule_data["end_time"],
+        )
+
+        if user_id not in staff_users:
+            errors.append("Schedule can be added for users with staff role only.")
+
+        schedule_key = (user_id, schedule_data["schedule_date"])
+        if schedule_key in existing_schedules:
+            errors.append("Staff user can only have one active schedule on a day.")
+        elif schedule_key in seen_schedules:
+            errors.append(
+                f"Duplicate of the schedule at index {seen_schedules[schedule_key]}."
+            )
+        else:
+            seen_schedules[schedule_key] = index
+
+        if errors:
+            row_errors.append({"index": index, "errors": errors})
+
+    return row_errors
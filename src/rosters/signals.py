@@ -0,0 +1,52 @@
+"""
+This file contains all the signal receivers for rosters module.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from rosters.caches import get_schedule_cache, invalidate_schedule_cache
+from rosters.models import RosterUserSchedule
+
+# Fields of the keys a schedule is cached under
+SCHEDULE_KEY_FIELDS = frozenset(
+    ("roster", "roster_id", "user", "user_id", "schedule_date")
+)
+
+
+@receiver(pre_save, sender=RosterUserSchedule)
+def invalidate_previous_schedule_cache(
+    sender, instance, raw=False, update_fields=None, **kwargs
+):
+    """
+    Evicts the cached reads covering a schedule before it is saved, since the
+    save may move it to another roster, user or day. The previous values are
+    only read when the save may change them, otherwise the keys are those of
+    the instance, which invalidate_saved_schedule_cache evicts. Services
+    writing with bulk_create or update(), which send no signals, evict them
+    themselves.
+    """
+    if (
+        raw
+        or instance.pk is None
+        or get_schedule_cache() is None
+        or (update_fields is not None and SCHEDULE_KEY_FIELDS.isdisjoint(update_fields))
+    ):
+        return
+
+    invalidate_schedule_cache(
+        RosterUserSchedule.objects.filter(pk=instance.pk).values_list(
+            "roster_id", "user_id", "schedule_date"
+        )
+    )
+
+
+@receiver(post_save, sender=RosterUserSchedule)
+@receiver(post_delete, sender=RosterUserSchedule)
+def invalidate_saved_schedule_cache(sender, instance, **kwargs):
+    """
+    Evicts the cached reads covering a schedule once it is saved or deleted.
+    """
+    invalidate_schedule_cache(
+        [(instance.roster_id, instance.user_id, instance.schedule_date)]
+    )
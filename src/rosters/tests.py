@@ -1,3 +1,425 @@
-from django.test import TestCase
+from datetime import datetime, time, timedelta, timezone
+from itertools import combinations
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.timezone import now, override
+from rest_framework.renderers import JSONRenderer
+
+from rosters.apis.v1.schedule_swap_request import ListScheduleSwapRequest
+from rosters.apis.v1.sync import SyncScheduleAPI
+from rosters.models import (
+    Roster,
+    RosterManager,
+    RosterUserSchedule,
+    ScheduleSwapRequest,
+)
+from rosters.serializers import (
+    RosterUserScheduleSerializer,
+    ScheduleSwapRequestSerializer,
+)
+from users.models import User, UserRole
+from utils.helpers import generate_user_token
+from utils.renderers import FastJSONRenderer
+from utils.response import DefaultResponse
+from utils.serializers import compile_serializer
+from utils.testing import assert_constant_query_count
+
+
+class RosterTestCase(TestCase):
+    """
+    Base test case providing a roster with its manager and two staff users,
+    and helpers adding schedules and swap requests to it.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = cls.create_user("manager@rollcall.local", UserRole.Role.MANAGER)
+        cls.sender = cls.create_user("sender@rollcall.local", UserRole.Role.STAFF)
+        cls.receiver = cls.create_user("receiver@rollcall.local", UserRole.Role.STAFF)
+
+        cls.roster = Roster(title="Roster", is_active=True)
+        cls.roster.save(skip_clean=True)
+        RosterManager.objects.create(roster=cls.roster, manager=cls.manager)
+
+    @classmethod
+    def create_user(cls, email, *roles, last_name=None):
+        user = User.objects.create_user(
+            email=email,
+            first_name=email.split("@")[0],
+            last_name=last_name,
+            password=None,
+        )
+        UserRole.objects.bulk_create(UserRole(user=user, role=role) for role in roles)
+        return user
+
+    def get_client(self, user):
+        self.client.defaults["HTTP_AUTHORIZATION"] = (
+            f"Bearer {generate_user_token(user)}"
+        )
+        return self.client
+
+    def add_schedules(self, count, user=None):
+        """
+        Adds count schedules after the existing ones, on consecutive days
+        starting tomorrow, with some microseconds to exercise the datetime
+        rendering.
+        """
+
+        offset = RosterUserSchedule.objects.filter(roster=self.roster).count()
+        start_date = now().date() + timedelta(days=1)
+        schedules = []
+        for number in range(offset, offset + count):
+            schedule_date = start_date + timedelta(days=number)
+            start_time = datetime.combine(
+                schedule_date, time(9, 0, 0, number % 2 * 1500), tzinfo=timezone.utc
+            )
+            schedules.append(
+                RosterUserSchedule(
+                    roster=self.roster,
+                    user=user or self.sender,
+                    schedule_date=schedule_date,
+                    start_time=start_time,
+                    end_time=start_time + timedelta(hours=8),
+                )
+            )
+        return RosterUserSchedule.objects.bulk_create(schedules)
+
+    def add_swap_requests(self, count):
+        """
+        Adds count pending swap requests received by the receiver, each from
+        a new sender.
+        """
+
+        offset = ScheduleSwapRequest.objects.count()
+        swap_requests = []
+        for number in range(offset, offset + count):
+            sender = self.create_user(
+                f"sender-{number}@rollcall.local", UserRole.Role.STAFF
+            )
+            (schedule,) = self.add_schedules(1, user=sender)
+            swap_requests.append(
+                ScheduleSwapRequest(
+                    sender=sender, receiver=self.receiver, sender_schedule=schedule
+                )
+            )
+        return ScheduleSwapRequest.objects.bulk_create(swap_requests)
+
+
+class QueryCountTests(RosterTestCase):
+    """
+    The list endpoints, and the serializers listing querysets, must run the
+    same number of queries however many rows they return.
+    """
+
+    def assert_constant_query_count(self, client, url, add_rows):
+        # The first request authenticates the token, later ones reuse it
+        self.assertEqual(client.get(url).status_code, 200)
+
+        def make_request():
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            return response
+
+        assert_constant_query_count(
+            make_request=make_request, add_rows=add_rows, row_counts=(1, 25)
+        )
+
+    def test_schedule_list(self):
+        self.assert_constant_query_count(
+            client=self.get_client(self.manager),
+            url=reverse("schedule-list", args=(self.roster.id,)),
+            add_rows=self.add_schedules,
+        )
+
+    def test_normalized_schedule_list(self):
+        self.assert_constant_query_count(
+            client=self.get_client(self.manager),
+            url=reverse("schedule-list", args=(self.roster.id,)) + "?normalize=true",
+            add_rows=self.add_schedules,
+        )
+
+    def test_swap_request_list(self):
+        self.assert_constant_query_count(
+            client=self.get_client(self.receiver),
+            url=reverse("swap-request-list"),
+            add_rows=self.add_swap_requests,
+        )
+
+    def test_schedule_serializer(self):
+        assert_constant_query_count(
+            make_request=lambda: RosterUserScheduleSerializer(
+                instance=RosterUserSchedule.objects.order_by("id"), many=True
+            ).data,
+            add_rows=self.add_schedules,
+            row_counts=(1, 25),
+        )
+
+    def test_swap_request_serializer(self):
+        assert_constant_query_count(
+            make_request=lambda: ScheduleSwapRequestSerializer(
+                instance=ScheduleSwapRequest.objects.order_by("id"), many=True
+            ).data,
+            add_rows=self.add_swap_requests,
+            row_counts=(1, 25),
+        )
+
+
+class SerializationTestCase(RosterTestCase):
+    """
+    Base test case seeding schedules and swap requests covering what the list
+    serializers render differently: deleted rows, every swap request status,
+    users with and without a last name and start times with and without
+    microseconds.
+    """
+
+    TIMEZONES = ("UTC", "Asia/Kolkata")
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.staff = [
+            cls.sender,
+            cls.receiver,
+            cls.create_user(
+                "named@rollcall.local", UserRole.Role.STAFF, last_name="Named"
+            ),
+        ]
+
+        start_date = now().date() + timedelta(days=1)
+        schedules = []
+        for number in range(30):
+            schedule_date = start_date + timedelta(days=number // len(cls.staff))
+            start_time = datetime.combine(
+                schedule_date, time(9, 0, 0, number % 4 * 250), tzinfo=timezone.utc
+            )
+            schedules.append(
+                RosterUserSchedule(
+                    roster=cls.roster,
+                    user=cls.staff[number % len(cls.staff)],
+                    schedule_date=schedule_date,
+                    start_time=start_time,
+                    end_time=start_time + timedelta(hours=8),
+                    date_deleted=start_time if number % 10 == 0 else None,
+                )
+            )
+        schedules = RosterUserSchedule.objects.bulk_create(schedules)
+
+        ScheduleSwapRequest.objects.bulk_create(
+            ScheduleSwapRequest(
+                sender_id=schedule.user_id,
+                receiver=cls.staff[(number + 1) % len(cls.staff)],
+                sender_schedule=schedule,
+                status=ScheduleSwapRequest.Status.values[number % 3],
+                date_deleted=schedule.date_deleted,
+            )
+            for number, schedule in enumerate(schedules[:12])
+        )
+
+        cls.schedules = RosterUserSchedule.objects.filter(roster=cls.roster).order_by(
+            "id"
+        )
+        cls.swap_requests = ScheduleSwapRequest.objects.order_by("id")
+
+
+class CompiledSerializerTests(SerializationTestCase):
+    """
+    Compiled serializers must render exactly what their model serializers
+    render, under any timezone and through either JSON renderer.
+    """
+
+    RENDERERS = (JSONRenderer(), FastJSONRenderer())
+
+    def assert_compiled_parity(self, serializer_class, queryset, fields=None):
+        kwargs = {} if fields is None else {"fields": fields}
+        compiled_serializer = compile_serializer(serializer_class, **kwargs)
+        for timezone_name in self.TIMEZONES:
+            with override(timezone_name):
+                expected = DefaultResponse(
+                    data=serializer_class(instance=queryset, many=True, **kwargs).data
+                ).data
+                actual = DefaultResponse(
+                    data=compiled_serializer.to_representation(
+                        compiled_serializer.values(queryset)
+                    )
+                ).data
+
+            for renderer in self.RENDERERS:
+                with self.subTest(
+                    timezone=timezone_name, renderer=type(renderer).__name__
+                ):
+                    self.assertEqual(renderer.render(actual), renderer.render(expected))
+
+    def test_schedule_serializer(self):
+        self.assert_compiled_parity(RosterUserScheduleSerializer, self.schedules)
+
+    def test_schedule_serializer_fields(self):
+        for fields in combinations(RosterUserScheduleSerializer().fields, 2):
+            with self.subTest(fields=fields):
+                self.assert_compiled_parity(
+                    RosterUserScheduleSerializer, self.schedules, fields=list(fields)
+                )
+
+    def test_swap_request_serializer(self):
+        self.assert_compiled_parity(ScheduleSwapRequestSerializer, self.swap_requests)
+
+    def test_swap_request_list_serializer(self):
+        self.assert_compiled_parity(
+            ListScheduleSwapRequest.OutputSerializer, self.swap_requests
+        )
+
+    def test_sync_serializers(self):
+        self.assert_compiled_parity(
+            SyncScheduleAPI.ScheduleOutputSerializer, self.schedules
+        )
+        self.assert_compiled_parity(
+            SyncScheduleAPI.SwapRequestOutputSerializer, self.swap_requests
+        )
+
+
+class DatabaseSerializationTests(SerializationTestCase):
+    """
+    The lists built as json by the database when LIST_SERIALIZATION is
+    "database" must decode to the same data as when it is "python", under
+    any timezone.
+    """
+
+    def get_pages(self, client, url, params=None):
+        """
+        Returns the data of every page of a list, following its cursors.
+        """
+
+        pages, params = [], dict(params or {})
+        while True:
+            response = client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.json()["data"])
+
+            next_cursor = (
+                pages[-1].get("next_cursor") if isinstance(pages[-1], dict) else None
+            )
+            if not next_cursor:
+                return pages
+            params["cursor"] = next_cursor
+
+    def assert_database_parity(self, client, url, params=None):
+        for timezone_name in self.TIMEZONES:
+            with self.subTest(timezone=timezone_name), override_settings(
+                TIME_ZONE=timezone_name
+            ):
+                with override_settings(LIST_SERIALIZATION="python"):
+                    expected = self.get_pages(client=client, url=url, params=params)
+                with override_settings(LIST_SERIALIZATION="database"):
+                    actual = self.get_pages(client=client, url=url, params=params)
+
+                first_page = expected[0]
+                self.assertTrue(
+                    first_page["results"]
+                    if isinstance(first_page, dict)
+                    else first_page
+                )
+                self.assertEqual(actual, expected)
+
+    def test_schedule_list(self):
+        self.assert_database_parity(
+            client=self.get_client(self.manager),
+            url=reverse("schedule-list", args=(self.roster.id,)),
+            params={"page_size": 7},
+        )
+
+    def test_schedule_list_fields(self):
+        self.assert_database_parity(
+            client=self.get_client(self.manager),
+            url=reverse("schedule-list", args=(self.roster.id,)),
+            params={"page_size": 7, "fields": "id,user,start_time"},
+        )
+
+    def test_staff_schedule_list(self):
+        self.assert_database_parity(
+            client=self.get_client(self.sender),
+            url=reverse("schedule-list", args=(self.roster.id,)),
+        )
+
+    def test_swap_request_list(self):
+        self.assert_database_parity(
+            client=self.get_client(self.receiver), url=reverse("swap-request-list")
+        )
+
+
+class BulkRestoreTests(RosterTestCase):
+    """
+    Restoring schedules in bulk must restore those it can and skip, or fail
+    with a 400 on, the schedules it cannot restore.
+    """
+
+    def setUp(self):
+        self.client = self.get_client(self.manager)
+        self.url = reverse("schedule-bulk-action", args=(self.roster.id,))
+        self.schedules = self.add_schedules(2)
+        self.data = {
+            "start_date": self.schedules[0].schedule_date,
+            "end_date": self.schedules[-1].schedule_date,
+        }
+        response = self.client.post(self.url, {**self.data, "action": "delete"})
+        self.assertEqual(response.status_code, 200)
+
+        # A new active schedule on the day of the first deleted one
+        self.replacement = RosterUserSchedule.objects.get(id=self.schedules[0].id)
+        self.replacement.pk, self.replacement.date_deleted = None, None
+        self.replacement.save(skip_clean=True)
+
+    def test_restore_skips_occupied_day(self):
+        response = self.client.post(self.url, {**self.data, "action": "restore"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["schedules"], [self.schedules[1].id])
+        self.assertFalse(
+            RosterUserSchedule.objects.filter(
+                id=self.schedules[0].id, date_deleted__isnull=True
+            ).exists()
+        )
+
+    def test_restore_constraint_violation(self):
+        def restore_occupied_day(execute, sql, params, many, context):
+            if "restored_schedules" not in sql:
+                return execute(sql, params, many, context)
+
+            # Stands for a write filling the day while the restore runs
+            return execute(
+                f"UPDATE {RosterUserSchedule._meta.db_table} "
+                "SET date_deleted = NULL WHERE id = %s",
+                [self.schedules[0].id],
+                many,
+                context,
+            )
+
+        with connection.execute_wrapper(restore_occupied_day):
+            response = self.client.post(self.url, {**self.data, "action": "restore"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["errors"],
+            {"message": "Staff user can only have one active schedule on a day."},
+        )
+        self.assertFalse(
+            RosterUserSchedule.objects.filter(
+                id__in=[schedule.id for schedule in self.schedules],
+                date_deleted__isnull=True,
+            ).exists()
+        )
+
+
+class ScheduleEventStreamTests(RosterTestCase):
+    """
+    The event stream must refuse WSGI requests rather than hold a worker.
+    """
+
+    def test_wsgi_request(self):
+        response = self.get_client(self.sender).get(reverse("schedule-event-stream"))
+
+        self.assertEqual(response.status_code, 501)
+        self.assertEqual(
+            response.json()["errors"],
+            {"message": "Event streams are only served by an ASGI server"},
+        )
@@ -4,7 +4,14 @@ This file contains all the v1 urls used for rosters module
 
 from django.urls import path
 
-from rosters.apis.v1 import roster_user_schedules, rosters, schedule_swap_request
+from rosters.apis.v1 import (
+    events,
+    roster_user_schedules,
+    rosters,
+    schedule_imports,
+    schedule_swap_request,
+    sync,
+)
 
 urlpatterns = [
     path("", rosters.CreateRosterAPI.as_view(), name="roster-create"),
@@ -24,6 +31,31 @@ urlpatterns = [
         roster_user_schedules.ListRosterUserScheduleAPI.as_view(),
         name="schedule-list",
     ),
+    path(
+        "<int:roster_id>/schedule/export/",
+        roster_user_schedules.ExportRosterUserScheduleAPI.as_view(),
+        name="schedule-export",
+    ),
+    path(
+        "<int:roster_id>/schedule/bulk-action/",
+        roster_user_schedules.BulkActionRosterUserScheduleAPI.as_view(),
+        name="schedule-bulk-action",
+    ),
+    path(
+        "<int:roster_id>/schedule/import/",
+        schedule_imports.CreateScheduleImportJobAPI.as_view(),
+        name="schedule-import-create",
+    ),
+    path(
+        "schedule/import/<int:schedule_import_job_id>/",
+        schedule_imports.RetrieveScheduleImportJobAPI.as_view(),
+        name="schedule-import-detail",
+    ),
+    path(
+        "schedule/import/<int:schedule_import_job_id>/resume/",
+        schedule_imports.ResumeScheduleImportJobAPI.as_view(),
+        name="schedule-import-resume",
+    ),
     path(
         "schedule/swap/",
         schedule_swap_request.CreateScheduleSwapRequest.as_view(),
@@ -39,4 +71,10 @@ urlpatterns = [
         schedule_swap_request.AcceptRejectScheduleSwapRequest.as_view(),
         name="swap-request-action",
     ),
+    path(
+        "events/",
+        events.ScheduleEventStreamAPI.as_view(),
+        name="schedule-event-stream",
+    ),
+    path("sync/", sync.SyncScheduleAPI.as_view(), name="schedule-sync"),
 ]
@@ -5,7 +5,7 @@ This file contains all the model admin configurations for users module
 from django.contrib import admin
 from django.contrib.admin import ModelAdmin
 
-from users.models import User, UserRole
+from users.models import RefreshToken, User, UserRole
 
 
 @admin.register(User)
@@ -21,3 +21,12 @@ class UserRoleAdmin(ModelAdmin):
     list_select_related = ("user",)
     list_filter = ("role",)
     autocomplete_fields = ("user",)
+
+
+@admin.register(RefreshToken)
+class RefreshTokenAdmin(ModelAdmin):
+    list_display = ("user", "family", "date_created", "date_expires", "date_revoked")
+    search_fields = ("user__email",)
+    list_select_related = ("user",)
+    exclude = ("token_hash",)
+    readonly_fields = ("user", "family", "date_created", "date_expires")
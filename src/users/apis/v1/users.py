@@ -2,7 +2,9 @@
 This file contains all the APIs related to users module.
 """
 
-from django.contrib.auth import authenticate, get_user_model
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import aauthenticate, get_user_model
 from rest_framework import serializers
 from rest_framework.permissions import AllowAny
 from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
@@ -11,17 +13,33 @@ from rest_framework.views import APIView
 from users.models import UserRole
 from users.permissions import IsManager
 from users.serializers import UserSerializer
+from users.services import (
+    create_refresh_token,
+    revoke_refresh_token,
+    rotate_refresh_token,
+)
 from utils.helpers import generate_user_token
-from utils.response import DefaultResponse
+from utils.response import DefaultResponse, EmptyResponse
+from utils.views import AsyncAPIView
 
 User = get_user_model()
 
 
-class UserLoginAPI(APIView):
+def get_token_response_data(refresh_token):
+    return {
+        "access_token": generate_user_token(user=refresh_token.user),
+        "expires_in": settings.JWT_ACCESS_TOKEN_LIFETIME,
+        "refresh_token": refresh_token.token,
+    }
+
+
+class UserLoginAPI(AsyncAPIView):
     """
     This API is used for login of user.
     It accepts a user email and password and return
-    a jwt token.
+    a short lived jwt access token, along with a refresh token to renew it
+    through UserTokenRefreshAPI instead of logging in again. Served
+    asynchronously, the password hashing running in a thread.
 
     Response Codes:
         200, 404
@@ -33,23 +51,90 @@ class UserLoginAPI(APIView):
         email = serializers.EmailField()
         password = serializers.CharField()
 
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         serializer = self.InputSerializer(data=request.data)
         if not serializer.is_valid():
             return DefaultResponse(
                 errors=serializer.errors, status=HTTP_400_BAD_REQUEST
             )
 
-        user = authenticate(**serializer.validated_data)
+        user = await aauthenticate(**serializer.validated_data)
         if not user:
             return DefaultResponse(
                 errors="No active account found with the given credentials.",
                 status=HTTP_400_BAD_REQUEST,
             )
 
+        _, refresh_token = await sync_to_async(create_refresh_token)(user=user)
+        return DefaultResponse(
+            data=get_token_response_data(refresh_token=refresh_token),
+            status=HTTP_200_OK,
+        )
+
+
+class UserTokenRefreshAPI(APIView):
+    """
+    This API is used to exchange a refresh token for a new access token and
+    a new refresh token, the one given being revoked. Costs a single indexed
+    lookup and no password hashing. Reusing a revoked refresh token revokes
+    every token issued from the same login.
+    Response Codes:
+        200, 400
+    """
+
+    # The expired access token clients still send must not fail the request
+    authentication_classes = ()
+    permission_classes = (AllowAny,)
+
+    class InputSerializer(serializers.Serializer):
+        refresh_token = serializers.CharField()
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.InputSerializer(data=request.data)
+        if not serializer.is_valid():
+            return DefaultResponse(
+                errors=serializer.errors, status=HTTP_400_BAD_REQUEST
+            )
+
+        success, result = rotate_refresh_token(
+            token=serializer.validated_data["refresh_token"]
+        )
+        if not success:
+            return DefaultResponse(errors=result, status=HTTP_400_BAD_REQUEST)
+
         return DefaultResponse(
-            data={"access_token": generate_user_token(user=user)}, status=HTTP_200_OK
+            data=get_token_response_data(refresh_token=result), status=HTTP_200_OK
+        )
+
+
+class UserTokenRevokeAPI(APIView):
+    """
+    This API is used to logout a user, revoking the given refresh token and
+    every token issued from the same login.
+    Response Codes:
+        204, 400
+    """
+
+    authentication_classes = ()
+    permission_classes = (AllowAny,)
+
+    class InputSerializer(serializers.Serializer):
+        refresh_token = serializers.CharField()
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.InputSerializer(data=request.data)
+        if not serializer.is_valid():
+            return DefaultResponse(
+                errors=serializer.errors, status=HTTP_400_BAD_REQUEST
+            )
+
+        success, result = revoke_refresh_token(
+            token=serializer.validated_data["refresh_token"]
         )
+        if not success:
+            return DefaultResponse(errors=result, status=HTTP_400_BAD_REQUEST)
+
+        return EmptyResponse()
 
 
 class ListStaffUserAPI(APIView):
@@ -60,6 +145,7 @@ class ListStaffUserAPI(APIView):
     """
 
     permission_classes = (IsManager,)
+    use_read_replica = True
 
     OutputSerializer = UserSerializer
 
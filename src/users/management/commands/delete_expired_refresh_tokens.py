@@ -0,0 +1,20 @@
+"""
+This file contains the command deleting expired refresh tokens.
+"""
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from users.models import RefreshToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes the refresh tokens past their expiry, each refresh adding a "
+        "token. Revoked tokens are kept until they expire so that their reuse "
+        "is still detected. Meant to be run periodically, e.g. daily."
+    )
+
+    def handle(self, *args, **options):
+        deleted, _ = RefreshToken.objects.filter(date_expires__lte=now()).delete()
+        self.stdout.write(f"{deleted} expired refresh tokens deleted.")
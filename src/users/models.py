@@ -7,6 +7,8 @@ from uuid import uuid4
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils.functional import cached_property
+from django.utils.timezone import now
 
 from utils.models import BaseModel
 
@@ -54,6 +56,38 @@ class User(AbstractUser):
     def full_name(self):
         return f"{self.first_name.strip()} {(self.last_name or '').strip()}".rstrip()
 
+    @cached_property
+    def roles(self):
+        """
+        Active roles of the user, loaded once per instance from the database
+        the user was read from.
+        JWTAuthentication fills this from its token cache on warm tokens.
+        """
+        return frozenset(
+            UserRole.objects.using(self._state.db)
+            .filter(user=self, date_deleted__isnull=True)
+            .values_list("role", flat=True)
+        )
+
+    async def aget_roles(self) -> frozenset:
+        """
+        Async counterpart of roles, which it fills so that has_role does not
+        query the database afterwards.
+        """
+        if "roles" not in self.__dict__:
+            self.roles = frozenset(
+                [
+                    role
+                    async for role in UserRole.objects.using(self._state.db)
+                    .filter(user=self, date_deleted__isnull=True)
+                    .values_list("role", flat=True)
+                ]
+            )
+        return self.roles
+
+    def has_role(self, role: "UserRole.Role") -> bool:
+        return role in self.roles
+
 
 class UserRole(BaseModel):
     """
@@ -77,3 +111,27 @@ class UserRole(BaseModel):
                 violation_error_message="User with this role already exists",
             )
         ]
+
+
+class RefreshToken(models.Model):
+    """
+    This model is used to store the refresh tokens of users.
+    Only the sha256 digest of a token is stored. Each refresh revokes the
+    token and issues a new one of the same family, and presenting a revoked
+    token revokes the whole family, so that a stolen token stops working for
+    both its thief and its owner once either of them uses it.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    family = models.UUIDField(default=uuid4, db_index=True)
+    token_hash = models.BinaryField(max_length=32, unique=True)
+    date_created = models.DateTimeField(default=now)
+    date_expires = models.DateTimeField()
+    date_revoked = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Refresh Token"
+        verbose_name_plural = "Refresh Tokens"
+
+    def __str__(self):
+        return f"{self.user_id} - {self.family}"
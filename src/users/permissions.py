@@ -12,9 +12,7 @@ class IsManager(IsAuthenticated):
         return (
             super().has_permission(request, view)
             and request.user
-            and request.user.userrole_set.filter(
-                role=UserRole.Role.MANAGER, date_deleted__isnull=True
-            ).exists()
+            and request.user.has_role(UserRole.Role.MANAGER)
         )
 
 
@@ -23,7 +21,5 @@ class IsStaff(IsAuthenticated):
         return (
             super().has_permission(request, view)
             and request.user
-            and request.user.userrole_set.filter(
-                role=UserRole.Role.STAFF, date_deleted__isnull=True
-            ).exists()
+            and request.user.has_role(UserRole.Role.STAFF)
         )
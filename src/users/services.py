@@ -0,0 +1,113 @@
+"""
+This file contains all the services for users module.
+"""
+
+import secrets
+from datetime import timedelta
+from hashlib import sha256
+from typing import Optional, Tuple, Union
+from uuid import UUID
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.timezone import now
+
+from users.models import RefreshToken
+
+User = get_user_model()
+
+
+def hash_refresh_token(token: str) -> bytes:
+    """
+    Refresh tokens are random, so a plain digest is enough to look them up
+    without storing them, no password hashing needed.
+    """
+    return sha256(token.encode()).digest()
+
+
+def create_refresh_token(
+    user: User, family: Optional[UUID] = None  # type: ignore
+) -> Tuple[bool, Union[str, RefreshToken]]:
+    """
+    This service is used to create a refresh token for a user, in a new
+    family unless one is given. The token itself is only available on the
+    returned instance as `token`, the database storing its digest.
+    """
+
+    token = secrets.token_urlsafe(32)
+    current_time = now()
+    refresh_token = RefreshToken(
+        user=user,
+        token_hash=hash_refresh_token(token),
+        date_created=current_time,
+        date_expires=current_time
+        + timedelta(seconds=settings.JWT_REFRESH_TOKEN_LIFETIME),
+    )
+    if family is not None:
+        refresh_token.family = family
+
+    refresh_token.save()
+    refresh_token.token = token
+    return True, refresh_token
+
+
+def revoke_refresh_token_family(family: UUID) -> int:
+    return RefreshToken.objects.filter(family=family, date_revoked__isnull=True).update(
+        date_revoked=now()
+    )
+
+
+def rotate_refresh_token(token: str) -> Tuple[bool, Union[str, RefreshToken]]:
+    """
+    This service is used to exchange a refresh token for a new one of the same
+    family. The token is looked up and locked by its digest with a single
+    query, so that concurrent refreshes with the same token cannot both
+    succeed. A token presented after being revoked was either stolen or
+    replayed, and its whole family is revoked.
+    """
+
+    with transaction.atomic():
+        refresh_token = (
+            RefreshToken.objects.select_for_update(of=("self",))
+            .select_related("user")
+            .filter(token_hash=hash_refresh_token(token))
+            .first()
+        )
+        if not refresh_token:
+            return False, "Invalid refresh token."
+
+        if refresh_token.date_revoked is not None:
+            revoke_refresh_token_family(family=refresh_token.family)
+            return False, "Refresh token has been revoked."
+
+        current_time = now()
+        if refresh_token.date_expires <= current_time:
+            return False, "Refresh token has expired."
+
+        if not refresh_token.user.is_active:
+            return False, "User inactive or deleted."
+
+        RefreshToken.objects.filter(id=refresh_token.id).update(
+            date_revoked=current_time
+        )
+        return create_refresh_token(
+            user=refresh_token.user, family=refresh_token.family
+        )
+
+
+def revoke_refresh_token(token: str) -> Tuple[bool, Union[str, int]]:
+    """
+    This service is used to log a client out, revoking the family of its
+    refresh token. Access tokens already issued stay valid until they expire.
+    """
+
+    family = (
+        RefreshToken.objects.filter(token_hash=hash_refresh_token(token))
+        .values_list("family", flat=True)
+        .first()
+    )
+    if family is None:
+        return False, "Invalid refresh token."
+
+    return True, revoke_refresh_token_family(family=family)
@@ -0,0 +1,28 @@
+"""
+This file contains all the signal receivers for users module.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from rollcall.authentications import token_cache
+from users.models import User, UserRole
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_token_cache(sender, instance, **kwargs):
+    """
+    Evicts every cached token of a user once the user is edited, deactivated
+    or deleted.
+    """
+    token_cache.invalidate_tag(instance.uuid)
+
+
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+def invalidate_user_role_token_cache(sender, instance, **kwargs):
+    """
+    Evicts every cached token of a user once one of its roles changes.
+    """
+    token_cache.invalidate_tag(instance.user_id)
@@ -8,5 +8,11 @@ from users.apis.v1 import users
 
 urlpatterns = [
     path("login/", users.UserLoginAPI.as_view(), name="user-login"),
+    path(
+        "token/refresh/",
+        users.UserTokenRefreshAPI.as_view(),
+        name="user-token-refresh",
+    ),
+    path("token/revoke/", users.UserTokenRevokeAPI.as_view(), name="user-token-revoke"),
     path("staff/", users.ListStaffUserAPI.as_view(), name="staff-list"),
 ]
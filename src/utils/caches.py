@@ -0,0 +1,74 @@
+"""
+This file contains all the utilities related to in-process caching.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from time import time
+from typing import Any, Dict, Hashable, Optional, Set
+
+
+class TTLCache:
+    """
+    Thread safe, bounded LRU cache whose entries expire at an absolute timestamp.
+    Entries can be tagged so that every entry sharing a tag is evicted together.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._tags: Dict[Hashable, Set[Hashable]] = {}
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at, tag = entry
+            if expires_at <= time():
+                self._discard(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(
+        self, key: Hashable, value: Any, expires_at: float, tag: Hashable = None
+    ) -> None:
+        if self.max_size <= 0 or expires_at <= time():
+            return
+
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (value, expires_at, tag)
+            if tag is not None:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_tag(self, tag: Hashable) -> None:
+        with self._lock:
+            for key in self._tags.pop(tag, set()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None or entry[2] is None:
+            return
+
+        keys = self._tags.get(entry[2])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tags[entry[2]]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,46 @@
+"""
+This file contains all the utilities related to incremental sync.
+
+Change tracked models have a change_xid column that a database trigger sets
+to the id of the transaction inserting or updating a row. Transaction ids
+are assigned when transactions start, not when they commit, so a change
+token is the oldest transaction id still running when it is issued, below
+which every transaction has finished. Rows changed at or after the token are
+then either visible to the sync issuing it or changed by a transaction that
+commits later, and no row is ever skipped. Rows changed by transactions
+running across a token are sent again by the next sync.
+"""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def get_change_xid() -> int:
+    """
+    Returns the transaction id below which every transaction has finished.
+    Must be read on the primary, before the rows it covers.
+    """
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+        return cursor.fetchone()[0]
+
+
+def encode_change_token(change_xid: int) -> str:
+    return urlsafe_b64encode(f"v1:{change_xid}".encode()).decode()
+
+
+def decode_change_token(token: str) -> int:
+    """
+    Returns the transaction id of a change token.
+    Raises ValidationError for a malformed token.
+    """
+    try:
+        version, change_xid = urlsafe_b64decode(token.encode()).decode().split(":")
+        if version != "v1":
+            raise ValueError
+        return int(change_xid)
+    except (BinasciiError, UnicodeDecodeError, ValueError):
+        raise ValidationError("Invalid change token.")
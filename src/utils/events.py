@@ -0,0 +1,135 @@
+"""
+This file contains all the utilities related to realtime events.
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set, Tuple
+from uuid import UUID
+
+import psycopg
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+# Postgres channel every event is published on, listened to by each process
+# serving event streams
+EVENTS_CHANNEL = "rollcall_events"
+
+# Sent to the streams of a process after it may have missed events, telling
+# clients to reload what they display
+RESYNC_EVENT = {"type": "resync", "data": None}
+
+
+def publish_events(events: Iterable[Tuple[UUID, str, Any]]) -> None:
+    """
+    Publishes (user id, event type, data) events to the event streams of their
+    users, with a single NOTIFY statement. Postgres only delivers the events
+    once the current transaction commits and drops them on rollback, so
+    clients never hear about writes that did not happen.
+    """
+
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+    payloads = [
+        encoder.encode({"user": str(user_id), "type": event_type, "data": data})
+        for user_id, event_type, data in events
+    ]
+    if not payloads:
+        return
+
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload",
+            [EVENTS_CHANNEL, payloads],
+        )
+
+
+class EventBroker:
+    """
+    Fans the published events out to the event streams open in this process.
+    A single LISTEN connection is held while at least one stream is open and
+    reopened when it fails, the streams being sent RESYNC_EVENT since events
+    published in between are lost.
+    """
+
+    # Events buffered for a stream before it is considered too slow, its
+    # backlog then being replaced with RESYNC_EVENT
+    MAX_QUEUED_EVENTS = 100
+    RECONNECT_DELAY = 1
+
+    def __init__(self) -> None:
+        self._queues: Dict[str, Set[asyncio.Queue]] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: UUID) -> AsyncIterator[asyncio.Queue]:
+        """
+        Yields a queue receiving the events of the user until the block exits.
+        """
+        key = str(user_id)
+        queue = asyncio.Queue(maxsize=self.MAX_QUEUED_EVENTS)
+        self._queues.setdefault(key, set()).add(queue)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self.listen())
+
+        try:
+            yield queue
+        finally:
+            queues = self._queues.get(key, set())
+            queues.discard(queue)
+            if not queues:
+                self._queues.pop(key, None)
+            if not self._queues and self._listener is not None:
+                self._listener.cancel()
+                self._listener = None
+
+    async def listen(self) -> None:
+        connection_params = connections[DEFAULT_DB_ALIAS].get_connection_params()
+        connection_params = {
+            name: value
+            for name, value in connection_params.items()
+            if name not in ("cursor_factory", "context", "prepare_threshold")
+        }
+        reconnecting = False
+
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    **connection_params, autocommit=True
+                ) as connection:
+                    await connection.execute(f"LISTEN {EVENTS_CHANNEL}")
+                    if reconnecting:
+                        self.broadcast(RESYNC_EVENT)
+
+                    async for notify in connection.notifies():
+                        self.dispatch(json.loads(notify.payload))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Listening to %s failed", EVENTS_CHANNEL)
+
+            reconnecting = True
+            await asyncio.sleep(self.RECONNECT_DELAY)
+
+    def dispatch(self, event: Dict[str, Any]) -> None:
+        for queue in self._queues.get(event.pop("user"), ()):
+            self.put(queue, event)
+
+    def broadcast(self, event: Dict[str, Any]) -> None:
+        for queues in self._queues.values():
+            for queue in queues:
+                self.put(queue, event)
+
+    def put(self, queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC_EVENT)
+
+
+event_broker = EventBroker()
@@ -2,8 +2,11 @@
 This file contains all the utilities related to files
 """
 
+from typing import Iterable, Optional
+
 from django.core.exceptions import ValidationError
 from django.core.files import File
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
 from django.utils.deconstruct import deconstructible
 
 
@@ -30,3 +33,166 @@ class ValidateFileSize:
         file_size = file.size
         if file_size > self.file_size * 1024 * 1024:
             raise ValidationError(f"Max file size limit is {file_size}.")
+
+
+class ImageUploadValidationHandler(FileUploadHandler):
+    """
+    Upload handler validating image files while they are received, so that an
+    oversized or non image upload is rejected as soon as it is detected
+    instead of after it has been fully written, parsed and decoded.
+    It must run before the handlers storing the file. On the first invalid
+    file the reason is kept in `error` and nothing more is stored, the rest of
+    the request body being read and discarded so that the client gets the
+    error response rather than a reset connection.
+    """
+
+    # Leading bytes of every supported format, by the file extensions using it
+    SIGNATURES = {
+        b"\xff\xd8\xff": ("jpeg", "jpg"),
+        b"\x89PNG\r\n\x1a\n": ("png",),
+    }
+    # PNG signature followed by the IHDR chunk holding the image dimensions
+    HEADER_SIZE = 24
+    # JPEG start of frame markers, holding the image dimensions. The other
+    # markers of the C0 to CF range are DHT, JPG and DAC.
+    JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+    # JPEG markers standing alone, without a length: TEM and RST0 to RST7
+    JPEG_STANDALONE_MARKERS = frozenset((0x01, *range(0xD0, 0xD8)))
+
+    def __init__(
+        self,
+        request=None,
+        max_file_size: int = 10,  # in Mb
+        allowed_extensions: Iterable[str] = ("jpeg", "jpg", "png"),
+        max_pixels: Optional[int] = None,
+    ) -> None:
+        super().__init__(request=request)
+        self.max_file_size = max_file_size
+        self.allowed_extensions = set(allowed_extensions)
+        self.max_pixels = max_pixels
+        self.error: Optional[str] = None
+
+    def new_file(self, *args, **kwargs) -> None:
+        super().new_file(*args, **kwargs)
+        self.header = b""
+        self.header_validated = False
+        self.dimensions_validated = False
+        # Bytes of the file from the next JPEG marker on
+        self.jpeg_segment = b""
+        self.jpeg_segment_offset = 2
+
+        if (
+            self.content_length is not None
+            and self.content_length > self.max_file_size * 1024 * 1024
+        ):
+            self.reject(f"Max file size limit is {self.max_file_size} Mb.")
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> bytes:
+        if start + len(raw_data) > self.max_file_size * 1024 * 1024:
+            self.reject(f"Max file size limit is {self.max_file_size} Mb.")
+
+        if not self.header_validated:
+            self.header += raw_data[: self.HEADER_SIZE - len(self.header)]
+            if len(self.header) == self.HEADER_SIZE:
+                self.validate_header()
+
+        if self.header_validated and not self.dimensions_validated:
+            self.scan_jpeg(raw_data, start)
+
+        return raw_data
+
+    def file_complete(self, file_size: int) -> None:
+        if not self.header_validated:
+            self.validate_header()
+
+        if not self.dimensions_validated:
+            self.reject("Upload a valid image. The JPEG header is corrupted.")
+
+    def validate_header(self) -> None:
+        self.header_validated = True
+
+        extensions = next(
+            (
+                extensions
+                for signature, extensions in self.SIGNATURES.items()
+                if self.header.startswith(signature)
+            ),
+            (),
+        )
+        if not self.allowed_extensions.intersection(extensions):
+            self.reject(
+                "Upload a valid image. Allowed formats are "
+                f"{', '.join(sorted(self.allowed_extensions))}."
+            )
+
+        if "png" in extensions:
+            width = int.from_bytes(self.header[16:20], "big")
+            height = int.from_bytes(self.header[20:24], "big")
+            if self.header[12:16] != b"IHDR" or not (width and height):
+                self.reject("Upload a valid image. The PNG header is corrupted.")
+
+            self.validate_dimensions(width=width, height=height)
+        else:
+            # The header may hold the first JPEG markers, which the chunk it
+            # was completed by only holds when it is the first one
+            self.scan_jpeg(self.header, 0)
+
+    def scan_jpeg(self, raw_data: bytes, start: int) -> None:
+        """
+        Walks the JPEG markers up to the start of frame one, skipping the
+        data of the others, such as the EXIF of phone pictures, without
+        keeping more than the chunk it is given.
+        """
+        self.jpeg_segment += raw_data[
+            max(self.jpeg_segment_offset + len(self.jpeg_segment) - start, 0) :
+        ]
+
+        while len(self.jpeg_segment) >= 2:
+            if self.jpeg_segment[0] != 0xFF:
+                self.reject("Upload a valid image. The JPEG header is corrupted.")
+
+            marker = self.jpeg_segment[1]
+            if marker == 0xFF:  # fill byte
+                self.skip_jpeg_bytes(1)
+                continue
+
+            if marker in self.JPEG_STANDALONE_MARKERS:
+                self.skip_jpeg_bytes(2)
+                continue
+
+            if len(self.jpeg_segment) < 4:
+                return
+
+            length = int.from_bytes(self.jpeg_segment[2:4], "big")
+            if length < 2 or marker in (0xD8, 0xD9, 0xDA):
+                # SOI, EOI or SOS before the start of frame
+                self.reject("Upload a valid image. The JPEG header is corrupted.")
+
+            if marker not in self.JPEG_SOF_MARKERS:
+                self.skip_jpeg_bytes(2 + length)
+                continue
+
+            if len(self.jpeg_segment) < 9:
+                return
+
+            height = int.from_bytes(self.jpeg_segment[5:7], "big")
+            width = int.from_bytes(self.jpeg_segment[7:9], "big")
+            if length < 8 or not (width and height):
+                self.reject("Upload a valid image. The JPEG header is corrupted.")
+
+            self.jpeg_segment = b""
+            self.validate_dimensions(width=width, height=height)
+            return
+
+    def skip_jpeg_bytes(self, size: int) -> None:
+        self.jpeg_segment = self.jpeg_segment[size:]
+        self.jpeg_segment_offset += size
+
+    def validate_dimensions(self, width: int, height: int) -> None:
+        self.dimensions_validated = True
+        if self.max_pixels and width * height > self.max_pixels:
+            self.reject(f"Image must not exceed {self.max_pixels} pixels.")
+
+    def reject(self, error: str) -> None:
+        self.error = error
+        raise StopUpload(connection_reset=False)
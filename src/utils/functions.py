@@ -0,0 +1,67 @@
+"""
+This file contains all the custom database functions.
+"""
+
+from typing import Any, Optional
+
+from django.db.models import CharField, Func, JSONField, TextField, Value
+from django.db.models.functions import Cast
+from django.utils.timezone import get_current_timezone_name
+
+
+class JSONBuildObject(Func):
+    """
+    Builds a json object from the given keys and expressions, keeping their
+    order. Unlike django.db.models.functions.JSONObject, which builds jsonb
+    on PostgreSQL and so sorts the keys.
+    """
+
+    function = "JSON_BUILD_OBJECT"
+    output_field = JSONField()
+
+    def __init__(self, **fields: Any) -> None:
+        expressions = []
+        for key, value in fields.items():
+            expressions.extend((Cast(Value(key), TextField()), value))
+        super().__init__(*expressions)
+
+
+class ISODateTime(Func):
+    """
+    Formats a timestamp as DateTimeField.to_representation does with the
+    ISO 8601 format: in the given timezone, by default the current one, with
+    microseconds only when there are some and Z for a zero offset.
+    """
+
+    output_field = CharField()
+
+    def __init__(self, expression: Any, timezone_name: Optional[str] = None) -> None:
+        super().__init__(expression)
+        self.timezone_name = timezone_name
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.get_source_expressions()[0])
+        timezone_name = self.timezone_name or get_current_timezone_name()
+
+        local_sql = f"(({sql}) AT TIME ZONE %s)"
+        local_params = [*params, timezone_name]
+        if timezone_name == "UTC":
+            offset_sql, offset_params = "'Z'", []
+        else:
+            seconds_sql = (
+                f"EXTRACT(EPOCH FROM {local_sql} - (({sql}) AT TIME ZONE 'UTC'))"
+            )
+            seconds_params = [*local_params, *params]
+            offset_sql = (
+                f"CASE WHEN {seconds_sql} = 0 THEN 'Z' "
+                f"ELSE CASE WHEN {seconds_sql} < 0 THEN '-' ELSE '+' END || "
+                f"TO_CHAR(MAKE_INTERVAL(secs => ABS({seconds_sql})), 'HH24:MI') END"
+            )
+            offset_params = seconds_params * 3
+
+        return (
+            f"TO_CHAR({local_sql}, 'YYYY-MM-DD\"T\"HH24:MI:SS') || "
+            f"CASE WHEN EXTRACT(MICROSECONDS FROM {local_sql})::bigint %% 1000000 = 0 "
+            f"THEN '' ELSE TO_CHAR({local_sql}, '.US') END || {offset_sql}",
+            [*local_params * 3, *offset_params],
+        )
@@ -13,13 +13,15 @@ from users.models import User
 
 def generate_user_token(user: User):
     """
-    This method is used to generate a jwt token for a user
+    This method is used to generate a short lived jwt access token for a user,
+    renewed with a refresh token, see users.services.
     """
 
+    current_time = now()
     payload = {
         "user_id": str(user.uuid),
-        "iat": now(),
-        "exp": now() + timedelta(days=3),
+        "iat": current_time,
+        "exp": current_time + timedelta(seconds=settings.JWT_ACCESS_TOKEN_LIFETIME),
         "iss": "RollCall_Backend",
         "aud": "EndUser",
     }
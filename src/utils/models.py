@@ -2,10 +2,43 @@
 This file contains all the utilities related to models
 """
 
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, FrozenSet, Iterator, Tuple, Type
+
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models
 from django.utils.timezone import now
 
+# Invariants already checked by the running service, by model
+_validated_invariants: ContextVar[Dict[Type[models.Model], FrozenSet[str]]] = (
+    ContextVar("validated_invariants", default={})
+)
+
+
+@contextmanager
+def validation_context(model: Type[models.Model], *invariants: str) -> Iterator[None]:
+    """
+    Declares invariants of the model that the caller has already checked, so
+    that saving its instances within the block does not check them again.
+    Besides the names in the model's INVARIANTS, "unique" and "constraints"
+    skip Django's uniqueness and constraint validation queries. The database
+    still enforces those, so the save must then handle IntegrityError, see
+    BaseModel.get_integrity_error_message.
+    """
+
+    validated_invariants = _validated_invariants.get()
+    token = _validated_invariants.set(
+        {
+            **validated_invariants,
+            model: validated_invariants.get(model, frozenset()) | frozenset(invariants),
+        }
+    )
+    try:
+        yield
+    finally:
+        _validated_invariants.reset(token)
+
 
 class BaseModel(models.Model):
     """
@@ -20,6 +53,10 @@ class BaseModel(models.Model):
         "updated_by",
     )
 
+    # Checks run by full_clean on top of the field validation, each implemented
+    # by a validate_<invariant> method and skippable with validation_context
+    INVARIANTS: Tuple[str, ...] = ()
+
     class Meta:
         abstract = True
 
@@ -42,6 +79,44 @@ class BaseModel(models.Model):
     date_updated = models.DateTimeField(auto_now=True)
     date_deleted = models.DateTimeField(null=True, blank=True)
 
+    def full_clean(self, exclude=None, validate_unique=True, validate_constraints=True):
+        validated_invariants = _validated_invariants.get().get(type(self), frozenset())
+        for invariant in self.INVARIANTS:
+            if invariant not in validated_invariants:
+                getattr(self, f"validate_{invariant}")()
+
+        return super().full_clean(
+            exclude=exclude,
+            validate_unique=validate_unique and "unique" not in validated_invariants,
+            validate_constraints=validate_constraints
+            and "constraints" not in validated_invariants,
+        )
+
+    def get_integrity_error_message(self, error: IntegrityError) -> str:
+        """
+        Returns the validation message of the constraint or unique field the
+        failed save violated, falling back to the database error.
+        """
+        constraint_name = getattr(
+            getattr(error.__cause__, "diag", None), "constraint_name", None
+        )
+        if not constraint_name:
+            return str(error)
+
+        for constraint in self._meta.constraints:
+            if constraint.name == constraint_name:
+                return constraint.get_violation_error_message()
+
+        for field in self._meta.local_fields:
+            if (
+                field.unique
+                and not field.primary_key
+                and field.column in constraint_name
+            ):
+                return self.unique_error_message(type(self), (field.name,)).messages[0]
+
+        return str(error)
+
     def save(self, *args, **kwargs):
         skip_clean = kwargs.pop("skip_clean", False)
         if not skip_clean:
@@ -0,0 +1,125 @@
+"""
+This file contains all the utilities related to pagination.
+"""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple, Type
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model, Q, QuerySet
+from django.utils.timezone import is_naive
+
+
+class KeysetPaginator:
+    """
+    Paginates a queryset on a unique ascending ordering. The cursor holds the
+    ordering values of the last row of a page, so fetching any page is a
+    single index range scan no matter how deep into the result set it is.
+    """
+
+    def __init__(self, ordering: Sequence[str], page_size: int) -> None:
+        self.ordering = tuple(ordering)
+        self.page_size = page_size
+
+    def get_values(self, row: Any) -> Tuple:
+        return tuple(
+            row[field] if isinstance(row, dict) else getattr(row, field)
+            for field in self.ordering
+        )
+
+    def encode_cursor(self, row: Any) -> str:
+        return urlsafe_b64encode(
+            json.dumps(self.get_values(row), cls=DjangoJSONEncoder).encode()
+        ).decode()
+
+    def decode_cursor(self, model: Type[Model], cursor: str) -> Tuple:
+        """
+        Raises ValidationError for anything encode_cursor could not have
+        written, so that crafted cursors cannot reach the query: null or
+        non scalar values, values of the wrong type and naive datetimes.
+        """
+        try:
+            values = json.loads(urlsafe_b64decode(cursor.encode()))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+
+            decoded_values = []
+            for field, value in zip(self.ordering, values):
+                if not isinstance(value, (str, int)) or isinstance(value, bool):
+                    raise ValueError
+
+                value = model._meta.get_field(field).to_python(value)
+                if value is None or (isinstance(value, datetime) and is_naive(value)):
+                    raise ValueError
+                decoded_values.append(value)
+
+            return tuple(decoded_values)
+        except (BinasciiError, TypeError, ValueError, ValidationError):
+            raise ValidationError("Invalid cursor.")
+
+    def filter_after(self, queryset: QuerySet, values: Tuple) -> QuerySet:
+        """
+        Restricts the queryset to rows ordered after the given values, i.e.
+        (a, b) > (x, y) written as a >= x AND (a > x OR b > y) so that the
+        leading column still bounds the index scan.
+        """
+        condition = Q(**{f"{self.ordering[-1]}__gt": values[-1]})
+        for field, value in zip(self.ordering[-2::-1], values[-2::-1]):
+            condition = Q(**{f"{field}__gt": value}) | (Q(**{field: value}) & condition)
+
+        return queryset.filter(Q(**{f"{self.ordering[0]}__gte": values[0]}) & condition)
+
+    def paginate(
+        self, queryset: QuerySet, cursor: Optional[str] = None
+    ) -> Tuple[List, Optional[str]]:
+        """
+        Returns the rows of the page following the cursor and the cursor of
+        the next page, which is None on the last page.
+        Raises ValidationError for a malformed cursor.
+        """
+        return self.get_page(list(self.get_page_queryset(queryset, cursor)))
+
+    async def apaginate(
+        self, queryset: QuerySet, cursor: Optional[str] = None
+    ) -> Tuple[List, Optional[str]]:
+        """
+        Async counterpart of paginate.
+        """
+        return self.get_page(
+            [row async for row in self.get_page_queryset(queryset, cursor)]
+        )
+
+    def get_page_queryset(
+        self, queryset: QuerySet, cursor: Optional[str] = None
+    ) -> QuerySet:
+        queryset = queryset.order_by(*self.ordering)
+        if cursor:
+            queryset = self.filter_after(
+                queryset, self.decode_cursor(model=queryset.model, cursor=cursor)
+            )
+
+        return queryset[: self.page_size + 1]
+
+    def paginate_rows(
+        self, model: Type[Model], rows: Sequence, cursor: Optional[str] = None
+    ) -> Tuple[List, Optional[str]]:
+        """
+        Same as paginate, for rows of the model that are already in memory and
+        sorted on the ordering, such as rows read from a cache.
+        """
+        if cursor:
+            values = self.decode_cursor(model=model, cursor=cursor)
+            rows = [row for row in rows if self.get_values(row) > values]
+
+        return self.get_page(rows[: self.page_size + 1])
+
+    def get_page(self, rows: List) -> Tuple[List, Optional[str]]:
+        if len(rows) <= self.page_size:
+            return rows, None
+
+        rows = rows[: self.page_size]
+        return rows, self.encode_cursor(rows[-1])
@@ -0,0 +1,51 @@
+"""
+This file contains all the custom renderers.
+"""
+
+from typing import Any, Optional
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    This renderer encodes responses with orjson, which writes UUIDs, dates
+    and datetimes natively and returns bytes without an intermediate string,
+    the DefaultResponse envelope included. Types orjson does not know, such as
+    Decimal or lazy translations, go through the encoder of the stock
+    JSONRenderer, which the renderer falls back to when orjson is not
+    installed. Output matches the stock renderer apart from whitespace, NaN
+    and infinite floats being rendered as null rather than rejected.
+    """
+
+    def get_option(
+        self, accepted_media_type: Optional[str], renderer_context: dict
+    ) -> int:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        if self.get_indent(accepted_media_type, renderer_context):
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[dict] = None,
+    ) -> bytes:
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b""
+
+        return orjson.dumps(
+            data,
+            default=JSONEncoder().default,
+            option=self.get_option(accepted_media_type, renderer_context or {}),
+        )
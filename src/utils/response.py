@@ -2,10 +2,28 @@
 This file contains all the utilities related to API response.
 """
 
-from typing import Any, Optional
+import csv
+import json
+from datetime import date, datetime
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Union,
+)
+from uuid import UUID
 
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework.response import Response
 from rest_framework.status import HTTP_204_NO_CONTENT
+from rest_framework.utils.encoders import JSONEncoder
 
 
 class DefaultResponse(Response):
@@ -25,6 +43,55 @@ class DefaultResponse(Response):
         super().__init__(data={"data": data, "errors": errors}, **kwargs)
 
 
+class JSONText(str):
+    """
+    Json text that is already encoded, e.g. by the database, written out as
+    is by PreEncodedResponse.
+    """
+
+
+def encode_json(data: Any) -> str:
+    """
+    Encodes data as compact json, as JSONRenderer does, JSONText values being
+    inserted verbatim instead of encoded as strings.
+    """
+
+    if isinstance(data, JSONText):
+        return data
+
+    if isinstance(data, dict):
+        return (
+            "{"
+            + ",".join(
+                f"{encode_json(str(key))}:{encode_json(value)}"
+                for key, value in data.items()
+            )
+            + "}"
+        )
+
+    if isinstance(data, (list, tuple)):
+        return "[" + ",".join(encode_json(value) for value in data) + "]"
+
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":"))
+
+
+class PreEncodedResponse(HttpResponse):
+    """
+    Custom response class that returns the same data and errors envelope as
+    DefaultResponse for data holding JSONText, written out without being
+    decoded and encoded again. Always json, bypassing content negotiation.
+    """
+
+    def __init__(
+        self, *, data: Optional[Any] = None, errors: Optional[Any] = None, **kwargs
+    ):
+        super().__init__(
+            content=encode_json({"data": data, "errors": errors}),
+            content_type="application/json",
+            **kwargs,
+        )
+
+
 class EmptyResponse(Response):
     """
     Custom response class that return no data.
@@ -32,3 +99,164 @@ class EmptyResponse(Response):
 
     def __init__(self, *, status: Optional[int] = HTTP_204_NO_CONTENT, **kwargs):
         super().__init__(status=status, **kwargs)
+
+
+class StreamingExportResponse(StreamingHttpResponse):
+    """
+    Custom response class that streams rows as newline delimited JSON or CSV
+    as they are produced, so an export never has to fit in memory.
+    Rows are either an iterator or, under ASGI, an async iterator such as
+    QuerySet.aiterator, since Django buffers the whole of a sync iterator
+    before streaming it to an ASGI server.
+    """
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+    CONTENT_TYPES = {NDJSON: "application/x-ndjson", CSV: "text/csv"}
+
+    # Number of rows encoded into a single streamed chunk
+    ROWS_PER_CHUNK = 500
+
+    class _Echo:
+        def write(self, value: str) -> str:
+            return value
+
+    def __init__(
+        self,
+        *,
+        rows: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        columns: Sequence[str],
+        export_format: str,
+        filename: str,
+        **kwargs,
+    ):
+        encode = self.encode_csv if export_format == self.CSV else self.encode_ndjson
+        header = (
+            csv.writer(self._Echo()).writerow(columns)
+            if export_format == self.CSV
+            else None
+        )
+        if isinstance(rows, AsyncIterable):
+            streaming_content = self.aencode_chunks(
+                rows=rows, columns=columns, encode=encode, header=header
+            )
+        else:
+            streaming_content = self.encode_chunks(
+                rows=rows, columns=columns, encode=encode, header=header
+            )
+
+        super().__init__(
+            streaming_content=streaming_content,
+            content_type=self.CONTENT_TYPES[export_format],
+            **kwargs,
+        )
+        self["Content-Disposition"] = (
+            f'attachment; filename="{filename}.{export_format}"'
+        )
+
+    @classmethod
+    def encode_chunks(
+        cls,
+        rows: Iterable[Dict[str, Any]],
+        columns: Sequence[str],
+        encode: Callable[..., str],
+        header: Optional[str] = None,
+    ) -> Iterator[str]:
+        if header:
+            yield header
+
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == cls.ROWS_PER_CHUNK:
+                yield encode(rows=chunk, columns=columns)
+                chunk = []
+
+        if chunk:
+            yield encode(rows=chunk, columns=columns)
+
+    @classmethod
+    async def aencode_chunks(
+        cls,
+        rows: AsyncIterable[Dict[str, Any]],
+        columns: Sequence[str],
+        encode: Callable[..., str],
+        header: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Async counterpart of encode_chunks.
+        """
+        if header:
+            yield header
+
+        chunk = []
+        async for row in rows:
+            chunk.append(row)
+            if len(chunk) == cls.ROWS_PER_CHUNK:
+                yield encode(rows=chunk, columns=columns)
+                chunk = []
+
+        if chunk:
+            yield encode(rows=chunk, columns=columns)
+
+    @classmethod
+    def encode_ndjson(
+        cls, rows: Sequence[Dict[str, Any]], columns: Sequence[str]
+    ) -> str:
+        encoder = DjangoJSONEncoder(separators=(",", ":"))
+        return "".join(
+            encoder.encode({column: row[column] for column in columns}) + "\n"
+            for row in rows
+        )
+
+    @classmethod
+    def encode_csv(cls, rows: Sequence[Dict[str, Any]], columns: Sequence[str]) -> str:
+        encoder = DjangoJSONEncoder()
+        writer = csv.writer(cls._Echo())
+        return "".join(
+            writer.writerow(
+                [
+                    (
+                        encoder.default(row[column])
+                        if isinstance(row[column], (date, datetime, UUID))
+                        else row[column]
+                    )
+                    for column in columns
+                ]
+            )
+            for row in rows
+        )
+
+
+class EventStreamResponse(StreamingHttpResponse):
+    """
+    Custom response class that streams server sent events from an async
+    iterator of (event type, data) pairs, a None pair sending a keep alive
+    comment instead. Only streamed natively when served through ASGI.
+    """
+
+    # Delay in milliseconds before clients reconnect a dropped stream
+    RETRY = 5000
+
+    def __init__(self, *, events: AsyncIterator[Optional[tuple]], **kwargs):
+        super().__init__(
+            streaming_content=self.encode_events(events=events),
+            content_type="text/event-stream",
+            **kwargs,
+        )
+        self["Cache-Control"] = "no-cache"
+        self["X-Accel-Buffering"] = "no"
+
+    @classmethod
+    async def encode_events(
+        cls, events: AsyncIterator[Optional[tuple]]
+    ) -> AsyncIterator[str]:
+        encoder = DjangoJSONEncoder(separators=(",", ":"))
+        yield f"retry: {cls.RETRY}\n\n"
+        async for event in events:
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+
+            event_type, data = event
+            yield f"event: {event_type}\ndata: {encoder.encode(data)}\n\n"
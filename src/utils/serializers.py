@@ -0,0 +1,510 @@
+"""
+This file contains all the utilities related to serializers.
+"""
+
+from datetime import date, datetime, tzinfo
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import Case, F, JSONField, QuerySet, TextField, Value, When
+from django.db.models.functions import Cast
+from django.utils.functional import cached_property
+from django.utils.timezone import get_current_timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from utils.functions import ISODateTime, JSONBuildObject
+from utils.response import JSONText
+
+
+class DynamicFieldsMixin:
+    """
+    Serializer mixin that accepts a `fields` argument restricting the output
+    to the given field names.
+    """
+
+    def __init__(self, *args, fields: Optional[Iterable[str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+
+def get_query_plan(
+    serializer: serializers.ModelSerializer, prefix: str = "", prefetch: bool = False
+) -> Tuple[Set[str], Set[str]]:
+    """
+    Returns the select_related and prefetch_related lookups needed to render
+    the relations of a model serializer nested in it, recursively. Relations
+    below a to-many relation are prefetched as well.
+    """
+
+    select_related, prefetch_related = set(), set()
+    model = serializer.Meta.model
+
+    for field in serializer.fields.values():
+        nested_serializer = (
+            field.child if isinstance(field, serializers.ListSerializer) else field
+        )
+        if field.write_only or not isinstance(
+            nested_serializer, serializers.ModelSerializer
+        ):
+            continue
+
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+
+        if not model_field.is_relation:
+            continue
+
+        lookup = f"{prefix}{field.source}"
+        nested_prefetch = (
+            prefetch or model_field.many_to_many or model_field.one_to_many
+        )
+        (prefetch_related if nested_prefetch else select_related).add(lookup)
+
+        nested_select_related, nested_prefetch_related = get_query_plan(
+            nested_serializer, prefix=f"{lookup}__", prefetch=nested_prefetch
+        )
+        select_related |= nested_select_related
+        prefetch_related |= nested_prefetch_related
+
+    return select_related, prefetch_related
+
+
+class QueryPlanMixin:
+    """
+    Model serializer mixin loading the relations rendered by its nested
+    serializers along with the rows. A queryset serialized with many=True is
+    given the matching select_related and prefetch_related lookups, so the
+    number of queries does not grow with the number of rows.
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_serializer = super().many_init(*args, **kwargs)
+        if isinstance(list_serializer.instance, QuerySet):
+            list_serializer.instance = list_serializer.child.apply_query_plan(
+                list_serializer.instance
+            )
+
+        return list_serializer
+
+    def apply_query_plan(self, queryset: QuerySet) -> QuerySet:
+        if queryset._result_cache is not None:
+            return queryset
+
+        select_related, prefetch_related = get_query_plan(self)
+        if select_related:
+            queryset = queryset.select_related(*sorted(select_related))
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*sorted(prefetch_related))
+
+        return queryset
+
+
+def normalize_users(
+    rows: Iterable[dict],
+    fields: Iterable[str],
+    users: Optional[Dict[str, dict]] = None,
+) -> Dict[str, dict]:
+    """
+    Replaces the users nested in the given fields of each row with their
+    uuid, in place, and returns the users by uuid, added to `users` when
+    given. Fields nested in other objects are written as dotted paths, e.g.
+    roster_user_schedule.user. Fields missing from the rows are skipped.
+    """
+
+    users = {} if users is None else users
+    paths = [field.split(".") for field in fields]
+    for row in rows:
+        for *parents, name in paths:
+            parent = row
+            for key in parents:
+                parent = parent.get(key) if isinstance(parent, dict) else None
+
+            user = parent.get(name) if isinstance(parent, dict) else None
+            if isinstance(user, dict):
+                users.setdefault(user["uuid"], user)
+                parent[name] = user["uuid"]
+
+    return users
+
+
+async def aget_serializer_data(serializer: serializers.BaseSerializer):
+    """
+    Returns serializer.data from async code, which is not allowed to query the
+    database synchronously. A queryset instance, with the query plan of a
+    QueryPlanMixin serializer already applied to it, is loaded with async
+    iteration first, so its relations must be covered by that plan.
+    """
+    if isinstance(serializer.instance, QuerySet):
+        serializer.instance = [row async for row in serializer.instance]
+
+    return serializer.data
+
+
+# Fields whose representation of a database value is the value itself
+IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.IntegerField,
+)
+
+
+def get_field_converter(field: serializers.Field) -> Optional[Callable[[Any], Any]]:
+    """
+    Returns the function turning a database value into the representation of
+    the field, None when it is the value itself. Common fields get a
+    specialized function, others their own to_representation.
+    """
+
+    if type(field) in IDENTITY_FIELDS or (
+        type(field) is serializers.PrimaryKeyRelatedField and field.pk_field is None
+    ):
+        return None
+
+    if type(field) is serializers.UUIDField and field.uuid_format == "hex_verbose":
+        return str
+
+    if type(field) is serializers.DateField:
+        output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+        if output_format is not None and output_format.lower() == ISO_8601:
+            return date.isoformat
+
+    return field.to_representation
+
+
+def is_iso_datetime_field(field: serializers.Field) -> bool:
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    return (
+        type(field) is serializers.DateTimeField
+        and settings.USE_TZ
+        and output_format is not None
+        and output_format.lower() == ISO_8601
+    )
+
+
+def format_datetime(value: datetime) -> str:
+    """
+    Same as DateTimeField.to_representation for an aware datetime already in
+    the timezone of the field.
+    """
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        return value[:-6] + "Z"
+    return value
+
+
+class CompiledSerializer:
+    """
+    Read only counterpart of a model serializer rendering values_list() rows
+    instead of model instances, built by compile_serializer. The data of a
+    row is the same as the serializer's for the instance it was read from.
+    """
+
+    def __init__(
+        self,
+        serializer: serializers.ModelSerializer,
+        lookups: Tuple[str, ...],
+        render: Callable[[Tuple, tzinfo], dict],
+        source: str,
+    ) -> None:
+        self.serializer = serializer
+        self.lookups = lookups
+        self.render = render
+        # Generated code of render, for debugging
+        self.source = source
+
+    @cached_property
+    def json_expression(self) -> JSONBuildObject:
+        return SerializerCompiler().compile_json_expression(serializer=self.serializer)
+
+    def values(self, queryset: QuerySet, *lookups: str) -> QuerySet:
+        """
+        Returns the rows of the queryset to render, as named tuples also
+        holding the given lookups, e.g. the ordering of a KeysetPaginator.
+        """
+        return queryset.values_list(
+            *self.lookups,
+            *(lookup for lookup in lookups if lookup not in self.lookups),
+            named=True,
+        )
+
+    def to_representation(self, rows: Iterable[Tuple]) -> List[dict]:
+        # Resolved once rather than for every datetime value
+        current_timezone = get_current_timezone()
+        render = self.render
+        return [render(row, current_timezone) for row in rows]
+
+    def json_values(self, queryset: QuerySet, *lookups: str) -> QuerySet:
+        """
+        Same as values, the rows holding the data of each instance as json
+        text built by the database, in `compiled_json`, instead of the fields.
+        """
+        return queryset.annotate(
+            compiled_json=Cast(self.json_expression, TextField())
+        ).values_list("compiled_json", *lookups, named=True)
+
+    def to_json(self, rows: Iterable[Tuple]) -> JSONText:
+        """
+        Returns the json array of json_values rows, without decoding them.
+        """
+        return JSONText("[" + ",".join(row.compiled_json for row in rows) + "]")
+
+
+class SerializerCompiler:
+    """
+    Generates the code rendering values_list() rows for a model serializer.
+    Supports model fields, forward relations rendered as primary keys or
+    nested model serializers, and method fields listing the model fields they
+    read in the serializer's `compiled_sources`, their method being called
+    with an object holding those fields in place of the instance, and
+    without serializer context.
+    """
+
+    def __init__(self) -> None:
+        self.lookups: List[str] = []
+        self.namespace: Dict[str, Any] = {"SimpleNamespace": SimpleNamespace}
+
+    def get_row(self, lookup: str) -> str:
+        if lookup not in self.lookups:
+            self.lookups.append(lookup)
+        return f"row[{self.lookups.index(lookup)}]"
+
+    def add_global(self, value: Any) -> str:
+        name = f"_{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def get_model_field(self, serializer, field):
+        try:
+            return serializer.Meta.model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            raise ImproperlyConfigured(
+                f"Cannot compile {type(serializer).__name__}.{field.field_name}, "
+                f"{field.source} is not a model field."
+            )
+
+    def compile_method_field(self, serializer, field, prefix: str) -> str:
+        sources = getattr(serializer, "compiled_sources", {}).get(field.field_name)
+        if sources is None:
+            raise ImproperlyConfigured(
+                f"Cannot compile {type(serializer).__name__}.{field.field_name}, "
+                "its model fields are not listed in compiled_sources."
+            )
+
+        method = self.add_global(getattr(serializer, field.method_name))
+        arguments = ", ".join(
+            f"{source}={self.get_row(f'{prefix}{source}')}" for source in sources
+        )
+        return f"{method}(SimpleNamespace({arguments}))"
+
+    def get_relation_field(self, serializer, field):
+        model_field = self.get_model_field(serializer=serializer, field=field)
+        if not (model_field.many_to_one or model_field.one_to_one) or (
+            not model_field.concrete
+        ):
+            raise ImproperlyConfigured(
+                f"Cannot compile {type(serializer).__name__}.{field.field_name}, "
+                "only forward relations can be nested."
+            )
+        return model_field
+
+    def get_column_field(self, serializer, field):
+        model_field = self.get_model_field(serializer=serializer, field=field)
+        if not model_field.concrete or model_field.many_to_many:
+            raise ImproperlyConfigured(
+                f"Cannot compile {type(serializer).__name__}.{field.field_name}, "
+                f"{field.source} is not a column."
+            )
+        return model_field
+
+    def compile_nested_field(self, serializer, field, prefix: str) -> str:
+        model_field = self.get_relation_field(serializer=serializer, field=field)
+        expression = self.compile_serializer(
+            serializer=field, prefix=f"{prefix}{field.source}__"
+        )
+        if model_field.null:
+            row = self.get_row(f"{prefix}{field.source}")
+            return f"None if {row} is None else {expression}"
+        return expression
+
+    def compile_model_field(self, serializer, field, prefix: str) -> str:
+        model_field = self.get_column_field(serializer=serializer, field=field)
+        row = self.get_row(f"{prefix}{field.source}")
+        if is_iso_datetime_field(field):
+            field_timezone = (
+                self.add_global(field.timezone)
+                if hasattr(field, "timezone")
+                else "current_timezone"
+            )
+            formatter = self.add_global(format_datetime)
+            expression = f"{formatter}({row}.astimezone({field_timezone}))"
+        else:
+            converter = get_field_converter(field)
+            if converter is None:
+                return row
+            expression = f"{self.add_global(converter)}({row})"
+
+        if model_field.null:
+            return f"None if {row} is None else {expression}"
+        return expression
+
+    def compile_serializer(
+        self, serializer: serializers.ModelSerializer, prefix: str = ""
+    ) -> str:
+        items = []
+        for field in serializer._readable_fields:
+            if isinstance(field, serializers.SerializerMethodField):
+                expression = self.compile_method_field(
+                    serializer=serializer, field=field, prefix=prefix
+                )
+            elif isinstance(field, serializers.ModelSerializer):
+                expression = self.compile_nested_field(
+                    serializer=serializer, field=field, prefix=prefix
+                )
+            elif isinstance(field, serializers.BaseSerializer) or (
+                isinstance(field, serializers.ManyRelatedField)
+            ):
+                raise ImproperlyConfigured(
+                    f"Cannot compile {type(serializer).__name__}.{field.field_name}, "
+                    "to-many relations are not supported."
+                )
+            else:
+                expression = self.compile_model_field(
+                    serializer=serializer, field=field, prefix=prefix
+                )
+
+            items.append(f"{field.field_name!r}: {expression}")
+
+        return "{" + ", ".join(items) + "}"
+
+    def compile_json_field(self, serializer, field, prefix: str) -> Any:
+        if isinstance(field, serializers.SerializerMethodField):
+            expression = getattr(serializer, "compiled_expressions", {}).get(
+                field.field_name
+            )
+            if expression is None or prefix:
+                raise ImproperlyConfigured(
+                    f"Cannot compile {type(serializer).__name__}.{field.field_name} "
+                    "to json, it has no top level compiled_expressions entry."
+                )
+            return expression
+
+        if isinstance(field, serializers.BaseSerializer) or (
+            isinstance(field, serializers.ManyRelatedField)
+        ):
+            if not isinstance(field, serializers.ModelSerializer):
+                raise ImproperlyConfigured(
+                    f"Cannot compile {type(serializer).__name__}.{field.field_name}, "
+                    "to-many relations are not supported."
+                )
+
+            model_field = self.get_relation_field(serializer=serializer, field=field)
+            lookup = f"{prefix}{field.source}"
+            expression = self.compile_json_expression(
+                serializer=field, prefix=f"{lookup}__"
+            )
+            if model_field.null:
+                return Case(
+                    When(**{f"{lookup}__isnull": True}, then=Value(None)),
+                    default=expression,
+                    output_field=JSONField(),
+                )
+            return expression
+
+        self.get_column_field(serializer=serializer, field=field)
+        lookup = f"{prefix}{field.source}"
+        if is_iso_datetime_field(field):
+            return ISODateTime(
+                lookup,
+                timezone_name=(
+                    str(field.timezone) if hasattr(field, "timezone") else None
+                ),
+            )
+
+        # Json renders these the same as their representation
+        converter = get_field_converter(field)
+        if converter is None or converter in (str, date.isoformat):
+            return F(lookup)
+
+        raise ImproperlyConfigured(
+            f"Cannot compile {type(serializer).__name__}.{field.field_name} to json, "
+            f"{type(field).__name__} is not supported."
+        )
+
+    def compile_json_expression(
+        self, serializer: serializers.ModelSerializer, prefix: str = ""
+    ) -> JSONBuildObject:
+        """
+        Returns the expression building the data of a model serializer as a
+        json object in the database, in place of the generated code. Method
+        fields need an expression in the serializer's `compiled_expressions`,
+        only supported on the top level serializer.
+        """
+        return JSONBuildObject(
+            **{
+                field.field_name: self.compile_json_field(
+                    serializer=serializer, field=field, prefix=prefix
+                )
+                for field in serializer._readable_fields
+            }
+        )
+
+    def compile(self, serializer: serializers.ModelSerializer) -> CompiledSerializer:
+        source = (
+            "def render(row, current_timezone):\n"
+            f"    return {self.compile_serializer(serializer=serializer)}\n"
+        )
+        exec(source, self.namespace)
+        return CompiledSerializer(
+            serializer=serializer,
+            lookups=tuple(self.lookups),
+            render=self.namespace["render"],
+            source=source,
+        )
+
+
+@lru_cache(maxsize=None)
+def _compile_serializer(
+    serializer_class: Type[serializers.ModelSerializer],
+    fields: Optional[FrozenSet[str]],
+) -> CompiledSerializer:
+    serializer = (
+        serializer_class() if fields is None else serializer_class(fields=fields)
+    )
+    return SerializerCompiler().compile(serializer=serializer)
+
+
+def compile_serializer(
+    serializer_class: Type[serializers.ModelSerializer],
+    fields: Optional[Iterable[str]] = None,
+) -> CompiledSerializer:
+    """
+    Returns the compiled counterpart of a model serializer, restricted to the
+    given fields for a DynamicFieldsMixin serializer. Compiled once per
+    serializer and fields. Raises ImproperlyConfigured for a serializer that
+    cannot be compiled, see SerializerCompiler.
+    """
+    return _compile_serializer(
+        serializer_class, None if fields is None else frozenset(fields)
+    )
@@ -0,0 +1,43 @@
+"""
+This file contains all the utilities used by tests.
+"""
+
+from typing import Any, Callable, Sequence
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def assert_constant_query_count(
+    make_request: Callable[[], Any],
+    add_rows: Callable[[int], Any],
+    row_counts: Sequence[int] = (1, 10, 50),
+) -> int:
+    """
+    Asserts that make_request, typically a call to a list endpoint, runs the
+    same number of queries however many rows it returns. Before every
+    measurement add_rows is called with the number of rows to add so that the
+    total reaches the next entry of row_counts. Returns the query count.
+    """
+
+    query_counts, total_rows = [], 0
+    for row_count in row_counts:
+        add_rows(row_count - total_rows)
+        total_rows = row_count
+
+        with CaptureQueriesContext(connection) as context:
+            make_request()
+        query_counts.append(context)
+
+    if len({len(context) for context in query_counts}) > 1:
+        queries = "\n".join(query["sql"] for query in query_counts[-1].captured_queries)
+        raise AssertionError(
+            "Query count grows with the number of rows: "
+            + ", ".join(
+                f"{len(context)} queries for {row_count} rows"
+                for row_count, context in zip(row_counts, query_counts)
+            )
+            + f"\nQueries for {row_counts[-1]} rows:\n{queries}"
+        )
+
+    return len(query_counts[0])
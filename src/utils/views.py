@@ -0,0 +1,75 @@
+"""
+This file contains all the utilities related to API views.
+"""
+
+from inspect import isawaitable
+
+from asgiref.sync import sync_to_async
+from rest_framework import exceptions
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines, served without a thread per
+    request under ASGI.
+    Requests are authenticated with the aauthenticate method of the
+    authentication classes, falling back to authenticate in a thread, before
+    the usual synchronous checks run. Permission and throttle classes must
+    therefore not query the database, which users.permissions only need the
+    roles loaded by rollcall.authentications.JWTAuthentication for.
+    Handlers must load rows with the async ORM methods before serializing
+    them, see utils.serializers.aget_serializer_data.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.perform_async_authentication(request)
+            self.initial(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if isawaitable(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        # Rendering only encodes the already loaded data, doing it here leaves
+        # nothing for the thread the handler would render it in
+        if hasattr(self.response, "render"):
+            self.response.render()
+        return self.response
+
+    async def perform_async_authentication(self, request):
+        for authenticator in request.authenticators:
+            if hasattr(authenticator, "aauthenticate"):
+                authenticate = authenticator.aauthenticate
+            else:
+                authenticate = sync_to_async(authenticator.authenticate)
+
+            try:
+                user_auth_tuple = await authenticate(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+
+        request._not_authenticated()
@@ -0,0 +1,59 @@
+"""
+This file contains all the utilities related to background workers.
+"""
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the process wide pool used for background tasks, creating it on
+    first use so that it is never started in processes that do not need it.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BACKGROUND_WORKERS,
+                thread_name_prefix="rollcall-worker",
+            )
+        return _executor
+
+
+def _run_task(task: Callable, *args, **kwargs):
+    close_old_connections()
+    try:
+        return task(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", task.__name__)
+        raise
+    finally:
+        connections.close_all()
+
+
+def submit_task(task: Callable, *args, **kwargs) -> Future:
+    """
+    Runs a task on the background worker pool. Worker threads use their own
+    database connections, which are closed once the task finishes.
+    """
+    return get_executor().submit(_run_task, task, *args, **kwargs)
+
+
+def submit_task_on_commit(task: Callable, *args, **kwargs) -> None:
+    """
+    Runs a task on the background worker pool once the current transaction
+    commits, so the task always sees the rows it was submitted for.
+    """
+    transaction.on_commit(lambda: submit_task(task, *args, **kwargs))